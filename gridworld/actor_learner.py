@@ -0,0 +1,317 @@
+"""
+Actor-learner training: environment simulation and learning in separate processes.
+
+With Hogwild every worker both plays and learns. Here the two jobs are split, so the
+number of actors can grow without more processes writing to the table:
+
+- Each actor process attaches an ArrayGridWorldEnv to a SharedMaze and plays episodes
+  through ``Runner.run_episode_fast`` with a SnapshotAgent, an epsilon greedy agent that
+  reads its q values from a local copy of the latest policy and does not learn. Every
+  ``episodes_per_batch`` episodes it puts one compact TrajectoryBatch (int32 states, int8
+  actions, float32 rewards) on a bounded queue, then refreshes its copy of the policy if
+  a newer version was published.
+- The learner, in the calling process, takes batches off the queue and applies them to
+  its DenseQTable in order with ``q_learning_sweep``, the same updates QLearningAgent
+  would have made online. Every ``publish_every`` batches it copies the table into a
+  SharedQTable and bumps the policy version.
+
+Actors do not learn during an episode, so unlike QLearningAgent they keep repeating a
+bad move until the next policy version arrives. Keep ``episodes_per_batch`` small on
+large mazes, where a random walk takes a long time to find the goal.
+
+The queue is bounded, so actors that get ahead of the learner wait rather than pile up
+stale experience. The returned PipelineStats report actor and learner throughput, how
+long batches waited in the queue, and how many policy versions behind they were.
+
+Example usage:
+    maze = RecursiveBacktracking(rows=20, cols=20).run()
+    result = train_actor_learner(GridLayout.from_entries(maze), actors=4, episodes=200)
+    result.agent.q_table
+    result.pipeline.mean_queue_lag
+"""
+
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass
+from multiprocessing.sharedctypes import Synchronized
+from multiprocessing.synchronize import Lock
+from random import Random
+from typing import Any, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.agents.shared_q_table import SharedQTable, SharedQTableHandle
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.shared_maze import SharedMaze, SharedMazeHandle
+from gridworld.runner import EpisodeBuffer, EpisodeStats, Runner
+
+
+class SnapshotAgent(QLearningAgent):
+    """Acts epsilon greedy on its q values, but leaves learning to the learner."""
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        next_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        pass
+
+
+class TrajectoryBatch(NamedTuple):
+    actor: int
+    policy_version: int
+    # time.time() when the batch was queued
+    created: float
+    states: NDArray[np.int32]
+    actions: NDArray[np.int8]
+    rewards: NDArray[np.float32]
+    next_states: NDArray[np.int32]
+    dones: NDArray[np.bool_]
+    # one entry per episode in the batch
+    total_rewards: NDArray[np.float64]
+    steps: NDArray[np.int64]
+    reached_goal: NDArray[np.bool_]
+
+
+@dataclass(frozen=True)
+class ActorTask:
+    actor: int
+    maze: SharedMazeHandle
+    policy: SharedQTableHandle
+    episodes: int
+    episodes_per_batch: int
+    max_steps: int
+    epsilon: float
+    seed: int
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    wall_time: float
+    actor_steps_per_second: float
+    # transitions applied per second of time the learner spent updating
+    learner_updates_per_second: float
+    # seconds from an actor queueing a batch to the learner taking it
+    mean_queue_lag: float
+    max_queue_lag: float
+    # how many versions the policy had moved on by the time a batch was learned from
+    mean_policy_lag: float
+    policy_versions: int
+
+
+class ActorLearnerResult(NamedTuple):
+    agent: QLearningAgent
+    # every episode, in the order the learner received them
+    stats: EpisodeStats
+    pipeline: PipelineStats
+
+
+def run_actor(
+    task: ActorTask,
+    batches: "multiprocessing.Queue[TrajectoryBatch | None]",
+    policy_lock: Lock,
+    policy_version: "Synchronized[int]",
+) -> None:
+    maze = SharedMaze.attach(task.maze)
+    policy = SharedQTable.attach(task.policy)
+    agent = SnapshotAgent(
+        rng=Random(task.seed),
+        backend="dense",
+        rows=task.policy.rows,
+        cols=task.policy.cols,
+    )
+    agent.epsilon = task.epsilon
+    q_table = agent.q_table
+    assert isinstance(q_table, DenseQTable)
+    runner = Runner(maze.env(max_steps=task.max_steps), agent)
+    buffer = EpisodeBuffer(task.max_steps)
+
+    version = -1
+    for first in range(0, task.episodes, task.episodes_per_batch):
+        if policy_version.value != version:
+            with policy_lock:
+                np.copyto(q_table.values, policy.table.values)
+                version = policy_version.value
+
+        episodes = range(first, min(first + task.episodes_per_batch, task.episodes))
+        columns: dict[str, list[NDArray[Any]]] = {
+            "states": [],
+            "actions": [],
+            "rewards": [],
+            "next_states": [],
+            "dones": [],
+        }
+        total_rewards = np.zeros(len(episodes), dtype=np.float64)
+        steps = np.zeros(len(episodes), dtype=np.int64)
+        reached_goal = np.zeros(len(episodes), dtype=np.bool_)
+        for i in range(len(episodes)):
+            runner.run_episode_fast(buffer)
+            length = buffer.length
+            columns["states"].append(buffer.states[:length].astype(np.int32))
+            columns["actions"].append(buffer.actions[:length].copy())
+            columns["rewards"].append(buffer.rewards[:length].astype(np.float32))
+            columns["next_states"].append(buffer.next_states[:length].astype(np.int32))
+            columns["dones"].append(buffer.dones[:length].copy())
+            total_rewards[i] = buffer.total_reward
+            steps[i] = length
+            reached_goal[i] = buffer.reached_goal
+
+        batches.put(
+            TrajectoryBatch(
+                actor=task.actor,
+                policy_version=version,
+                created=time.time(),
+                states=np.concatenate(columns["states"]),
+                actions=np.concatenate(columns["actions"]),
+                rewards=np.concatenate(columns["rewards"]),
+                next_states=np.concatenate(columns["next_states"]),
+                dones=np.concatenate(columns["dones"]),
+                total_rewards=total_rewards,
+                steps=steps,
+                reached_goal=reached_goal,
+            )
+        )
+    # tells the learner this actor is done
+    batches.put(None)
+
+    del runner, agent, q_table
+    policy.close()
+    maze.close()
+
+
+def train_actor_learner(
+    layout: GridLayout,
+    *,
+    actors: int = 4,
+    episodes: int = 100,
+    episodes_per_batch: int = 5,
+    publish_every: int = 1,
+    queue_size: int = 16,
+    max_steps: int = 100,
+    epsilon: float = 0.1,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    seed: int | None = None,
+) -> ActorLearnerResult:
+    """
+    Train one agent on ``layout`` with ``actors`` actor processes playing ``episodes``
+    episodes each, while this process learns from their batches.
+    """
+    if actors < 1 or episodes < 1 or episodes_per_batch < 1:
+        raise ValueError("actors, episodes and episodes_per_batch must be at least 1.")
+    seeds = Random(seed)
+    learner = DenseQTable(layout.rows, layout.cols)
+    context = multiprocessing.get_context("spawn")
+    batches: "multiprocessing.Queue[TrajectoryBatch | None]" = context.Queue(
+        maxsize=queue_size
+    )
+    policy_lock = context.Lock()
+    policy_version: "Synchronized[int]" = context.Value("q", 0)
+
+    total_rewards: list[NDArray[np.float64]] = []
+    steps: list[NDArray[np.int64]] = []
+    reached_goal: list[NDArray[np.bool_]] = []
+    queue_lags: list[float] = []
+    policy_lags: list[int] = []
+    learn_time = 0.0
+    transitions = 0
+
+    start = time.perf_counter()
+    with SharedMaze.publish(layout) as maze, SharedQTable.create(
+        layout.rows, layout.cols
+    ) as policy:
+        processes = [
+            context.Process(
+                target=run_actor,
+                args=(
+                    ActorTask(
+                        actor=actor,
+                        maze=maze.handle,
+                        policy=policy.handle,
+                        episodes=episodes,
+                        episodes_per_batch=episodes_per_batch,
+                        max_steps=max_steps,
+                        epsilon=epsilon,
+                        seed=seeds.getrandbits(64),
+                    ),
+                    batches,
+                    policy_lock,
+                    policy_version,
+                ),
+            )
+            for actor in range(actors)
+        ]
+        for process in processes:
+            process.start()
+
+        finished = 0
+        received = 0
+        try:
+            while finished < actors:
+                try:
+                    batch = batches.get(timeout=1.0)
+                except queue.Empty:
+                    if any(process.exitcode not in (None, 0) for process in processes):
+                        raise RuntimeError("An actor process failed.")
+                    continue
+                if batch is None:
+                    finished += 1
+                    continue
+
+                queue_lags.append(time.time() - batch.created)
+                policy_lags.append(policy_version.value - batch.policy_version)
+                learn_start = time.perf_counter()
+                learner.q_learning_sweep(
+                    batch.states.astype(np.int64),
+                    batch.actions.astype(np.int64),
+                    batch.rewards.astype(np.float64),
+                    batch.next_states.astype(np.int64),
+                    batch.dones,
+                    alpha=alpha,
+                    gamma=gamma,
+                )
+                learn_time += time.perf_counter() - learn_start
+                transitions += len(batch.states)
+                total_rewards.append(batch.total_rewards)
+                steps.append(batch.steps)
+                reached_goal.append(batch.reached_goal)
+
+                received += 1
+                if received % publish_every == 0:
+                    with policy_lock:
+                        np.copyto(policy.table.values, learner.values)
+                        policy_version.value += 1
+        finally:
+            for process in processes:
+                if process.exitcode is None and finished < actors:
+                    process.terminate()
+                process.join()
+    wall_time = time.perf_counter() - start
+
+    agent = QLearningAgent(backend="dense", rows=layout.rows, cols=layout.cols)
+    agent.q_table = learner
+    agent.epsilon = epsilon
+    agent.alpha = alpha
+    agent.gamma = gamma
+    stats = EpisodeStats(
+        total_rewards=np.concatenate(total_rewards),
+        steps=np.concatenate(steps),
+        reached_goal=np.concatenate(reached_goal),
+    )
+    pipeline = PipelineStats(
+        wall_time=wall_time,
+        actor_steps_per_second=transitions / wall_time,
+        learner_updates_per_second=transitions / learn_time if learn_time else 0.0,
+        mean_queue_lag=float(np.mean(queue_lags)),
+        max_queue_lag=float(np.max(queue_lags)),
+        mean_policy_lag=float(np.mean(policy_lags)),
+        policy_versions=policy_version.value,
+    )
+    return ActorLearnerResult(agent=agent, stats=stats, pipeline=pipeline)
@@ -0,0 +1,135 @@
+import heapq
+from typing import Any
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.components.array_grid_environment import (
+    OUTCOME_INDEX,
+    ArrayGridWorldEnv,
+    GridLayout,
+    TransitionTable,
+    compile_transitions,
+)
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.utils import GOAL, MOVEMENT, SIMPLE_ACTIONS, Step
+
+# maze fingerprint -> {state: action} along the shortest paths planned on that maze
+PathCache = dict[str, dict[tuple[int, int], str]]
+
+
+class AStarAgent(Agent):
+    def __init__(
+        self,
+        layout: GridLayout,
+        *,
+        cache: PathCache | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        A planning baseline: the shortest path to the goal, found by A* with a Manhattan
+        heuristic over the maze's walls and obstacles.
+
+        Unlike ManhattanAgent it never walks into a wall, so it always reaches the goal
+        when the goal can be reached, in the fewest possible steps. That makes it the
+        optimal reference for the other agents.
+
+        The path is planned the first time the agent acts on a maze and cached by the
+        maze's ``GridLayout.fingerprint()``, so later episodes on the same maze, or on a
+        maze with the same layout, plan nothing. Pass the same ``cache`` to several
+        agents to share their plans.
+        """
+        super().__init__(**kwargs)
+        self.cache: PathCache = {} if cache is None else cache
+        # how many times A* actually ran, cache hits do not count
+        self.searches = 0
+        self.use_layout(layout)
+
+    @classmethod
+    def for_env(
+        cls, env: GridWorldEnv | ArrayGridWorldEnv, **kwargs: Any
+    ) -> "AStarAgent":
+        return cls(GridLayout.from_env(env), **kwargs)
+
+    def use_layout(self, layout: GridLayout) -> None:
+        """Switch to another maze, reusing its cached path if it has one."""
+        self.layout = layout
+        self.rows = layout.rows
+        self.cols = layout.cols
+        self.goal = layout.goal
+        self._transitions: TransitionTable | None = None
+        self.path = self.cache.setdefault(layout.fingerprint(), {})
+
+    def reset(self, **kwargs: Any) -> None:
+        pass
+
+    def act(self, state: tuple[int, int]) -> str:
+        action = self.path.get(state)
+        if action is None:
+            self.plan(state)
+            action = self.path[state]
+        return action
+
+    def observe(self, step: Step) -> None:
+        pass
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        new_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        pass
+
+    def plan(self, start: tuple[int, int]) -> list[str]:
+        """
+        Find the shortest path from ``start`` to the goal with A*, add it to ``path``
+        and return its actions. Every state along a shortest path also has its
+        shortest path in what follows it, so paths planned from different states can
+        share one ``{state: action}`` table.
+        """
+        if self._transitions is None:
+            self._transitions = compile_transitions(self.layout)
+        next_states = self._transitions.next_states.tolist()
+        outcomes = self._transitions.outcomes.tolist()
+        moves = (OUTCOME_INDEX[MOVEMENT], OUTCOME_INDEX[GOAL])
+        cols = self.cols
+        goal_row, goal_col = self.goal
+        goal = goal_row * cols + goal_col
+        self.searches += 1
+
+        def heuristic(index: int) -> int:
+            row, col = divmod(index, cols)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        origin = start[0] * cols + start[1]
+        came_from: dict[int, tuple[int, int]] = {}
+        cost = {origin: 0}
+        queue = [(heuristic(origin), 0, origin)]
+        while queue:
+            _, steps, index = heapq.heappop(queue)
+            if index == goal:
+                break
+            if steps > cost[index]:
+                continue
+            for action_index, next_index in enumerate(next_states[index]):
+                if outcomes[index][action_index] not in moves:
+                    continue
+                if steps + 1 < cost.get(next_index, steps + 2):
+                    cost[next_index] = steps + 1
+                    came_from[next_index] = (index, action_index)
+                    heapq.heappush(
+                        queue,
+                        (steps + 1 + heuristic(next_index), steps + 1, next_index),
+                    )
+        else:
+            raise ValueError(f"No path from {start} to the goal at {self.goal}.")
+
+        actions: list[str] = []
+        index = goal
+        while index != origin:
+            index, action_index = came_from[index]
+            actions.append(SIMPLE_ACTIONS[action_index])
+            self.path[divmod(index, cols)] = SIMPLE_ACTIONS[action_index]
+        actions.reverse()
+        return actions
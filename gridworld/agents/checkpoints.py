@@ -0,0 +1,164 @@
+"""
+Saving and loading QLearningAgent state.
+
+Scripts retrain a fresh QLearningAgent on every run, even to re-plot or evaluate a result.
+``save_checkpoint`` writes the agent's Q-table as a dense ``(rows * cols, n_actions)``
+float array, along with which states it has seen, its actions, epsilon, alpha, gamma and
+the state of its ``Random``, to one ``.npz`` file. A dict table does not know how large
+the grid is, so pass its ``rows`` and ``cols``. ``load_checkpoint`` rebuilds the agent
+with the same backend, and it picks up exactly where the saved one left off.
+
+The archive is written uncompressed, so its arrays sit in the file as plain ``.npy``
+data. ``load_checkpoint(path, mmap=True)`` memory-maps the q values straight from the
+file instead of reading them: loading is instant however large the table is, and
+evaluation workers loading the same checkpoint share one copy of it through the page
+cache. The mapped table is read-only, so such an agent can act but raises if it learns.
+
+Only the Q-table and the settings above are saved. Replay buffers, traces and learned
+models of subclasses start out empty again.
+
+Example usage:
+    save_checkpoint(agent, "output/agent.npz", rows=env.rows, cols=env.cols)
+    agent = load_checkpoint("output/agent.npz", mmap=True)
+    agent.epsilon = 0.0
+"""
+
+import struct
+import zipfile
+from random import Random
+from typing import Literal, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable, grid_size
+
+AgentT = TypeVar("AgentT", bound=QLearningAgent)
+
+# the fixed part of a zip local file header, the name and extra field follow it
+ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def save_checkpoint(
+    agent: QLearningAgent,
+    path: str,
+    *,
+    rows: int | None = None,
+    cols: int | None = None,
+) -> None:
+    """
+    ``rows`` and ``cols`` are the size of the grid the agent was trained on. They are
+    needed for a dict table, an array table already has them.
+    """
+    q_table = agent.q_table
+    rows, cols = grid_size(q_table, rows=rows, cols=cols)
+    backend = "dict"
+    if isinstance(q_table, DenseQTable):
+        backend = "dense"
+    elif isinstance(q_table, MemmapQTable):
+        backend = "memmap"
+    if not isinstance(q_table, DenseQTable):
+        # raises a KeyError for a state outside of rows x cols
+        q_table = DenseQTable.from_mapping(q_table, agent.actions, rows=rows, cols=cols)
+
+    version, internal_state, gauss_next = agent.rng.getstate()
+    # through a file, as np.savez adds ".npz" to a path without it
+    with open(path, "wb") as file:
+        np.savez(
+            file,
+            allow_pickle=False,
+            values=q_table.values,
+            seen=q_table.seen,
+            shape=np.array([q_table.rows, q_table.cols], dtype=np.int64),
+            actions=np.array(agent.actions),
+            backend=np.array(backend),
+            hyperparameters=np.array([agent.epsilon, agent.alpha, agent.gamma]),
+            rng_version=np.array(version, dtype=np.int64),
+            rng_state=np.array(internal_state, dtype=np.int64),
+            rng_gauss_next=np.array(np.nan if gauss_next is None else gauss_next),
+        )
+
+
+def memmap_npz_array(path: str, name: str) -> NDArray[np.float64]:
+    """
+    A read-only memory map of the array ``name`` inside the uncompressed ``.npz`` at
+    ``path``. ``np.load(mmap_mode=...)`` ignores the mode for ``.npz`` files.
+    """
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} is compressed in {path} and cannot be memory mapped.")
+
+    with open(path, "rb") as file:
+        file.seek(info.header_offset)
+        header = ZIP_LOCAL_HEADER.unpack(file.read(ZIP_LOCAL_HEADER.size))
+        name_length, extra_length = header[-2:]
+        file.seek(name_length + extra_length, 1)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def load_checkpoint(
+    path: str,
+    *,
+    mmap: bool = False,
+    agent_class: type[AgentT] = QLearningAgent,
+) -> AgentT:
+    """
+    Rebuild the agent saved at ``path`` as an ``agent_class``. With ``mmap``, the agent
+    always gets a read-only, memory-mapped DenseQTable, whichever backend it was saved
+    with. A memmap table is loaded into a new temporary file.
+    """
+    with np.load(path, allow_pickle=False) as checkpoint:
+        rows, cols = checkpoint["shape"].tolist()
+        actions: list[str] = checkpoint["actions"].tolist()
+        backend = str(checkpoint["backend"])
+        epsilon, alpha, gamma = checkpoint["hyperparameters"].tolist()
+        seen = checkpoint["seen"]
+        values: NDArray[np.float64] | None = None if mmap else checkpoint["values"]
+        gauss_next = float(checkpoint["rng_gauss_next"])
+        rng_state = (
+            int(checkpoint["rng_version"]),
+            tuple(checkpoint["rng_state"].tolist()),
+            None if np.isnan(gauss_next) else gauss_next,
+        )
+
+    rng = Random()
+    rng.setstate(rng_state)
+    if values is None:
+        values = memmap_npz_array(path, "values")
+        backend = "dense"
+    agent_backend: Literal["dict", "dense", "memmap"] = "dict"
+    if backend == "dense":
+        agent_backend = "dense"
+    elif backend == "memmap":
+        agent_backend = "memmap"
+    agent = agent_class(rng=rng, backend=agent_backend, rows=rows, cols=cols)
+    agent.actions = actions
+    agent.epsilon = epsilon
+    agent.alpha = alpha
+    agent.gamma = gamma
+
+    if isinstance(agent.q_table, DenseQTable):
+        agent.q_table = DenseQTable(rows, cols, actions, values=values, seen=seen)
+    else:
+        for index in np.flatnonzero(seen).tolist():
+            agent.q_table[divmod(index, cols)].update(
+                zip(actions, values[index].tolist())
+            )
+    return agent
@@ -0,0 +1,109 @@
+"""
+Q(lambda) and SARSA(lambda): Q-learning with eligibility traces.
+
+QLearningAgent only updates the (state, action) it just tried, so the +100 goal reward
+moves back one state per episode. These agents also keep a trace of the pairs tried
+recently in the episode and update all of them by the same TD error, weighted by how
+recently they were tried. A single episode that reaches the goal then updates the whole
+path that led there.
+
+Traces decay by ``gamma * trace_decay`` (lambda) every step and are dropped once they
+fall below ``trace_cutoff``, so only a handful of recent pairs are ever stored (6 with
+the defaults) and each update costs O(active traces), not O(states).
+
+A high lambda also spreads every -10 wall penalty, and the end of an episode cut off by
+``max_steps``, along the recent path. On 10x10 mazes a lambda around 0.5 learns about
+twice as fast as QLearningAgent, while 0.9 can stop it from finding the goal at all.
+
+Both agents pick their next action while observing a step, since the update needs it,
+and ``act`` then returns that action. SARSA(lambda) backs up the q value of the action
+it will take. Watkins' Q(lambda) backs up the best q value, and drops its traces after an
+exploratory action, since the path no longer follows the greedy policy.
+"""
+
+from abc import abstractmethod
+from random import Random
+from typing import Any
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+
+
+class EligibilityTraceAgent(QLearningAgent):
+    def __init__(
+        self,
+        *,
+        rng: Random | None = None,
+        trace_decay: float = 0.5,
+        trace_cutoff: float = 0.01,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(rng=rng, **kwargs)
+        self.trace_decay = trace_decay
+        self.trace_cutoff = trace_cutoff
+
+    def reset(self) -> None:
+        self.traces: dict[tuple[tuple[int, int], str], float] = {}
+        self._next_action: tuple[tuple[int, int], str] | None = None
+
+    def act(self, state: tuple[int, int]) -> str:
+        if self._next_action is not None and self._next_action[0] == state:
+            action = self._next_action[1]
+            self._next_action = None
+            return action
+        return super().act(state)
+
+    @abstractmethod
+    def bootstrap(self, next_state: tuple[int, int], next_action: str) -> float: ...
+
+    @abstractmethod
+    def keeps_traces(self, next_state: tuple[int, int], next_action: str) -> bool: ...
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        next_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        q_table = self.q_table
+        if done:
+            target = reward
+            decay = 0.0
+        else:
+            next_action = super().act(next_state)
+            self._next_action = (next_state, next_action)
+            target = reward + self.gamma * self.bootstrap(next_state, next_action)
+            decay = (
+                self.gamma * self.trace_decay
+                if self.keeps_traces(next_state, next_action)
+                else 0.0
+            )
+        step_size = self.alpha * (target - q_table[state][action])
+
+        # replacing traces: trying a pair again resets its trace rather than adding to it
+        self.traces[(state, action)] = 1.0
+        traces: dict[tuple[tuple[int, int], str], float] = {}
+        for (trace_state, trace_action), trace in self.traces.items():
+            q_table[trace_state][trace_action] += step_size * trace
+            trace *= decay
+            if trace >= self.trace_cutoff:
+                traces[(trace_state, trace_action)] = trace
+        self.traces = traces
+
+
+class SarsaLambdaAgent(EligibilityTraceAgent):
+    def bootstrap(self, next_state: tuple[int, int], next_action: str) -> float:
+        return self.q_table[next_state][next_action]
+
+    def keeps_traces(self, next_state: tuple[int, int], next_action: str) -> bool:
+        return True
+
+
+class QLambdaAgent(EligibilityTraceAgent):
+    def bootstrap(self, next_state: tuple[int, int], next_action: str) -> float:
+        return max(self.q_table[next_state].values())
+
+    def keeps_traces(self, next_state: tuple[int, int], next_action: str) -> bool:
+        q_values = self.q_table[next_state]
+        return q_values[next_action] == max(q_values.values())
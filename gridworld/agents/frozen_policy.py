@@ -0,0 +1,81 @@
+"""
+A trained agent's greedy policy, compiled for evaluation.
+
+Evaluating a QLearningAgent still samples epsilon and takes the max over its q values on
+every step, and ties are broken at random, so two evaluation runs can differ. A
+FrozenPolicy stores one int8 action index per state instead, the best action of the
+agent's Q-table with ties going to the first action in ``SIMPLE_ACTIONS`` order. Acting is
+a single array lookup and observing does nothing, so it never changes.
+
+The actions live in one read-only array of ``rows * cols`` bytes, which makes a policy
+cheap to pickle and send to worker processes.
+
+Example usage:
+    policy = FrozenPolicy.from_agent(agent, rows=env.rows, cols=env.cols)
+    results = Runner(env, policy).run_episodes(10)
+"""
+
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.utils import SIMPLE_ACTIONS, Step
+
+
+class FrozenPolicy(Agent):
+    def __init__(self, action_indices: NDArray[np.int8], cols: int) -> None:
+        """``action_indices`` is the ``SIMPLE_ACTIONS`` index of each flat state."""
+        if action_indices.ndim != 1 or len(action_indices) % cols:
+            raise ValueError(
+                f"Expected one action per state of a grid {cols} wide, "
+                f"got an array of shape {action_indices.shape}."
+            )
+        self.action_indices = np.array(action_indices, dtype=np.int8)
+        self.action_indices.setflags(write=False)
+        super().__init__(rows=len(action_indices) // cols, cols=cols)
+
+    @classmethod
+    def from_agent(
+        cls,
+        agent: QLearningAgent,
+        *,
+        rows: int | None = None,
+        cols: int | None = None,
+    ) -> "FrozenPolicy":
+        """
+        The greedy policy of ``agent``. A dict Q-table does not know the size of the
+        grid, so pass its ``rows`` and ``cols``.
+        """
+        q_table = DenseQTable.of(agent.q_table, rows=rows, cols=cols)
+        # argmax returns the first of tied actions
+        return cls(np.argmax(q_table.values, axis=1).astype(np.int8), q_table.cols)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # rebuild through __init__ so the unpickled array is read-only again
+        return (FrozenPolicy, (self.action_indices, self.cols))
+
+    def act(self, state: tuple[int, int]) -> str:
+        row, col = state
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise KeyError(state)
+        return SIMPLE_ACTIONS[self.action_indices.item(row * self.cols + col)]
+
+    def observe(self, step: Step) -> None:
+        pass
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        new_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from gridworld.utils import Step
+
 
 class Agent(ABC):
     def __init__(
@@ -20,3 +22,17 @@ class Agent(ABC):
     def observe(self, *args: Any, **kwargs: Any): ...
     @abstractmethod
     def reset(self, **kwargs: Any): ...
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        new_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        """
+        Called by ``Runner.run_episode_fast`` instead of ``observe``. Agents that learn
+        on every step override this so the fast loop does not build a ``Step``.
+        """
+        self.observe(Step(state, action, reward, new_state, done))
@@ -0,0 +1,335 @@
+"""
+An out-of-core Q-table: q values in a memory-mapped file, with a small page cache.
+
+A DenseQTable of a 10,000 x 10,000 grid is 3.2 GB of float64, and the dict table grows
+by a few hundred bytes for every state visited. MemmapQTable keeps the table in a file
+instead, laid out like SharedQTable's block: the ``(rows * cols, n_actions)`` float64
+values, then one ``seen`` byte per state. The file is created sparse, so the disk only
+fills where the agent writes.
+
+The states are split into pages of ``page_size`` states. The first access to a page is a
+page fault: the page is copied out of the file into an in-memory cache of
+``cache_pages`` pages, least recently used first out. Writes only change the cached
+copy and mark it dirty, and a dirty page is written back to the file when it is evicted
+or on ``flush()``. Memory use is therefore bounded by ``cache_pages * page_size``
+states, however large the grid, and an agent that stays in one region hardly touches
+the disk. ``stats`` counts hits, page faults, evictions and write-backs.
+
+Like DenseQTable it is a mapping from state to a ``{action: q_value}`` row, and a state
+only shows up as a key once it has been looked up or assigned. Iterating or taking
+``len`` reads the whole ``seen`` block, a byte per state, so keep that out of the
+training loop. QLearningAgent uses the table through the mapping, with
+``backend="memmap"`` or by assigning a table configured here. Every lookup goes through
+the page cache in Python, so a step costs about twice what it does with a dict table;
+the trade is memory that does not grow with the states visited.
+
+Example usage:
+    with MemmapQTable(10_000, 10_000, path="output/q_table.bin") as q_table:
+        agent = QLearningAgent()
+        agent.q_table = q_table
+        Runner(env, agent).run_episodes_fast(100)
+        q_table.stats.hit_rate
+"""
+
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from dataclasses import dataclass
+from types import TracebackType
+from typing import cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.utils import SIMPLE_ACTIONS
+
+
+@dataclass
+class PageCacheStats:
+    hits: int = 0
+    page_faults: int = 0
+    evictions: int = 0
+    # evicted or flushed pages that had changed, so were written to the file
+    write_backs: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        accesses = self.hits + self.page_faults
+        return self.hits / accesses if accesses else 0.0
+
+
+class Page:
+    """The in-memory copy of ``page_size`` states of the file."""
+
+    def __init__(self, values: NDArray[np.float64], seen: NDArray[np.bool_]) -> None:
+        self.values = values
+        self.seen = seen
+        self.dirty = False
+
+
+class PagedRow(MutableMapping[str, float]):
+    """
+    The ``{action: q_value}`` view of one state of a MemmapQTable. Every access goes
+    through the table's cache, so the row stays valid when its page is evicted.
+    """
+
+    def __init__(self, table: "MemmapQTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, action: str) -> float:
+        page, offset = self._table.page(self._index)
+        return page.values.item(offset, self._table.action_index[action])
+
+    def __setitem__(self, action: str, value: float) -> None:
+        page, offset = self._table.page(self._index)
+        page.values[offset, self._table.action_index[action]] = value
+        page.dirty = True
+
+    def __delitem__(self, action: str) -> None:
+        raise TypeError("Actions cannot be removed from a memory-mapped Q-table row.")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.actions)
+
+    def __len__(self) -> int:
+        return len(self._table.actions)
+
+    def values(self) -> list[float]:  # type: ignore[override]
+        """All q values at once, with one cache lookup instead of one per action."""
+        page, offset = self._table.page(self._index)
+        return page.values[offset].tolist()
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def _store_page(
+    values: NDArray[np.float64],
+    seen: NDArray[np.bool_],
+    start: int,
+    page: Page,
+) -> None:
+    values[start : start + len(page.values)] = page.values
+    seen[start : start + len(page.seen)] = page.seen
+    page.dirty = False
+
+
+def _release(
+    values: "np.memmap[tuple[int, ...], np.dtype[np.float64]]",
+    seen: "np.memmap[tuple[int, ...], np.dtype[np.bool_]]",
+    pages: "OrderedDict[int, Page]",
+    page_size: int,
+    temporary_path: str | None,
+) -> None:
+    """
+    Run by ``close()`` or when a table is garbage collected: a temporary file is
+    deleted, any other file gets the dirty cached pages written back and is flushed.
+    """
+    if temporary_path is not None:
+        os.remove(temporary_path)
+        return
+    for number, page in pages.items():
+        if page.dirty:
+            _store_page(values, seen, number * page_size, page)
+    values.flush()
+    seen.flush()
+
+
+class MemmapQTable(MutableMapping[tuple[int, int], MutableMapping[str, float]]):
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        actions: Sequence[str] = SIMPLE_ACTIONS,
+        *,
+        path: str | None = None,
+        page_size: int = 4_096,
+        cache_pages: int = 64,
+    ) -> None:
+        """
+        Without ``path`` the table lives in a temporary file, deleted on ``close()`` or
+        when the table is garbage collected. A table at ``path`` that is garbage
+        collected without ``close()`` still writes its cached changes to the file.
+        An existing file at ``path`` is opened and trained further, it must have been
+        written for the same ``rows``, ``cols`` and ``actions``.
+        """
+        if page_size <= 0 or cache_pages <= 0:
+            raise ValueError("page_size and cache_pages must be positive.")
+        self.rows = rows
+        self.cols = cols
+        self.actions = list(actions)
+        self.action_index = {action: i for i, action in enumerate(self.actions)}
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.stats = PageCacheStats()
+
+        states = rows * cols
+        values_bytes = states * len(self.actions) * np.dtype(np.float64).itemsize
+        size = values_bytes + states
+        temporary_path = None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".qtable")
+            os.close(handle)
+            temporary_path = path
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            if os.path.getsize(path) != size:
+                raise ValueError(
+                    f"{path} holds {os.path.getsize(path)} bytes, a {rows}x{cols} "
+                    f"table with {len(self.actions)} actions needs {size}."
+                )
+        else:
+            # a sparse file of zeros, the disk fills as pages are written back
+            with open(path, "wb") as f:
+                f.truncate(size)
+
+        self._values = np.memmap(
+            path, dtype=np.float64, mode="r+", shape=(states, len(self.actions))
+        )
+        self._seen = np.memmap(
+            path, dtype=np.bool_, mode="r+", shape=(states,), offset=values_bytes
+        )
+        self._pages: OrderedDict[int, Page] = OrderedDict()
+        # the page used last, looked up without touching the LRU order
+        self._last_number = -1
+        self._last_page: Page | None = None
+        # holds the file and the cache, not the table, so it can run once it is gone
+        self._finalizer = weakref.finalize(
+            self,
+            _release,
+            self._values,
+            self._seen,
+            self._pages,
+            page_size,
+            temporary_path,
+        )
+
+    def page(self, index: int) -> tuple[Page, int]:
+        """The cached page holding flat state ``index`` and its offset in the page."""
+        number, offset = divmod(index, self.page_size)
+        if number == self._last_number:
+            self.stats.hits += 1
+            return cast(Page, self._last_page), offset
+
+        page = self._pages.get(number)
+        if page is None:
+            self.stats.page_faults += 1
+            page = self._read_page(number)
+            self._pages[number] = page
+            if len(self._pages) > self.cache_pages:
+                evicted_number, evicted = self._pages.popitem(last=False)
+                self.stats.evictions += 1
+                self._write_page(evicted_number, evicted)
+        else:
+            self.stats.hits += 1
+            self._pages.move_to_end(number)
+        self._last_number = number
+        self._last_page = page
+        return page, offset
+
+    def _read_page(self, number: int) -> Page:
+        start = number * self.page_size
+        stop = start + self.page_size
+        return Page(
+            np.array(self._values[start:stop]), np.array(self._seen[start:stop])
+        )
+
+    def _write_page(self, number: int, page: Page) -> None:
+        if not page.dirty:
+            return
+        _store_page(self._values, self._seen, number * self.page_size, page)
+        self.stats.write_backs += 1
+
+    def flush(self) -> None:
+        """Write every dirty cached page back and flush the file to disk."""
+        for number, page in self._pages.items():
+            self._write_page(number, page)
+        self._values.flush()
+        self._seen.flush()
+
+    def close(self) -> None:
+        """Flush and release the file, deleting it if it was a temporary one."""
+        self.flush()
+        self._pages.clear()
+        self._last_number = -1
+        self._last_page = None
+        del self._values, self._seen
+        self._finalizer()
+
+    def __enter__(self) -> "MemmapQTable":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def cached_bytes(self) -> int:
+        """The memory held by the cached pages."""
+        return sum(
+            page.values.nbytes + page.seen.nbytes for page in self._pages.values()
+        )
+
+    def index(self, state: tuple[int, int]) -> int:
+        if not (0 <= state[0] < self.rows and 0 <= state[1] < self.cols):
+            raise KeyError(state)
+        return state[0] * self.cols + state[1]
+
+    def _seen_mask(self) -> NDArray[np.bool_]:
+        """Which states have been seen, from the cached pages where they are newer."""
+        seen = np.array(self._seen)
+        for number, page in self._pages.items():
+            start = number * self.page_size
+            seen[start : start + len(page.seen)] = page.seen
+        return seen
+
+    def __getitem__(self, state: tuple[int, int]) -> PagedRow:
+        index = self.index(state)
+        page, offset = self.page(index)
+        if not page.seen[offset]:
+            page.seen[offset] = True
+            page.dirty = True
+        return PagedRow(self, index)
+
+    def __setitem__(self, state: tuple[int, int], row: Mapping[str, float]) -> None:
+        page, offset = self.page(self.index(state))
+        page.seen[offset] = True
+        page.values[offset] = 0.0
+        for action, value in row.items():
+            page.values[offset, self.action_index[action]] = value
+        page.dirty = True
+
+    def __delitem__(self, state: tuple[int, int]) -> None:
+        page, offset = self.page(self.index(state))
+        if not page.seen[offset]:
+            raise KeyError(state)
+        page.seen[offset] = False
+        page.values[offset] = 0.0
+        page.dirty = True
+
+    def __contains__(self, state: object) -> bool:
+        if not isinstance(state, tuple):
+            return False
+        try:
+            index = self.index(cast(tuple[int, int], state))
+        except (IndexError, KeyError, TypeError):
+            return False
+        page, offset = self.page(index)
+        return bool(page.seen[offset])
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for index in np.flatnonzero(self._seen_mask()).tolist():
+            yield divmod(index, self.cols)
+
+    def __len__(self) -> int:
+        return int(self._seen_mask().sum())
+
+    def __repr__(self) -> str:
+        return f"MemmapQTable({self.rows}x{self.cols}, path={self.path!r})"
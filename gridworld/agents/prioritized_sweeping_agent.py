@@ -0,0 +1,130 @@
+import heapq
+from collections import defaultdict
+from random import Random
+from typing import Any
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+
+
+class PrioritizedSweepingAgent(QLearningAgent):
+    def __init__(
+        self,
+        *,
+        rng: Random | None = None,
+        planning_steps: int = 20,
+        theta: float = 1e-4,
+        goal: tuple[int, int] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Q-learning with a learned model of the maze (Dyna-Q with prioritized sweeping).
+
+        The mazes are deterministic, so the agent remembers the reward and next state of
+        every (state, action) it has tried. Besides learning from the real step, it keeps
+        a priority queue of (state, action) pairs whose q value would change by more
+        than ``theta``, largest change first. After each real step it replays up to
+        ``planning_steps`` of them from the model, and queues the predecessors of every
+        state whose value changed, so a reward spreads back along the whole path.
+
+        The environments also end an episode when it runs out of steps, and the state
+        it stopped in still has a future. Only a step into the ``goal`` is terminal.
+        Without ``goal``, a done step is terminal until the agent acts from the state it
+        led to: episodes end at the goal, so the agent never acts from there.
+
+        Acting is the same epsilon greedy choice as QLearningAgent.
+        """
+        super().__init__(rng=rng, **kwargs)
+        self.planning_steps = planning_steps
+        self.theta = theta
+        self.goal_state = goal
+        # the model is exact, so backups can move all the way to their target
+        self.alpha = 1.0
+        self.model: dict[
+            tuple[tuple[int, int], str], tuple[float, tuple[int, int], bool]
+        ] = {}
+        self.predecessors: defaultdict[
+            tuple[int, int], set[tuple[tuple[int, int], str]]
+        ] = defaultdict(set)
+        # the states the agent has acted from, none of them is the goal
+        self._acted_from: set[tuple[int, int]] = set()
+        self._queue: list[tuple[float, int, tuple[int, int], str]] = []
+        # the highest priority each pair is queued with, older heap entries are stale
+        self._queued: dict[tuple[tuple[int, int], str], float] = {}
+        self._pushes = 0
+        self.backups = 0
+
+    def _is_terminal(self, next_state: tuple[int, int], done: bool) -> bool:
+        """Whether a done step reached the goal, rather than running out of steps."""
+        if not done:
+            return False
+        if self.goal_state is not None:
+            return next_state == self.goal_state
+        return next_state not in self._acted_from
+
+    def _target(self, reward: float, next_state: tuple[int, int], done: bool) -> float:
+        if self._is_terminal(next_state, done):
+            return reward
+        return reward + self.gamma * max(self.q_table[next_state].values())
+
+    def _push(self, state: tuple[int, int], action: str, priority: float) -> None:
+        if priority <= self.theta:
+            return
+        key = (state, action)
+        if priority <= self._queued.get(key, 0.0):
+            return
+        self._queued[key] = priority
+        self._pushes += 1
+        heapq.heappush(self._queue, (-priority, self._pushes, state, action))
+
+    def _pop(self) -> tuple[tuple[int, int], str] | None:
+        while self._queue:
+            negative_priority, _, state, action = heapq.heappop(self._queue)
+            if self._queued.get((state, action)) == -negative_priority:
+                del self._queued[(state, action)]
+                return state, action
+        return None
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        next_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        self._acted_from.add(state)
+        self.model[(state, action)] = (reward, next_state, done)
+        self.predecessors[next_state].add((state, action))
+        # the real step is learned from right away, planning only adds to it
+        self._queued.pop((state, action), None)
+        self._backup(state, action)
+        self.plan()
+
+    def plan(self) -> None:
+        for _ in range(self.planning_steps):
+            pair = self._pop()
+            if pair is None:
+                return
+            self._backup(*pair)
+
+    def _backup(self, state: tuple[int, int], action: str) -> None:
+        """Update one q value from the model and queue the pairs leading to it."""
+        reward, next_state, done = self.model[(state, action)]
+        current_q = self.q_table[state][action]
+        self.q_table[state][action] = current_q + self.alpha * (
+            self._target(reward, next_state, done) - current_q
+        )
+        self.backups += 1
+
+        for previous_state, previous_action in self.predecessors[state]:
+            previous_reward, _, previous_done = self.model[
+                (previous_state, previous_action)
+            ]
+            self._push(
+                previous_state,
+                previous_action,
+                abs(
+                    self._target(previous_reward, state, previous_done)
+                    - self.q_table[previous_state][previous_action]
+                ),
+            )
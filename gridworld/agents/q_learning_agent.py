@@ -1,17 +1,61 @@
 from collections import defaultdict
+from collections.abc import Mapping, MutableMapping
 from random import Random
-from typing import Any
+from typing import Any, Literal
 
 from gridworld.agents.generic_agent import Agent
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.agents.replay_buffer import ReplayBuffer
 from gridworld.utils import SIMPLE_ACTIONS, Step
 
 
 class QLearningAgent(Agent):
-    def __init__(self, *, rng: Random | None = None, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *,
+        rng: Random | None = None,
+        backend: Literal["dict", "dense", "memmap"] = "dict",
+        rows: int | None = None,
+        cols: int | None = None,
+        replay: ReplayBuffer | None = None,
+        replay_updates: int = 1,
+        batch_size: int = 32,
+        **kwargs: Any,
+    ) -> None:
+        """
+        ``backend="dense"`` stores the q values in a DenseQTable of ``rows * cols``
+        states instead of a dict per state, see gridworld/agents/q_tables.py.
+        ``backend="memmap"`` keeps them in a temporary file with a small page cache,
+        for grids too large to hold in memory, see gridworld/agents/memmap_q_table.py.
+        Both need the grid's ``rows`` and ``cols``, and a state outside of them raises a
+        KeyError rather than sharing another state's q values.
+
+        With a ``replay`` buffer (dense backend only), every observed step is also
+        stored, then ``replay_updates`` minibatches of ``batch_size`` stored steps are
+        learned from, see gridworld/agents/replay_buffer.py.
+        """
         self.actions = SIMPLE_ACTIONS
-        self.q_table: defaultdict[tuple[int, int], dict[str, float]] = defaultdict(
-            lambda: {action: 0.0 for action in self.actions}
-        )
+        self.q_table: Mapping[tuple[int, int], MutableMapping[str, float]]
+        if backend in ("dense", "memmap") and (rows is None or cols is None):
+            raise ValueError(
+                f'backend="{backend}" needs the rows and cols of the grid.'
+            )
+        if backend == "dense":
+            assert rows is not None and cols is not None
+            self.q_table = DenseQTable(rows, cols, self.actions)
+        elif backend == "memmap":
+            assert rows is not None and cols is not None
+            self.q_table = MemmapQTable(rows, cols, self.actions)
+        elif backend == "dict":
+            self.q_table = defaultdict(lambda: {action: 0.0 for action in self.actions})
+        else:
+            raise ValueError(f"Unknown q table backend: {backend}")
+        if replay is not None and backend != "dense":
+            raise ValueError("Experience replay needs the dense q table backend.")
+        self.replay = replay
+        self.replay_updates = replay_updates
+        self.batch_size = batch_size
         # exploration rate
         self.epsilon = 0.1
         # learning rate (how fast Q-values update)
@@ -31,7 +75,22 @@ class QLearningAgent(Agent):
         if self.rng.random() < self.epsilon:
             return self.rng.choice(self.actions)
 
-        q_values = self.q_table[state]
+        q_table = self.q_table
+        if isinstance(q_table, DenseQTable):
+            index = q_table.index(state)
+            q_table.seen[index] = True
+            # on a handful of actions, python's max beats numpy's reductions
+            row = q_table.values[index].tolist()
+            max_q_value = max(row)
+            return self.rng.choice(
+                [
+                    action
+                    for action, q_value in zip(self.actions, row)
+                    if q_value == max_q_value
+                ]
+            )
+
+        q_values = q_table[state]
         max_q_value = max(q_values.values())
 
         best_actions = [
@@ -43,20 +102,59 @@ class QLearningAgent(Agent):
         pass
 
     def observe(self, step: Step) -> None:
-        state = step.start
-        next_state = step.new_state
-        action = step.action
-        reward = step.reward
-        done = step.done
+        self.observe_transition(*step)
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        next_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        q_table = self.q_table
+        if isinstance(q_table, DenseQTable):
+            values = q_table.values
+            index = q_table.index(state)
+            next_index = q_table.index(next_state)
+            action_index = q_table.action_index[action]
+            q_table.seen[index] = True
 
-        current_q = self.q_table[state][action]
+            current_q = values.item(index, action_index)
+            if done:
+                best_future_q = 0
+            else:
+                q_table.seen[next_index] = True
+                best_future_q = max(values[next_index].tolist())
+            values[index, action_index] = current_q + self.alpha * (
+                reward + self.gamma * best_future_q - current_q
+            )
+            if self.replay is not None:
+                self.replay.add(
+                    index,
+                    action_index,
+                    reward,
+                    next_index,
+                    done,
+                )
+                self.learn_from_replay(q_table)
+            return
+
+        current_q = q_table[state][action]
 
         if done:
             best_future_q = 0
         else:
-            best_future_q = max(self.q_table[next_state].values())
+            best_future_q = max(q_table[next_state].values())
 
         updated_q = current_q + self.alpha * (
             reward + self.gamma * best_future_q - current_q
         )
-        self.q_table[state][action] = updated_q
+        q_table[state][action] = updated_q
+
+    def learn_from_replay(self, q_table: DenseQTable) -> None:
+        if self.replay is None:
+            return
+        for _ in range(self.replay_updates):
+            batch = self.replay.sample(self.batch_size)
+            q_table.q_learning_update(*batch, alpha=self.alpha, gamma=self.gamma)
@@ -0,0 +1,278 @@
+"""
+Dense Q-table storage.
+
+QLearningAgent's default ``q_table`` is a ``defaultdict`` of per-state dicts keyed by
+action name. DenseQTable keeps the same values in one ``(rows * cols, n_actions)`` float
+array instead, indexed by ``row * cols + col`` and by the action's position in
+``actions``. Agents read and write ``values`` directly, and whole batches of states can
+be handled at once, e.g. ``greedy_actions(states)``.
+
+DenseQTable is also a mapping from state to a ``{action: q_value}`` row view, so code
+written for the dict table (``render_heatmap(q_table=...)``, tests comparing against
+dicts, ``q_table[state][action] = ...``) keeps working. Like the defaultdict, a state
+only shows up as a key once it has been looked up or assigned through the mapping.
+
+Example usage:
+    agent = QLearningAgent(backend="dense", rows=10, cols=10)
+    agent.q_table.values  # (100, 4) array
+    render_heatmap(..., q_table=agent.q_table)
+"""
+
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from typing import cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.utils import SIMPLE_ACTIONS
+
+
+class QRow(MutableMapping[str, float]):
+    """The ``{action: q_value}`` view of one state's row in a DenseQTable."""
+
+    def __init__(self, table: "DenseQTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, action: str) -> float:
+        return self._table.values.item(self._index, self._table.action_index[action])
+
+    def __setitem__(self, action: str, value: float) -> None:
+        self._table.values[self._index, self._table.action_index[action]] = value
+
+    def __delitem__(self, action: str) -> None:
+        raise TypeError("Actions cannot be removed from a dense Q-table row.")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.actions)
+
+    def __len__(self) -> int:
+        return len(self._table.actions)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class DenseQTable(MutableMapping[tuple[int, int], MutableMapping[str, float]]):
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        actions: Sequence[str] = SIMPLE_ACTIONS,
+        *,
+        values: NDArray[np.float64] | None = None,
+        seen: NDArray[np.bool_] | None = None,
+    ) -> None:
+        """
+        ``values`` and ``seen`` wrap existing arrays, such as a read-only memory map from
+        ``load_checkpoint``, instead of starting from zeros.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.actions = list(actions)
+        self.action_index = {action: i for i, action in enumerate(self.actions)}
+        shape = (rows * cols, len(self.actions))
+        if values is None:
+            values = np.zeros(shape, dtype=np.float64)
+        elif values.shape != shape:
+            raise ValueError(f"Expected q values of shape {shape}, got {values.shape}.")
+        self.values: NDArray[np.float64] = values
+        # which states the mapping exposes as keys, see the module docstring. Agents that
+        # write to ``values`` directly mark the states they touch here.
+        self.seen = np.zeros(rows * cols, dtype=np.bool_) if seen is None else seen
+
+    @classmethod
+    def from_mapping(
+        cls,
+        q_table: Mapping[tuple[int, int], Mapping[str, float]],
+        actions: Sequence[str] = SIMPLE_ACTIONS,
+        *,
+        rows: int | None = None,
+        cols: int | None = None,
+    ) -> "DenseQTable":
+        """
+        A dense copy of any ``{state: {action: q_value}}`` table. Without ``rows`` and
+        ``cols`` the grid is just big enough for the states in ``q_table``.
+        """
+        if rows is None:
+            rows = max((state[0] + 1 for state in q_table), default=1)
+        if cols is None:
+            cols = max((state[1] + 1 for state in q_table), default=1)
+        table = cls(rows, cols, actions)
+        for state, q_values in q_table.items():
+            index = table.index(state)
+            table.seen[index] = True
+            table.values[index] = [q_values[action] for action in table.actions]
+        return table
+
+    @classmethod
+    def of(
+        cls,
+        q_table: Mapping[tuple[int, int], Mapping[str, float]],
+        *,
+        rows: int | None = None,
+        cols: int | None = None,
+    ) -> "DenseQTable":
+        """
+        Any agent's ``q_table`` as a DenseQTable with its columns in ``SIMPLE_ACTIONS``
+        order, to read all of its values at once. A DenseQTable already in that order is
+        returned as it is, any other table is copied, so reading a defaultdict does not
+        add states to it. See ``grid_size`` for ``rows`` and ``cols``.
+        """
+        rows, cols = grid_size(q_table, rows=rows, cols=cols)
+        if not isinstance(q_table, DenseQTable):
+            return cls.from_mapping(q_table, rows=rows, cols=cols)
+        if q_table.actions == SIMPLE_ACTIONS:
+            return q_table
+        columns = [q_table.action_index[action] for action in SIMPLE_ACTIONS]
+        return cls(rows, cols, values=q_table.values[:, columns], seen=q_table.seen)
+
+    def index(self, state: tuple[int, int]) -> int:
+        if not (0 <= state[0] < self.rows and 0 <= state[1] < self.cols):
+            raise KeyError(state)
+        return state[0] * self.cols + state[1]
+
+    def row(self, state: tuple[int, int]) -> list[float]:
+        """The q values of ``state`` in ``actions`` order, without marking it seen."""
+        return self.values[self.index(state)].tolist()
+
+    def greedy_actions(
+        self,
+        states: NDArray[np.int64],
+        rng: np.random.Generator | None = None,
+    ) -> NDArray[np.int64]:
+        """
+        The index of the best action for each flat state. With ``rng``, ties are broken
+        uniformly at random, otherwise the first best action wins.
+        """
+        q_values = self.values[states]
+        if rng is None:
+            return np.argmax(q_values, axis=1)
+        is_best = q_values == q_values.max(axis=1, keepdims=True)
+        # a random score for each best action, -1 for the rest, then take the highest
+        scores = np.where(is_best, rng.random(q_values.shape), -1.0)
+        return np.argmax(scores, axis=1)
+
+    def q_learning_update(
+        self,
+        states: NDArray[np.int64],
+        actions: NDArray[np.int64],
+        rewards: NDArray[np.float64],
+        next_states: NDArray[np.int64],
+        dones: NDArray[np.bool_],
+        *,
+        alpha: float,
+        gamma: float | NDArray[np.float64],
+    ) -> None:
+        """
+        Apply the Q-learning update for a batch of flat ``(state, action)`` transitions
+        at once. A batch can hold the same pair several times, each pair moves by the
+        mean of its updates so duplicates do not overshoot. ``gamma`` can be an array
+        with one discount per transition, such as ``gamma ** n`` for n-step returns.
+        """
+        values = self.values
+        best_future_q = np.where(dones, 0.0, values[next_states].max(axis=1))
+        updates = alpha * (rewards + gamma * best_future_q - values[states, actions])
+
+        pairs = states * values.shape[1] + actions
+        unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+        totals = np.bincount(inverse, weights=updates)
+        counts = np.bincount(inverse)
+        values.reshape(-1)[unique_pairs] += totals / counts
+
+    def q_learning_sweep(
+        self,
+        states: NDArray[np.int64],
+        actions: NDArray[np.int64],
+        rewards: NDArray[np.float64],
+        next_states: NDArray[np.int64],
+        dones: NDArray[np.bool_],
+        *,
+        alpha: float,
+        gamma: float,
+    ) -> None:
+        """
+        Apply the Q-learning update to each transition in turn, exactly as an agent
+        observing them one by one would. Slower than ``q_learning_update``, but each
+        update sees the ones before it, so a reward spreads along a trajectory the same
+        way it does online.
+        """
+        values = self.values
+        self.seen[states] = True
+        self.seen[next_states[~dones]] = True
+        for state, action, reward, next_state, done in zip(
+            states.tolist(),
+            actions.tolist(),
+            rewards.tolist(),
+            next_states.tolist(),
+            dones.tolist(),
+        ):
+            current_q = values.item(state, action)
+            best_future_q = 0.0 if done else max(values[next_state].tolist())
+            values[state, action] = current_q + alpha * (
+                reward + gamma * best_future_q - current_q
+            )
+
+    def __getitem__(self, state: tuple[int, int]) -> QRow:
+        index = self.index(state)
+        self.seen[index] = True
+        return QRow(self, index)
+
+    def __setitem__(self, state: tuple[int, int], row: Mapping[str, float]) -> None:
+        index = self.index(state)
+        self.seen[index] = True
+        self.values[index] = 0.0
+        for action, value in row.items():
+            self.values[index, self.action_index[action]] = value
+
+    def __delitem__(self, state: tuple[int, int]) -> None:
+        index = self.index(state)
+        if not self.seen[index]:
+            raise KeyError(state)
+        self.seen[index] = False
+        self.values[index] = 0.0
+
+    def __contains__(self, state: object) -> bool:
+        if not isinstance(state, tuple):
+            return False
+        try:
+            index = self.index(cast(tuple[int, int], state))
+        except (IndexError, KeyError, TypeError):
+            return False
+        return bool(self.seen[index])
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for index in np.flatnonzero(self.seen).tolist():
+            yield divmod(index, self.cols)
+
+    def __len__(self) -> int:
+        return int(self.seen.sum())
+
+    def __repr__(self) -> str:
+        return f"DenseQTable({dict(self.items())})"
+
+
+def grid_size(
+    q_table: Mapping[tuple[int, int], Mapping[str, float]],
+    *,
+    rows: int | None = None,
+    cols: int | None = None,
+) -> tuple[int, int]:
+    """
+    The rows and cols of the grid ``q_table`` covers. An array table knows its own size,
+    which must match ``rows`` and ``cols`` when they are given. A dict table does not,
+    so it needs them.
+    """
+    if isinstance(q_table, (DenseQTable, MemmapQTable)):
+        rows = q_table.rows if rows is None else rows
+        cols = q_table.cols if cols is None else cols
+        if (rows, cols) != (q_table.rows, q_table.cols):
+            raise ValueError(
+                f"The agent's table is {q_table.rows}x{q_table.cols}, "
+                f"but the grid is {rows}x{cols}."
+            )
+        return rows, cols
+    if rows is None or cols is None:
+        raise ValueError("A dict Q-table needs the rows and cols of the grid.")
+    return rows, cols
@@ -18,6 +18,9 @@ class RandomAgent(Agent):
     def observe(self, *args: Any, **kwargs: Any):
         pass
 
+    def observe_transition(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
     def reset(self, **kwargs: Any):
         pass
 
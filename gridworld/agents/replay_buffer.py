@@ -0,0 +1,73 @@
+"""
+Experience replay for tabular agents.
+
+ReplayBuffer keeps the last ``capacity`` transitions in fixed size NumPy ring arrays,
+with states as flat ``row * cols + col`` indices and actions as indices into
+``SIMPLE_ACTIONS``. Once the buffer is full, each new transition overwrites the oldest
+one, so nothing is allocated after construction.
+
+``QLearningAgent(backend="dense", rows=..., cols=..., replay=ReplayBuffer(10_000),
+replay_updates=4)`` adds every step it observes to the buffer and then applies
+``replay_updates`` minibatch updates, sampled uniformly from the buffer, to its
+DenseQTable in a vectorized way.
+Each real environment step is then learned from several times.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class ReplayBatch(NamedTuple):
+    states: NDArray[np.int64]
+    actions: NDArray[np.int64]
+    rewards: NDArray[np.float64]
+    next_states: NDArray[np.int64]
+    dones: NDArray[np.bool_]
+
+
+class ReplayBuffer:
+    def __init__(
+        self, capacity: int, *, rng: np.random.Generator | None = None
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}.")
+        self.capacity = capacity
+        self.rng = rng or np.random.default_rng()
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+        self._position = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(
+        self, state: int, action: int, reward: float, next_state: int, done: bool
+    ) -> None:
+        position = self._position
+        self.states[position] = state
+        self.actions[position] = action
+        self.rewards[position] = reward
+        self.next_states[position] = next_state
+        self.dones[position] = done
+        self._position = (position + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def sample(self, batch_size: int) -> ReplayBatch:
+        """``batch_size`` transitions drawn uniformly, with replacement."""
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        indices = self.rng.integers(0, self._size, size=batch_size)
+        return ReplayBatch(
+            states=self.states[indices],
+            actions=self.actions[indices],
+            rewards=self.rewards[indices],
+            next_states=self.next_states[indices],
+            dones=self.dones[indices],
+        )
@@ -0,0 +1,112 @@
+"""
+A DenseQTable whose arrays live in ``multiprocessing.shared_memory``.
+
+The creating process allocates one block holding the q values and the seen mask, then
+sends workers a small ``SharedQTableHandle``. Each worker attaches and gets a DenseQTable
+whose ``values`` and ``seen`` are views into the block, so every worker reads and writes
+the same table. Writes are not locked, see gridworld/hogwild.py.
+
+Like SharedMaze, the creating process owns the block and unlinks it when done (using
+``SharedQTable`` as a context manager does both close and unlink).
+
+Example usage:
+    with SharedQTable.create(rows=10, cols=10) as shared:
+        with Pool(4) as pool:
+            pool.map(run_worker, [shared.handle] * 4)
+        q_table = shared.copy()
+
+    def run_worker(handle: SharedQTableHandle) -> None:
+        shared = SharedQTable.attach(handle)
+        agent = QLearningAgent(backend="dense", rows=handle.rows, cols=handle.cols)
+        agent.q_table = shared.table
+        ...
+"""
+
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+
+import numpy as np
+
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.utils import SIMPLE_ACTIONS
+
+
+@dataclass(frozen=True)
+class SharedQTableHandle:
+    """Everything a worker needs to attach to a shared Q-table. Cheap to pickle."""
+
+    name: str
+    rows: int
+    cols: int
+
+
+class SharedQTable:
+    def __init__(self, shm: SharedMemory, handle: SharedQTableHandle, owner: bool):
+        self._shm = shm
+        self.handle = handle
+        self.owner = owner
+
+        states = handle.rows * handle.cols
+        # the float values come first so they stay 8 byte aligned
+        values = np.ndarray(
+            (states, len(SIMPLE_ACTIONS)), dtype=np.float64, buffer=shm.buf
+        )
+        seen = np.ndarray(
+            (states,), dtype=np.bool_, buffer=shm.buf, offset=values.nbytes
+        )
+        self.table: DenseQTable = DenseQTable(
+            handle.rows, handle.cols, values=values, seen=seen
+        )
+
+    @classmethod
+    def create(cls, rows: int, cols: int) -> "SharedQTable":
+        """A new, zeroed table in a new block."""
+        states = rows * cols
+        size = states * len(SIMPLE_ACTIONS) * np.dtype(np.float64).itemsize + states
+        shm = SharedMemory(create=True, size=size)
+        shared = cls(shm, SharedQTableHandle(name=shm.name, rows=rows, cols=cols), True)
+        shared.table.values[:] = 0.0
+        shared.table.seen[:] = False
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedQTableHandle) -> "SharedQTable":
+        return cls(SharedMemory(name=handle.name), handle, owner=False)
+
+    def copy(self) -> DenseQTable:
+        """The current table, copied out of shared memory."""
+        return DenseQTable(
+            self.handle.rows,
+            self.handle.cols,
+            values=self.table.values.copy(),
+            seen=self.table.seen.copy(),
+        )
+
+    def close(self) -> None:
+        """
+        Detach from the block. Agents using ``table`` must be released first, since it
+        holds views into it.
+        """
+        del self.table
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if not self.owner:
+            raise RuntimeError(
+                "Only the process that created the Q-table can unlink it."
+            )
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedQTable":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
@@ -0,0 +1,24 @@
+from gridworld.agents.generic_agent import Agent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, Step
+
+
+def path_to_goal():
+    return [
+        Step(start=(0, 0), action=RIGHT, reward=-1, new_state=(0, 1), done=False),
+        Step(start=(0, 1), action=DOWN, reward=-1, new_state=(1, 1), done=False),
+        Step(start=(1, 1), action=DOWN, reward=100, new_state=(2, 1), done=True),
+    ]
+
+
+def episodes_until_always_reaching_goal(
+    env: GridWorldEnv | ArrayGridWorldEnv, agent: Agent
+) -> int:
+    """Episodes, in blocks of 5, until ``agent`` reaches the goal in a whole block."""
+    runner = Runner(env, agent)
+    for block in range(1, 100):
+        if all(r["reached_goal"] for r in runner.run_episodes(5)):
+            return block * 5
+    return 500
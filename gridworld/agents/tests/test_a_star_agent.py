@@ -0,0 +1,77 @@
+import pytest
+
+from gridworld.agents.a_star_agent import AStarAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import Entry, RecursiveBacktracking, Walls
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, UP
+
+
+class TestPlan:
+    def test_empty_grid(self):
+        agent = AStarAgent(GridLayout.empty(3, 3))
+        actions = agent.plan((0, 0))
+        assert len(actions) == 4
+        assert sorted(actions) == [DOWN, DOWN, RIGHT, RIGHT]
+
+    def test_goes_around_walls_and_obstacles(self):
+        grid = [
+            [Entry(start=True), Entry(walls=Walls(left=True)), Entry(goal=True)],
+            [Entry(), Entry(obstacle=True), Entry()],
+            [Entry(), Entry(), Entry()],
+        ]
+        agent = AStarAgent(GridLayout.from_entries(grid))
+        assert agent.plan((0, 0)) == [DOWN, DOWN, RIGHT, RIGHT, UP, UP]
+
+    def test_no_path(self):
+        grid = [[Entry(start=True), Entry(obstacle=True), Entry(goal=True)]]
+        with pytest.raises(ValueError):
+            AStarAgent(GridLayout.from_entries(grid)).act((0, 0))
+
+
+class TestCache:
+    def test_plans_once_per_maze(self):
+        env = ArrayGridWorldEnv(grid=RecursiveBacktracking(rows=8, cols=8).run())
+        agent = AStarAgent(env.layout)
+
+        results = Runner(env, agent).run_episodes(5)
+
+        assert agent.searches == 1
+        assert len({result["steps"] for result in results}) == 1
+        assert all(result["reached_goal"] for result in results)
+
+    def test_shares_plans_by_fingerprint(self):
+        grid = RecursiveBacktracking(rows=6, cols=6).run()
+        cache = {}
+        first = AStarAgent.for_env(GridWorldEnv(grid=grid), cache=cache)
+        first.act((0, 0))
+
+        second = AStarAgent.for_env(ArrayGridWorldEnv(grid=grid), cache=cache)
+        second.act((0, 0))
+
+        assert len(cache) == 1
+        assert second.searches == 0
+
+    def test_switching_layouts(self):
+        agent = AStarAgent(GridLayout.empty(2, 2))
+        agent.act((0, 0))
+        agent.use_layout(GridLayout.empty(3, 3))
+        agent.act((0, 0))
+        agent.use_layout(GridLayout.empty(2, 2))
+        agent.act((0, 0))
+
+        assert agent.searches == 2
+        assert agent.goal == (1, 1)
+
+
+class TestOptimal:
+    @pytest.mark.parametrize("size", [5, 10, 20])
+    def test_reaches_the_goal_in_every_maze(self, size):
+        for _ in range(5):
+            grid = RecursiveBacktracking(rows=size, cols=size).run()
+            env = GridWorldEnv(grid=grid, max_steps=size * size)
+            result = Runner(env, AStarAgent.for_env(env)).run_episode()
+            assert result["reached_goal"]
+            # every step but the last costs 1, the goal is worth 100
+            assert result["total_reward"] == 100 - (result["steps"] - 1)
@@ -0,0 +1,132 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.checkpoints import (
+    load_checkpoint,
+    memmap_npz_array,
+    save_checkpoint,
+)
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.agents.prioritized_sweeping_agent import PrioritizedSweepingAgent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.runner import Runner
+
+
+def trained_agent(backend: str) -> QLearningAgent:
+    agent = QLearningAgent(rng=random.Random(3), backend=backend, rows=5, cols=5)
+    Runner(GridWorldEnv(), agent).run_episodes(20)
+    agent.epsilon = 0.2
+    agent.alpha = 0.3
+    agent.gamma = 0.8
+    return agent
+
+
+class TestCheckpoint:
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_round_trip(self, tmp_path, backend):
+        agent = trained_agent(backend)
+        path = str(tmp_path / "agent.npz")
+
+        save_checkpoint(agent, path, rows=5, cols=5)
+        loaded = load_checkpoint(path)
+
+        assert type(loaded.q_table) is type(agent.q_table)
+        assert dict(loaded.q_table) == dict(agent.q_table)
+        assert (loaded.epsilon, loaded.alpha, loaded.gamma) == (0.2, 0.3, 0.8)
+        assert loaded.rng.getstate() == agent.rng.getstate()
+
+    def test_path_without_a_suffix(self, tmp_path):
+        agent = trained_agent("dense")
+        path = str(tmp_path / "agent")
+
+        save_checkpoint(agent, path)
+
+        assert (tmp_path / "agent").exists()
+        assert dict(load_checkpoint(path).q_table) == dict(agent.q_table)
+        assert dict(load_checkpoint(path, mmap=True).q_table) == dict(agent.q_table)
+
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_training_continues_where_it_left_off(self, tmp_path, backend):
+        agent = trained_agent(backend)
+        path = str(tmp_path / "agent.npz")
+        save_checkpoint(agent, path, rows=5, cols=5)
+        loaded = load_checkpoint(path)
+
+        results = Runner(GridWorldEnv(), agent).run_episodes(10)
+        loaded_results = Runner(GridWorldEnv(), loaded).run_episodes(10)
+
+        assert [r["trajectory"] for r in loaded_results] == [
+            r["trajectory"] for r in results
+        ]
+        assert dict(loaded.q_table) == dict(agent.q_table)
+
+    def test_keeps_the_agent_class(self, tmp_path):
+        path = str(tmp_path / "agent.npz")
+        save_checkpoint(trained_agent("dense"), path)
+
+        loaded = load_checkpoint(path, agent_class=PrioritizedSweepingAgent)
+
+        assert isinstance(loaded, PrioritizedSweepingAgent)
+        assert loaded.alpha == 0.3
+
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_memory_mapped(self, tmp_path, backend):
+        agent = trained_agent(backend)
+        path = str(tmp_path / "agent.npz")
+        save_checkpoint(agent, path, rows=5, cols=5)
+
+        loaded = load_checkpoint(path, mmap=True)
+
+        assert isinstance(loaded.q_table, DenseQTable)
+        assert isinstance(loaded.q_table.values, np.memmap)
+        assert dict(loaded.q_table) == dict(agent.q_table)
+        # acting only reads the table
+        loaded.epsilon = 0.0
+        assert loaded.act((0, 0)) in loaded.actions
+        with pytest.raises(ValueError):
+            loaded.q_table[(0, 0)]["up"] = 1.0
+
+    def test_cannot_memory_map_a_compressed_array(self, tmp_path):
+        path = str(tmp_path / "compressed.npz")
+        np.savez_compressed(path, values=np.zeros((3, 4)))
+
+        with pytest.raises(ValueError):
+            memmap_npz_array(path, "values")
+
+    def test_memory_maps_an_array_stored_after_others(self, tmp_path):
+        path = str(tmp_path / "arrays.npz")
+        values = np.arange(12.0).reshape(3, 4)
+        np.savez(path, first=np.ones(5), values=values)
+
+        assert np.array_equal(memmap_npz_array(path, "values"), values)
+
+    def test_dict_table_needs_the_grid_size(self, tmp_path):
+        agent = QLearningAgent(rng=random.Random(0))
+        agent.q_table[(0, 0)]["up"] = 1.0
+        path = str(tmp_path / "agent.npz")
+        with pytest.raises(ValueError):
+            save_checkpoint(agent, path)
+
+        save_checkpoint(agent, path, rows=3, cols=8)
+        loaded = load_checkpoint(path, mmap=True)
+        assert isinstance(loaded.q_table, DenseQTable)
+        assert (loaded.q_table.rows, loaded.q_table.cols) == (3, 8)
+        assert loaded.q_table.row((2, 7)) == [0.0, 0.0, 0.0, 0.0]
+
+    def test_rejects_a_size_that_does_not_match(self, tmp_path):
+        with pytest.raises(ValueError):
+            save_checkpoint(
+                trained_agent("dense"), str(tmp_path / "agent.npz"), rows=6, cols=6
+            )
+
+    def test_memmap_round_trip(self, tmp_path):
+        agent = trained_agent("memmap")
+        path = str(tmp_path / "agent.npz")
+        save_checkpoint(agent, path)
+        loaded = load_checkpoint(path)
+        assert isinstance(loaded.q_table, MemmapQTable)
+        assert dict(loaded.q_table) == dict(agent.q_table)
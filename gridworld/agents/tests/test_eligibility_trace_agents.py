@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.utils import DOWN, LEFT, RIGHT, UP, Step
+from ..eligibility_trace_agents import QLambdaAgent, SarsaLambdaAgent
+from .helpers import episodes_until_always_reaching_goal, path_to_goal
+
+
+@pytest.mark.parametrize("agent_class", [QLambdaAgent, SarsaLambdaAgent])
+class TestTraces:
+    def test_act_returns_the_action_picked_while_observing(self, agent_class):
+        agent = agent_class(rng=random.Random(0))
+        agent.observe(path_to_goal()[0])
+        next_action = agent._next_action[1]
+        assert agent.act((0, 1)) == next_action
+        assert agent._next_action is None
+
+    def test_traces_decay_and_are_dropped(self, agent_class):
+        agent = agent_class(rng=random.Random(0), trace_decay=0.5, trace_cutoff=0.2)
+        agent.epsilon = 0
+        for step in path_to_goal()[:2]:
+            agent.observe(step)
+        assert agent.traces == {((0, 0), RIGHT): 0.45 * 0.45, ((0, 1), DOWN): 0.45}
+        agent.observe(
+            Step(start=(1, 1), action=UP, reward=-1, new_state=(0, 1), done=False)
+        )
+        assert ((0, 0), RIGHT) not in agent.traces
+
+    def test_goal_reward_reaches_the_whole_path(self, agent_class):
+        agent = agent_class(rng=random.Random(0), trace_decay=0.5)
+        agent.epsilon = 0
+        for step in path_to_goal():
+            agent.observe(step)
+        assert agent.q_table[(1, 1)][DOWN] == pytest.approx(10)
+        assert agent.q_table[(0, 1)][DOWN] > 0
+        assert agent.q_table[(0, 0)][RIGHT] > 0
+        # the episode is over
+        assert agent.traces == {}
+
+    def test_reset_clears_traces(self, agent_class):
+        agent = agent_class(rng=random.Random(0))
+        agent.observe(path_to_goal()[0])
+        agent.reset()
+        assert agent.traces == {}
+        assert agent._next_action is None
+
+
+class TestSarsaLambda:
+    def test_bootstraps_from_the_next_action(self, mocker):
+        agent = SarsaLambdaAgent(rng=random.Random(0))
+        agent.q_table[(0, 1)] = {UP: 5.0, DOWN: 1.0, LEFT: 0.0, RIGHT: 0.0}
+        mocker.patch.object(QLearningAgent, "act", return_value=DOWN)
+        agent.observe(path_to_goal()[0])
+        assert agent.q_table[(0, 0)][RIGHT] == pytest.approx(0.1 * (-1 + 0.9 * 1.0))
+
+
+class TestQLambda:
+    def test_bootstraps_from_the_best_action(self, mocker):
+        agent = QLambdaAgent(rng=random.Random(0))
+        agent.q_table[(0, 1)] = {UP: 5.0, DOWN: 1.0, LEFT: 0.0, RIGHT: 0.0}
+        mocker.patch.object(QLearningAgent, "act", return_value=DOWN)
+        agent.observe(path_to_goal()[0])
+        assert agent.q_table[(0, 0)][RIGHT] == pytest.approx(0.1 * (-1 + 0.9 * 5.0))
+
+    def test_drops_traces_after_exploring(self, mocker):
+        agent = QLambdaAgent(rng=random.Random(0))
+        agent.q_table[(0, 1)] = {UP: 5.0, DOWN: 1.0, LEFT: 0.0, RIGHT: 0.0}
+        mocker.patch.object(QLearningAgent, "act", return_value=DOWN)
+        agent.observe(path_to_goal()[0])
+        assert agent.traces == {}
+
+
+class TestLearning:
+    @pytest.mark.parametrize("agent_class", [QLambdaAgent, SarsaLambdaAgent])
+    def test_learns_in_fewer_episodes_than_q_learning(self, agent_class):
+        grid = RecursiveBacktracking(rows=10, cols=10, rng=random.Random(0)).run()
+
+        traces = episodes_until_always_reaching_goal(
+            ArrayGridWorldEnv(grid=grid, max_steps=100),
+            agent_class(rng=random.Random(0)),
+        )
+        q_learning = episodes_until_always_reaching_goal(
+            ArrayGridWorldEnv(grid=grid, max_steps=100),
+            QLearningAgent(rng=random.Random(0)),
+        )
+        assert traces < q_learning
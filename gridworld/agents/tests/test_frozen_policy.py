@@ -0,0 +1,90 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, LEFT, RIGHT, UP, Step
+
+
+class TestFromAgent:
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_takes_the_best_action(self, backend):
+        agent = QLearningAgent(backend=backend, rows=2, cols=2)
+        agent.q_table[(0, 0)][RIGHT] = 1.0
+        agent.q_table[(0, 1)][DOWN] = 2.0
+        agent.q_table[(1, 0)][LEFT] = -1.0
+
+        policy = FrozenPolicy.from_agent(agent, rows=2, cols=2)
+
+        assert policy.action_indices.dtype == np.int8
+        assert policy.act((0, 0)) == RIGHT
+        assert policy.act((0, 1)) == DOWN
+        # ties go to the first action
+        assert policy.act((1, 0)) == UP
+        assert policy.act((1, 1)) == UP
+
+    def test_dict_table_needs_the_grid_size(self):
+        agent = QLearningAgent()
+        agent.q_table[(0, 0)][LEFT] = 1.0
+        agent.q_table[(1, 1)][LEFT] = 1.0
+        with pytest.raises(ValueError):
+            FrozenPolicy.from_agent(agent)
+
+        policy = FrozenPolicy.from_agent(agent, rows=3, cols=4)
+
+        assert (policy.rows, policy.cols) == (3, 4)
+        assert policy.act((1, 1)) == LEFT
+        assert policy.act((0, 2)) == UP
+
+    def test_actions_in_another_order(self):
+        agent = QLearningAgent(backend="dense", rows=1, cols=1)
+        agent.q_table = DenseQTable(1, 1, [RIGHT, LEFT, DOWN, UP])
+        agent.q_table[(0, 0)][DOWN] = 1.0
+
+        assert FrozenPolicy.from_agent(agent).act((0, 0)) == DOWN
+
+    def test_follows_the_trained_agent(self):
+        env = GridWorldEnv()
+        agent = QLearningAgent(rng=random.Random(0))
+        Runner(env, agent).run_episodes(200)
+        agent.epsilon = 0.0
+
+        policy = FrozenPolicy.from_agent(agent, rows=env.rows, cols=env.cols)
+        result = Runner(env, policy).run_episode()
+
+        assert result["reached_goal"]
+        assert result["steps"] == 8
+
+
+class TestFrozen:
+    def test_cannot_be_changed(self):
+        policy = FrozenPolicy(np.zeros(4, dtype=np.int8), cols=2)
+        policy.observe(Step((0, 0), UP, -10, (0, 0), False))
+        with pytest.raises(ValueError):
+            policy.action_indices[0] = 1
+
+    def test_pickles_read_only(self):
+        policy = FrozenPolicy(np.array([3, 1, 0, 2], dtype=np.int8), cols=2)
+
+        copy = pickle.loads(pickle.dumps(policy))
+
+        assert copy.action_indices.tolist() == [3, 1, 0, 2]
+        assert copy.act((0, 0)) == RIGHT
+        assert not copy.action_indices.flags.writeable
+
+    def test_rejects_states_outside_the_grid(self):
+        policy = FrozenPolicy(np.zeros(4, dtype=np.int8), cols=2)
+        with pytest.raises(KeyError):
+            policy.act((0, 2))
+        with pytest.raises(KeyError):
+            policy.act((2, 0))
+
+    def test_rejects_a_ragged_grid(self):
+        with pytest.raises(ValueError):
+            FrozenPolicy(np.zeros(5, dtype=np.int8), cols=2)
@@ -0,0 +1,133 @@
+import gc
+import os
+import random
+
+import pytest
+
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, LEFT, RIGHT, UP
+
+
+class TestMemmapQTable:
+    def test_starts_empty(self):
+        with MemmapQTable(3, 4) as table:
+            assert len(table) == 0
+            assert table == {}
+            assert os.path.getsize(table.path) == 12 * 4 * 8 + 12
+
+    def test_looking_up_a_state_adds_it(self):
+        with MemmapQTable(3, 4) as table:
+            assert table[(1, 2)] == {UP: 0.0, DOWN: 0.0, LEFT: 0.0, RIGHT: 0.0}
+            assert list(table) == [(1, 2)]
+            assert (1, 2) in table
+            assert (0, 0) not in table
+            assert (5, 5) not in table
+            with pytest.raises(KeyError):
+                table[(3, 0)]
+
+    def test_rows_assign_and_delete(self):
+        with MemmapQTable(2, 2) as table:
+            table[(0, 1)][LEFT] = 2.5
+            assert table[(0, 1)].values() == [0.0, 0.0, 2.5, 0.0]
+            table[(1, 0)] = {UP: 1.0, RIGHT: -1.0}
+            assert table == {
+                (0, 1): {UP: 0.0, DOWN: 0.0, LEFT: 2.5, RIGHT: 0.0},
+                (1, 0): {UP: 1.0, DOWN: 0.0, LEFT: 0.0, RIGHT: -1.0},
+            }
+            del table[(0, 1)]
+            assert list(table) == [(1, 0)]
+            with pytest.raises(KeyError):
+                del table[(0, 1)]
+
+    def test_evicted_pages_are_written_back(self):
+        with MemmapQTable(10, 10, page_size=10, cache_pages=2) as table:
+            for row in range(10):
+                table[(row, row)][UP] = float(row)
+            assert table.stats.page_faults == 10
+            assert table.stats.evictions == 8
+            assert table.stats.write_backs == 8
+            assert table.cached_bytes == 2 * 10 * (4 * 8 + 1)
+            # a row view keeps working after its page has been evicted
+            first = table[(0, 0)]
+            table[(9, 0)]
+            table[(8, 0)]
+            first[DOWN] = -1.0
+            assert [table[(row, row)][UP] for row in range(10)] == list(range(10))
+            assert table[(0, 0)][DOWN] == -1.0
+            assert len(table) == 12
+
+    def test_stats(self):
+        with MemmapQTable(4, 4, page_size=4, cache_pages=2) as table:
+            table[(0, 0)]
+            table[(0, 1)]
+            table[(1, 0)]
+            table[(0, 2)]
+            table[(2, 0)]
+            assert table.stats.page_faults == 3
+            assert table.stats.hits == 2
+            assert table.stats.evictions == 1
+            assert table.stats.hit_rate == pytest.approx(0.4)
+
+    def test_reopens_a_file(self, tmp_path):
+        path = str(tmp_path / "q_table.bin")
+        with MemmapQTable(6, 6, path=path, page_size=4, cache_pages=1) as table:
+            table[(5, 5)] = {RIGHT: 3.0}
+            table[(0, 0)][DOWN] = 1.5
+        with MemmapQTable(6, 6, path=path) as table:
+            assert table == {
+                (0, 0): {UP: 0.0, DOWN: 1.5, LEFT: 0.0, RIGHT: 0.0},
+                (5, 5): {UP: 0.0, DOWN: 0.0, LEFT: 0.0, RIGHT: 3.0},
+            }
+        assert os.path.exists(path)
+        with pytest.raises(ValueError):
+            MemmapQTable(7, 7, path=path)
+
+    def test_collected_table_writes_its_cache(self, tmp_path):
+        path = str(tmp_path / "q_table.bin")
+        table = MemmapQTable(6, 6, path=path)
+        table[(2, 3)][LEFT] = 4.0
+        del table
+        gc.collect()
+        with MemmapQTable(6, 6, path=path) as table:
+            assert table == {(2, 3): {UP: 0.0, DOWN: 0.0, LEFT: 4.0, RIGHT: 0.0}}
+
+    def test_temporary_file_is_removed(self):
+        table = MemmapQTable(3, 3)
+        path = table.path
+        assert os.path.exists(path)
+        table.close()
+        assert not os.path.exists(path)
+
+        table = MemmapQTable(3, 3)
+        path = table.path
+        del table
+        gc.collect()
+        assert not os.path.exists(path)
+
+    def test_learns_like_dict_backend(self):
+        grid = RecursiveBacktracking(rows=6, cols=6, rng=random.Random(0)).run()
+        runner = Runner(
+            ArrayGridWorldEnv(grid=grid), QLearningAgent(rng=random.Random(3))
+        )
+        memmap_agent = QLearningAgent(
+            rng=random.Random(3), backend="memmap", rows=6, cols=6
+        )
+        assert isinstance(memmap_agent.q_table, MemmapQTable)
+        memmap_agent.q_table.close()
+        # a cache too small for the grid, so pages are evicted and read back
+        memmap_agent.q_table = MemmapQTable(6, 6, page_size=6, cache_pages=2)
+        memmap_runner = Runner(ArrayGridWorldEnv(grid=grid), memmap_agent)
+
+        results = runner.run_episodes(20)
+        memmap_results = memmap_runner.run_episodes(20)
+
+        assert [r["trajectory"] for r in memmap_results] == [
+            r["trajectory"] for r in results
+        ]
+        assert memmap_agent.q_table == runner.agent.q_table
+        assert memmap_agent.q_table.stats.evictions > 0
+        memmap_agent.q_table.close()
@@ -0,0 +1,85 @@
+import random
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.utils import DOWN, RIGHT, UP, Step
+from ..prioritized_sweeping_agent import PrioritizedSweepingAgent
+from .helpers import episodes_until_always_reaching_goal, path_to_goal
+
+
+class TestObserve:
+    def test_learns_the_model(self):
+        agent = PrioritizedSweepingAgent()
+        agent.observe(path_to_goal()[0])
+        assert agent.model == {((0, 0), RIGHT): (-1, (0, 1), False)}
+        assert agent.predecessors[(0, 1)] == {((0, 0), RIGHT)}
+
+    def test_goal_reward_spreads_back_along_the_path(self):
+        agent = PrioritizedSweepingAgent()
+        for step in path_to_goal():
+            agent.observe(step)
+        assert agent.q_table[(1, 1)][DOWN] == 100
+        assert agent.q_table[(0, 1)][DOWN] == -1 + 0.9 * 100
+        assert agent.q_table[(0, 0)][RIGHT] == -1 + 0.9 * (-1 + 0.9 * 100)
+
+    def test_does_not_plan_changes_below_theta(self):
+        agent = PrioritizedSweepingAgent(theta=5)
+        agent.observe(
+            Step(start=(0, 0), action=UP, reward=-1, new_state=(0, 0), done=False)
+        )
+        # the real step is always learned from, a change of 1 is not worth planning
+        assert agent.backups == 1
+        assert agent.q_table[(0, 0)][UP] == -1
+        assert agent.plan() is None and agent.backups == 1
+
+    def test_caps_planning_steps_per_real_step(self):
+        agent = PrioritizedSweepingAgent(planning_steps=1)
+        for step in path_to_goal():
+            agent.observe(step)
+        # the three real steps, and one planned backup after reaching the goal
+        assert agent.backups == 4
+        assert agent.q_table[(0, 1)][DOWN] == -1 + 0.9 * 100
+        # the start state has not heard about the goal yet
+        assert agent.q_table[(0, 0)][RIGHT] == -1
+
+    def test_learns_from_real_steps_without_planning(self):
+        agent = PrioritizedSweepingAgent(planning_steps=0)
+        for step in path_to_goal():
+            agent.observe(step)
+        assert agent.backups == 3
+        assert agent.q_table[(1, 1)][DOWN] == 100
+
+
+class TestTimeouts:
+    def timed_out(self):
+        return Step(start=(0, 0), action=RIGHT, reward=-1, new_state=(0, 1), done=True)
+
+    def test_running_out_of_steps_is_not_terminal_with_a_goal(self):
+        agent = PrioritizedSweepingAgent(goal=(2, 1))
+        agent.q_table[(0, 1)][DOWN] = 50.0
+        agent.observe(self.timed_out())
+        assert agent.q_table[(0, 0)][RIGHT] == -1 + 0.9 * 50
+
+    def test_a_state_acted_from_is_not_terminal(self):
+        agent = PrioritizedSweepingAgent()
+        agent.observe(self.timed_out())
+        assert agent.q_table[(0, 0)][RIGHT] == -1
+        # the next episode carries on from (0, 1), so it was never the goal
+        for step in path_to_goal()[1:]:
+            agent.observe(step)
+        assert agent.q_table[(0, 0)][RIGHT] == -1 + 0.9 * (-1 + 0.9 * 100)
+
+
+class TestLearning:
+    def test_reaches_the_goal_in_fewer_episodes_than_q_learning(self):
+        grid = RecursiveBacktracking(rows=8, cols=8, rng=random.Random(0)).run()
+
+        planning = episodes_until_always_reaching_goal(
+            GridWorldEnv(grid=grid, max_steps=100),
+            PrioritizedSweepingAgent(rng=random.Random(0)),
+        )
+        q_learning = episodes_until_always_reaching_goal(
+            GridWorldEnv(grid=grid, max_steps=100), QLearningAgent(rng=random.Random(0))
+        )
+        assert planning * 4 <= q_learning
@@ -0,0 +1,195 @@
+import random
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable, grid_size
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, LEFT, RIGHT, UP, Step
+
+
+class TestDenseQTable:
+    def test_starts_empty(self):
+        table = DenseQTable(3, 4)
+        assert table.values.shape == (12, 4)
+        assert len(table) == 0
+        assert table == {}
+
+    def test_wraps_existing_arrays(self):
+        values = np.ones((6, 4))
+        seen = np.ones(6, dtype=np.bool_)
+        table = DenseQTable(2, 3, values=values, seen=seen)
+        assert table.values is values
+        assert len(table) == 6
+        with pytest.raises(ValueError):
+            DenseQTable(3, 3, values=values)
+
+    def test_from_mapping(self):
+        table = DenseQTable.from_mapping(
+            {(1, 2): {UP: 1.0, DOWN: 0.0, LEFT: 2.0, RIGHT: 0.0}}
+        )
+        assert (table.rows, table.cols) == (2, 3)
+        assert table == {(1, 2): {UP: 1.0, DOWN: 0.0, LEFT: 2.0, RIGHT: 0.0}}
+        assert DenseQTable.from_mapping({}, rows=4, cols=4).values.shape == (16, 4)
+
+    def test_looking_up_a_state_adds_it(self):
+        table = DenseQTable(3, 4)
+        assert table[(1, 2)] == {UP: 0.0, DOWN: 0.0, LEFT: 0.0, RIGHT: 0.0}
+        assert list(table) == [(1, 2)]
+        assert (1, 2) in table
+        assert (0, 0) not in table
+
+    def test_rows_write_through_to_values(self):
+        table = DenseQTable(3, 4)
+        table[(1, 2)][LEFT] = 2.5
+        assert table.values[1 * 4 + 2, 2] == 2.5
+        assert table.row((1, 2)) == [0.0, 0.0, 2.5, 0.0]
+
+    def test_assigning_a_row(self):
+        table = DenseQTable(2, 2)
+        table[(0, 1)] = {UP: 1.0, RIGHT: -1.0}
+        assert table == {(0, 1): {UP: 1.0, DOWN: 0.0, LEFT: 0.0, RIGHT: -1.0}}
+
+    def test_deleting_a_state(self):
+        table = DenseQTable(2, 2)
+        table[(0, 1)][UP] = 1.0
+        del table[(0, 1)]
+        assert table == {}
+        assert table.values.sum() == 0
+        with pytest.raises(KeyError):
+            del table[(0, 1)]
+
+    def test_out_of_bounds(self):
+        table = DenseQTable(2, 2)
+        with pytest.raises(KeyError):
+            table[(2, 0)]
+        assert (2, 0) not in table
+        assert "up" not in table
+
+    def test_row_out_of_bounds(self):
+        table = DenseQTable(3, 5)
+        table[(1, 2)][UP] = 1.0
+        for state in [(0, 7), (5, 0), (-1, 0)]:
+            with pytest.raises(KeyError):
+                table.row(state)
+
+    def test_of(self):
+        dense = DenseQTable(2, 2)
+        assert DenseQTable.of(dense) is dense
+        reordered = DenseQTable(2, 2, [RIGHT, LEFT, DOWN, UP])
+        reordered[(0, 1)][RIGHT] = 1.0
+        values = DenseQTable.of(reordered, rows=2, cols=2).values
+        assert values[1].tolist() == [0.0, 0.0, 0.0, 1.0]
+        q_table = defaultdict(lambda: {UP: 0.0, DOWN: 0.0, LEFT: 0.0, RIGHT: 0.0})
+        q_table[(1, 0)][DOWN] = 2.0
+        copy = DenseQTable.of(q_table, rows=3, cols=2)
+        assert copy[(1, 0)][DOWN] == 2.0
+        assert (copy.rows, copy.cols) == (3, 2)
+        assert list(q_table) == [(1, 0)]
+
+    def test_grid_size(self):
+        assert grid_size(DenseQTable(2, 3)) == (2, 3)
+        assert grid_size({}, rows=4, cols=5) == (4, 5)
+        with pytest.raises(ValueError):
+            grid_size(DenseQTable(2, 3), rows=3, cols=3)
+        with pytest.raises(ValueError):
+            grid_size({}, rows=4)
+
+    def test_greedy_actions(self):
+        table = DenseQTable(1, 3)
+        table.values[:] = [[0, 1, 0, 0], [2, 0, 0, 0], [0, 0, 0, 3]]
+        assert table.greedy_actions(np.array([0, 1, 2, 1])).tolist() == [1, 0, 3, 0]
+
+    def test_greedy_actions_breaks_ties_at_random(self):
+        table = DenseQTable(1, 1)
+        table.values[0] = [1.0, 0.0, 1.0, 1.0]
+        actions = table.greedy_actions(
+            np.zeros(1_000, dtype=np.int64), rng=np.random.default_rng(0)
+        )
+        assert set(actions.tolist()) == {0, 2, 3}
+
+
+class TestDenseBackend:
+    def test_selected_at_construction(self):
+        assert isinstance(
+            QLearningAgent(backend="dense", rows=3, cols=3).q_table, DenseQTable
+        )
+        with pytest.raises(ValueError):
+            QLearningAgent(backend="list")
+
+    def test_dense_backend_needs_the_grid_size(self):
+        with pytest.raises(ValueError):
+            QLearningAgent(backend="dense")
+        with pytest.raises(ValueError):
+            QLearningAgent(backend="memmap", rows=5)
+
+    def test_rejects_states_outside_the_grid(self):
+        agent = QLearningAgent(rng=random.Random(0), backend="dense", rows=3, cols=5)
+        agent.epsilon = 0
+        with pytest.raises(KeyError):
+            agent.act((0, 5))
+        with pytest.raises(KeyError):
+            agent.observe(
+                Step(
+                    start=(0, 4), action=RIGHT, reward=-1, new_state=(0, 5), done=False
+                )
+            )
+        assert not agent.q_table.values.any()
+
+    def test_observe_matches_dict_backend(self):
+        agent = QLearningAgent()
+        dense_agent = QLearningAgent(backend="dense", rows=5, cols=5)
+        for q_table in (agent.q_table, dense_agent.q_table):
+            q_table[(1, 0)][LEFT] = 10.0
+        step = Step(start=(0, 0), action=DOWN, reward=-1, new_state=(1, 0), done=False)
+
+        agent.observe(step)
+        dense_agent.observe(step)
+
+        assert dense_agent.q_table == {
+            (0, 0): {UP: 0.0, DOWN: 0.8, LEFT: 0.0, RIGHT: 0.0},
+            (1, 0): {UP: 0.0, DOWN: 0.0, LEFT: 10.0, RIGHT: 0.0},
+        }
+        assert dense_agent.q_table == agent.q_table
+
+    def test_learns_like_dict_backend(self):
+        grid = RecursiveBacktracking(rows=6, cols=6, rng=random.Random(0)).run()
+        runner = Runner(
+            ArrayGridWorldEnv(grid=grid), QLearningAgent(rng=random.Random(3))
+        )
+        dense_runner = Runner(
+            ArrayGridWorldEnv(grid=grid),
+            QLearningAgent(rng=random.Random(3), backend="dense", rows=6, cols=6),
+        )
+
+        results = runner.run_episodes(20)
+        dense_results = dense_runner.run_episodes(20)
+
+        assert [r["trajectory"] for r in dense_results] == [
+            r["trajectory"] for r in results
+        ]
+        assert dense_runner.agent.q_table == runner.agent.q_table
+
+    def test_sweep_matches_observing_online(self):
+        agent = QLearningAgent(rng=random.Random(3), backend="dense", rows=5, cols=5)
+        env = ArrayGridWorldEnv(max_steps=50)
+        buffer = Runner(env, agent).run_episode_fast()
+        table = DenseQTable(5, 5)
+
+        length = buffer.length
+        table.q_learning_sweep(
+            buffer.states[:length],
+            buffer.actions[:length].astype(np.int64),
+            buffer.rewards[:length],
+            buffer.next_states[:length],
+            buffer.dones[:length],
+            alpha=agent.alpha,
+            gamma=agent.gamma,
+        )
+
+        assert np.array_equal(table.values, agent.q_table.values)
+        assert table == agent.q_table
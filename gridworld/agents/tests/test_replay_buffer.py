@@ -0,0 +1,128 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.agents.replay_buffer import ReplayBuffer
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, Step
+
+
+class TestReplayBuffer:
+    def test_add(self):
+        buffer = ReplayBuffer(4)
+        buffer.add(1, 2, -1.0, 3, False)
+        assert len(buffer) == 1
+        assert buffer.states[0] == 1
+        assert buffer.actions[0] == 2
+        assert buffer.rewards[0] == -1.0
+        assert buffer.next_states[0] == 3
+        assert not buffer.dones[0]
+
+    def test_overwrites_the_oldest_when_full(self):
+        buffer = ReplayBuffer(3)
+        for state in range(5):
+            buffer.add(state, 0, 0.0, state + 1, False)
+        assert len(buffer) == 3
+        assert buffer.states.tolist() == [3, 4, 2]
+
+    def test_samples_only_stored_transitions(self):
+        buffer = ReplayBuffer(10, rng=np.random.default_rng(0))
+        buffer.add(7, 1, 100.0, 8, True)
+        buffer.add(5, 3, -1.0, 6, False)
+        batch = buffer.sample(50)
+        assert batch.states.shape == (50,)
+        assert set(batch.states.tolist()) == {5, 7}
+        assert np.array_equal(batch.next_states, batch.states + 1)
+        assert np.array_equal(batch.dones, batch.states == 7)
+
+    def test_cannot_sample_empty(self):
+        with pytest.raises(ValueError):
+            ReplayBuffer(3).sample(1)
+
+    def test_capacity_must_be_positive(self):
+        with pytest.raises(ValueError):
+            ReplayBuffer(0)
+
+
+class TestQLearningUpdate:
+    def test_matches_a_single_observe(self):
+        agent = QLearningAgent(backend="dense", rows=5, cols=5)
+        agent.q_table[(1, 0)][DOWN] = 10.0
+        agent.observe(
+            Step(start=(0, 0), action=DOWN, reward=-1, new_state=(1, 0), done=False)
+        )
+
+        table = DenseQTable(5, 5)
+        table.values[5, 1] = 10.0
+        table.q_learning_update(
+            np.array([0]),
+            np.array([1]),
+            np.array([-1.0]),
+            np.array([5]),
+            np.array([False]),
+            alpha=0.1,
+            gamma=0.9,
+        )
+        assert np.array_equal(table.values, agent.q_table.values)
+
+    def test_duplicates_apply_their_mean(self):
+        table = DenseQTable(1, 2)
+        table.q_learning_update(
+            np.array([0, 0, 1]),
+            np.array([3, 3, 0]),
+            np.array([-1.0, -3.0, 100.0]),
+            np.array([0, 0, 1]),
+            np.array([False, False, True]),
+            alpha=0.5,
+            gamma=0.9,
+        )
+        assert table.values[0, 3] == pytest.approx(-1.0)
+        assert table.values[1, 0] == pytest.approx(50.0)
+
+
+class TestReplayAgent:
+    def test_needs_the_dense_backend(self):
+        with pytest.raises(ValueError):
+            QLearningAgent(replay=ReplayBuffer(10))
+
+    def test_stores_observed_steps(self):
+        agent = QLearningAgent(
+            backend="dense",
+            rows=5,
+            cols=5,
+            replay=ReplayBuffer(10, rng=np.random.default_rng(0)),
+        )
+        agent.observe(
+            Step(start=(0, 0), action=RIGHT, reward=-1, new_state=(0, 1), done=False)
+        )
+        assert len(agent.replay) == 1
+        assert agent.replay.next_states[0] == 1
+
+    def test_needs_fewer_env_steps_to_converge(self):
+        grid = RecursiveBacktracking(rows=10, cols=10, rng=random.Random(0)).run()
+
+        def steps_to_converge(**kwargs):
+            agent = QLearningAgent(
+                rng=random.Random(0), backend="dense", rows=10, cols=10, **kwargs
+            )
+            stats = Runner(
+                ArrayGridWorldEnv(grid=grid, max_steps=300), agent
+            ).run_episodes_fast(150)
+            # until the first run of 5 episodes that all reach the goal quickly
+            fast = stats.reached_goal & (stats.steps <= 60)
+            for i in range(len(fast) - 5):
+                if fast[i : i + 5].all():
+                    return int(stats.steps[:i].sum())
+            return int(stats.steps.sum())
+
+        without_replay = steps_to_converge()
+        with_replay = steps_to_converge(
+            replay=ReplayBuffer(10_000, rng=np.random.default_rng(0)),
+            replay_updates=4,
+        )
+        assert with_replay < without_replay / 2
@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+
+from gridworld.agents.tile_coding_agent import TileCodingAgent
+from gridworld.components.procedural_grid_environment import ProceduralGridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, SIMPLE_ACTIONS, Step
+
+
+class TestFeatures:
+    def test_one_feature_per_tiling_and_the_goal_direction(self):
+        agent = TileCodingAgent(goal=(9, 9), tile_sizes=(1, 4), tiles_per_tiling=64)
+
+        features = agent.features((3, 5))
+
+        assert len(features) == 3
+        # every tiling has its own block of slots, the goal direction comes last
+        assert 0 <= features[0] < 64
+        assert 64 <= features[1] < 128
+        assert features[2] >= 128
+
+    def test_neighbours_share_coarse_tiles(self):
+        agent = TileCodingAgent(goal=(9, 9), tile_sizes=(1, 4), tiles_per_tiling=64)
+
+        first = agent.features((0, 0))
+        second = agent.features((0, 1))
+
+        assert first[0] != second[0]
+        assert first[1] == second[1]
+        assert first[2] == second[2]
+
+    def test_goal_direction(self):
+        agent = TileCodingAgent(goal=(5, 5))
+
+        below_right = agent.features((0, 0))[-1]
+        above_left = agent.features((9, 9))[-1]
+        level_right = agent.features((5, 0))[-1]
+
+        assert len({below_right, above_left, level_right}) == 3
+
+
+class TestWeights:
+    def test_shape_does_not_depend_on_the_grid(self):
+        small = TileCodingAgent(goal=(9, 9), tiles_per_tiling=256)
+        large = TileCodingAgent(goal=(9_999, 9_999), tiles_per_tiling=256)
+
+        for agent in (small, large):
+            agent.features((9, 9))
+            agent.observe(Step((0, 0), RIGHT, -1, (0, 1), False))
+
+        assert small.weights.shape == large.weights.shape == (5, 256, 4)
+
+    def test_update_moves_towards_the_target(self):
+        agent = TileCodingAgent(goal=(4, 4))
+        agent.alpha = 0.5
+
+        agent.observe(Step((3, 4), DOWN, 100, (4, 4), True))
+
+        # alpha of the way to a target of 100, shared out between the features
+        q_value = agent.q_values((3, 4))[SIMPLE_ACTIONS.index(DOWN)]
+        assert np.isclose(q_value, 50.0)
+        assert np.count_nonzero(agent.weights) == len(agent.features((3, 4)))
+
+
+class TestLearning:
+    def test_learns_to_cross_an_open_grid(self):
+        env = ProceduralGridWorldEnv(
+            rows=30, cols=30, max_steps=2_000, obstacle_density=0, wall_density=0
+        )
+        agent = TileCodingAgent(goal=env.goal, rng=random.Random(0))
+
+        stats = Runner(env, agent).run_episodes_fast(20)
+
+        assert stats.reached_goal[-5:].all()
+        # the shortest path is 58 steps
+        assert stats.steps[-5:].mean() < 100
@@ -0,0 +1,135 @@
+"""
+Linear Q-learning over tile-coded features, for grids too large for a Q-table.
+
+A Q-table stores four q values per visited cell and learns nothing about a cell until
+the agent has been there. This agent describes each state with a handful of binary
+features instead, and a q value is the sum of the weights of the active features:
+
+- One tiling of the position per entry of ``tile_sizes``. A tiling covers the grid with
+  ``size`` x ``size`` tiles, so the coarse tilings carry what is learned in one cell over
+  to its neighbours, and the size 1 tiling lets single cells differ from them.
+- The direction of the goal (above, level or below, and left, level or right), which
+  carries over to every cell: on open grids "move towards the goal" is most of the
+  policy.
+
+Tiles are hashed into ``tiles_per_tiling`` slots, so ``weights`` has a fixed shape of
+``(len(tile_sizes) + 1, tiles_per_tiling, n_actions)`` however large the grid is. Once a
+tiling has more tiles than slots, two far apart tiles can share a slot, which only adds a
+little noise.
+
+The features cannot see walls or obstacles, so the agent only learns its way around them
+cell by cell, through the size 1 tiling. It does best on large, mostly open grids.
+
+Every update is a vectorized NumPy operation on the active features:
+``weights[features, action] += alpha / n_features * td_error``.
+
+Example usage:
+    env = ProceduralGridWorldEnv(
+        rows=500, cols=500, max_steps=20_000, obstacle_density=0, wall_density=0
+    )
+    agent = TileCodingAgent(goal=env.goal)
+    Runner(env, agent).run_episodes_fast(50)
+"""
+
+from collections.abc import Sequence
+from random import Random
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.utils import SIMPLE_ACTIONS, Step
+
+# large primes to spread tile coordinates over the hashed slots
+ROW_PRIME = 1_000_003
+COL_PRIME = 7_919
+
+
+class TileCodingAgent(Agent):
+    def __init__(
+        self,
+        *,
+        goal: tuple[int, int] = (4, 4),
+        rng: Random | None = None,
+        tile_sizes: Sequence[int] = (1, 2, 4, 8),
+        tiles_per_tiling: int = 16_384,
+        **kwargs: Any,
+    ) -> None:
+        self.actions = SIMPLE_ACTIONS
+        self.tile_sizes = list(tile_sizes)
+        self.tiles_per_tiling = tiles_per_tiling
+        self.weights: NDArray[np.float64] = np.zeros(
+            (len(self.tile_sizes) + 1, tiles_per_tiling, len(self.actions)),
+            dtype=np.float64,
+        )
+        # exploration rate
+        self.epsilon = 0.1
+        # learning rate, shared between the active features
+        self.alpha = 0.1
+        # discount factor
+        self.gamma = 0.9
+        self.rng = rng or Random()
+        super().__init__(goal=goal, **kwargs)
+
+    def reset(self) -> None:
+        # the features of the latest state, the next step usually starts from it
+        self._cached: tuple[tuple[int, int], NDArray[np.int64]] | None = None
+
+    def features(self, state: tuple[int, int]) -> NDArray[np.int64]:
+        """The active tile of every tiling and the goal direction, as flat indices."""
+        if self._cached is not None and self._cached[0] == state:
+            return self._cached[1]
+        row, col = state
+        tiles_per_tiling = self.tiles_per_tiling
+        # the start of each tiling's slots in the flattened weights, then the hashed tile
+        active = [
+            i * tiles_per_tiling
+            + ((row // size) * ROW_PRIME + (col // size) * COL_PRIME) % tiles_per_tiling
+            for i, size in enumerate(self.tile_sizes)
+        ]
+        goal_row, goal_col = self.goal
+        direction = ((goal_row > row) - (goal_row < row) + 1) * 3 + (
+            (goal_col > col) - (goal_col < col) + 1
+        )
+        active.append(len(self.tile_sizes) * tiles_per_tiling + direction)
+        features = np.array(active, dtype=np.int64)
+        self._cached = (state, features)
+        return features
+
+    def q_values(self, state: tuple[int, int]) -> NDArray[np.float64]:
+        weights = self.weights.reshape(-1, len(self.actions))
+        return weights[self.features(state)].sum(axis=0)
+
+    def act(self, state: tuple[int, int]) -> str:
+        if self.rng.random() < self.epsilon:
+            return self.rng.choice(self.actions)
+        q_values: list[float] = self.q_values(state).tolist()
+        max_q_value = max(q_values)
+        return self.rng.choice(
+            [
+                action
+                for action, q_value in zip(self.actions, q_values)
+                if q_value == max_q_value
+            ]
+        )
+
+    def observe(self, step: Step) -> None:
+        self.observe_transition(*step)
+
+    def observe_transition(
+        self,
+        state: tuple[int, int],
+        action: str,
+        reward: float,
+        next_state: tuple[int, int],
+        done: bool,
+    ) -> None:
+        weights = self.weights.reshape(-1, len(self.actions))
+        features = self.features(state)
+        action_index = SIMPLE_ACTIONS.index(action)
+        current_q = weights[features, action_index].sum()
+        best_future_q = 0.0 if done else self.q_values(next_state).max()
+        td_error = reward + self.gamma * best_future_q - current_q
+        # each tiling has its own slots, so ``features`` never repeats an index
+        weights[features, action_index] += self.alpha / len(features) * td_error
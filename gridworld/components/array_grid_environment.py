@@ -0,0 +1,438 @@
+"""
+ArrayGridWorldEnv: an array-backed alternative core for GridWorldEnv.
+
+GridWorldEnv keeps the world as a ``list[list[Cell]]`` and finds the agent and the goal
+by scanning every cell, so ``agent_pos``, ``reached_goal`` and ``done`` (and therefore
+every ``step()``) cost O(rows * cols). That is fine on a 5x5 grid but hurts on 50x50+
+mazes.
+
+This environment keeps the same step()/reset()/StepResult contract, but:
+- Obstacles are stored in a ``(rows, cols)`` bool array.
+- Walls are stored in a ``(rows, cols, 4)`` bool array, one channel per action in
+  ``SIMPLE_ACTIONS`` order (up, down, left, right).
+- Visit counts are stored in a flat int array.
+- The agent and the goal are tracked as flat integer indices (``row * cols + col``).
+
+The maze never changes during an episode, so on construction the environment also
+compiles a ``TransitionTable``: for every ``(state, action)`` pair, the next state, the
+outcome and the reward. A step is then a single table lookup, and planners and analytics
+can read the same table through ``env.transition_table``.
+
+Every step is O(1), regardless of the size of the grid.
+
+Example usage:
+    maze = RecursiveBacktracking(rows=50, cols=50)
+    env = ArrayGridWorldEnv(grid=maze.run())
+    env.reset()
+    new_state, reward, done = env.step(RIGHT)
+"""
+
+import hashlib
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+from rich.console import Console
+from rich.text import Text
+
+from gridworld.components.grid_environment import (
+    ACTIONS,
+    STEP_RESULT_REWARD,
+    Cell,
+    GridWorldEnv,
+    StepResult,
+    VisitCounter,
+)
+from gridworld.components.maze_builders import Entry, Walls
+from gridworld.utils import (
+    DOWN,
+    GOAL,
+    INTERIOR_WALL,
+    LEFT,
+    MOVEMENT,
+    OBSTACLE,
+    OFF_BOARD,
+    REVERSED_ACTIONS,
+    SIMPLE_ACTIONS,
+    UP,
+)
+
+console = Console()
+
+ACTION_INDEX = {action: index for index, action in enumerate(SIMPLE_ACTIONS)}
+REVERSED_ACTION_INDEX = [ACTION_INDEX[REVERSED_ACTIONS[a]] for a in SIMPLE_ACTIONS]
+ROW_MOVEMENT = [ACTIONS[action].row_movement for action in SIMPLE_ACTIONS]
+COL_MOVEMENT = [ACTIONS[action].col_movement for action in SIMPLE_ACTIONS]
+
+# outcome codes used by the transition table, ``OUTCOMES[code]`` is the outcome name
+OUTCOMES = [MOVEMENT, GOAL, OBSTACLE, OFF_BOARD, INTERIOR_WALL]
+OUTCOME_INDEX = {outcome: index for index, outcome in enumerate(OUTCOMES)}
+
+
+@dataclass(frozen=True, eq=False)
+class GridLayout:
+    """
+    The static part of a gridworld: everything that does not change during an episode.
+
+    walls is ``(rows, cols, 4)`` with the last axis in ``SIMPLE_ACTIONS`` order,
+    obstacles is ``(rows, cols)``.
+    """
+
+    walls: NDArray[np.bool_]
+    obstacles: NDArray[np.bool_]
+    start: tuple[int, int]
+    goal: tuple[int, int]
+
+    @property
+    def rows(self) -> int:
+        return int(self.obstacles.shape[0])
+
+    @property
+    def cols(self) -> int:
+        return int(self.obstacles.shape[1])
+
+    @classmethod
+    def empty(cls, rows: int, cols: int) -> "GridLayout":
+        return cls(
+            walls=np.zeros((rows, cols, len(SIMPLE_ACTIONS)), dtype=np.bool_),
+            obstacles=np.zeros((rows, cols), dtype=np.bool_),
+            start=(0, 0),
+            goal=(rows - 1, cols - 1),
+        )
+
+    @classmethod
+    def from_entries(cls, grid: list[list[Entry]]) -> "GridLayout":
+        rows = len(grid)
+        cols = len(grid[0])
+        walls = np.zeros((rows, cols, len(SIMPLE_ACTIONS)), dtype=np.bool_)
+        obstacles = np.zeros((rows, cols), dtype=np.bool_)
+        found_start = None
+        found_goal = None
+
+        for i, row in enumerate(grid):
+            for j, entry in enumerate(row):
+                if entry.start:
+                    if found_start is not None:
+                        raise ValueError("Multiple start positions found.")
+                    found_start = (i, j)
+                if entry.goal:
+                    if found_goal is not None:
+                        raise ValueError("Multiple goal positions found.")
+                    found_goal = (i, j)
+                obstacles[i, j] = entry.obstacle
+                walls[i, j] = (
+                    entry.walls.up,
+                    entry.walls.down,
+                    entry.walls.left,
+                    entry.walls.right,
+                )
+
+        return cls(
+            walls=walls,
+            obstacles=obstacles,
+            start=found_start or (0, 0),
+            goal=found_goal or (rows - 1, cols - 1),
+        )
+
+    @classmethod
+    def from_env(cls, env: "GridWorldEnv | ArrayGridWorldEnv") -> "GridLayout":
+        """The current layout of either environment, read from its cells if needed."""
+        if isinstance(env, ArrayGridWorldEnv):
+            return env.layout
+
+        walls = np.zeros((env.rows, env.cols, len(SIMPLE_ACTIONS)), dtype=np.bool_)
+        obstacles = np.zeros((env.rows, env.cols), dtype=np.bool_)
+        for i, row in enumerate(env.grid):
+            for j, cell in enumerate(row):
+                obstacles[i, j] = cell.obstacle
+                if cell.walls is not None:
+                    walls[i, j] = (
+                        cell.walls.up,
+                        cell.walls.down,
+                        cell.walls.left,
+                        cell.walls.right,
+                    )
+        return cls(walls=walls, obstacles=obstacles, start=env.start, goal=env.goal)
+
+    def fingerprint(self) -> str:
+        """A short id that is the same for any two identical layouts."""
+        digest = hashlib.sha1()
+        digest.update(np.array([*self.start, *self.goal], dtype=np.int64).tobytes())
+        digest.update(np.array(self.walls.shape, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(self.walls).tobytes())
+        digest.update(np.ascontiguousarray(self.obstacles).tobytes())
+        return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True, eq=False)
+class TransitionTable:
+    """
+    ``(state, action) -> (next_state, outcome, reward)`` for a whole layout.
+
+    States are flat indices (``row * cols + col``), actions are indices into
+    ``SIMPLE_ACTIONS`` and outcomes are indices into ``OUTCOMES``. Every array is
+    ``(rows * cols, len(SIMPLE_ACTIONS))`` and read-only.
+    """
+
+    next_states: NDArray[np.int64]
+    outcomes: NDArray[np.int8]
+    rewards: NDArray[np.float64]
+
+    @property
+    def reaches_goal(self) -> NDArray[np.bool_]:
+        """True where taking the action ends the episode at the goal."""
+        return self.outcomes == OUTCOME_INDEX[GOAL]
+
+
+def compile_transitions(
+    layout: GridLayout, reward_config: Mapping[str, float] = STEP_RESULT_REWARD
+) -> TransitionTable:
+    """
+    Apply the GridWorldEnv.next_cell rules to every cell and action at once.
+
+    The checks are made in the same order as next_cell: a wall on the current cell,
+    leaving the board, a wall on the neighbouring cell, an obstacle, then the goal.
+    """
+    rows, cols = layout.rows, layout.cols
+    row_index, col_index = np.indices((rows, cols))
+    goal_row, goal_col = layout.goal
+    states = row_index * cols + col_index
+
+    next_states = np.empty((rows * cols, len(SIMPLE_ACTIONS)), dtype=np.int64)
+    outcomes = np.empty((rows * cols, len(SIMPLE_ACTIONS)), dtype=np.int8)
+    for action_index in range(len(SIMPLE_ACTIONS)):
+        new_row = row_index + ROW_MOVEMENT[action_index]
+        new_col = col_index + COL_MOVEMENT[action_index]
+        on_board = (0 <= new_row) & (new_row < rows) & (0 <= new_col) & (new_col < cols)
+        # clip so off board neighbours can still be indexed, they are masked out below
+        neighbour_row = np.clip(new_row, 0, rows - 1)
+        neighbour_col = np.clip(new_col, 0, cols - 1)
+        reversed_index = REVERSED_ACTION_INDEX[action_index]
+
+        outcome = np.select(
+            [
+                layout.walls[:, :, action_index],
+                ~on_board,
+                layout.walls[neighbour_row, neighbour_col, reversed_index],
+                layout.obstacles[neighbour_row, neighbour_col],
+                (neighbour_row == goal_row) & (neighbour_col == goal_col),
+            ],
+            [
+                OUTCOME_INDEX[INTERIOR_WALL],
+                OUTCOME_INDEX[OFF_BOARD],
+                OUTCOME_INDEX[INTERIOR_WALL],
+                OUTCOME_INDEX[OBSTACLE],
+                OUTCOME_INDEX[GOAL],
+            ],
+            default=OUTCOME_INDEX[MOVEMENT],
+        )
+        moved = (outcome == OUTCOME_INDEX[MOVEMENT]) | (outcome == OUTCOME_INDEX[GOAL])
+        next_states[:, action_index] = np.where(
+            moved, neighbour_row * cols + neighbour_col, states
+        ).reshape(-1)
+        outcomes[:, action_index] = outcome.reshape(-1)
+
+    reward_by_outcome = np.array(
+        [reward_config[outcome] for outcome in OUTCOMES], dtype=np.float64
+    )
+    rewards = reward_by_outcome[outcomes]
+    for array in (next_states, outcomes, rewards):
+        array.setflags(write=False)
+    return TransitionTable(next_states=next_states, outcomes=outcomes, rewards=rewards)
+
+
+class ArrayGridWorldEnv:
+    def __init__(
+        self,
+        *,
+        max_steps: int = 100,
+        rows: int = 5,
+        cols: int = 5,
+        grid: list[list[Entry]] | None = None,
+        layout: GridLayout | None = None,
+        reward_config: Mapping[str, float] | None = None,
+        transitions: TransitionTable | None = None,
+    ) -> None:
+        """
+        ``transitions`` is a table already compiled for ``layout`` (for example one held
+        in shared memory). It is used as-is, without copying.
+        """
+        if layout is None:
+            layout = (
+                GridLayout.from_entries(grid) if grid else GridLayout.empty(rows, cols)
+            )
+
+        self.layout = layout
+        self.rows = layout.rows
+        self.cols = layout.cols
+        self.start = layout.start
+        self.goal = layout.goal
+        self.reward_config = reward_config or STEP_RESULT_REWARD
+        self.max_steps = max_steps
+
+        # the step hot path looks up python scalars by ``state * 4 + action``
+        self._next_state_at: Callable[[int], int]
+        self._reward_at: Callable[[int], float]
+        if transitions is None:
+            self._transitions = compile_transitions(layout, self.reward_config)
+            # plain python lists are the fastest to index
+            self._next_state_at = (
+                self._transitions.next_states.ravel().tolist().__getitem__
+            )
+            self._reward_at = [
+                self.reward_config[OUTCOMES[outcome]]
+                for outcome in self._transitions.outcomes.ravel().tolist()
+            ].__getitem__
+        else:
+            # read straight from the given arrays so nothing is copied
+            self._transitions = transitions
+            self._next_state_at = transitions.next_states.reshape(-1).item
+            self._reward_at = transitions.rewards.reshape(-1).item
+        self._visited = np.zeros(self.rows * self.cols, dtype=np.int64)
+        self._start_index = self.to_index(self.start)
+        self._goal_index = self.to_index(self.goal)
+        self._agent_index = self._start_index
+        self._setup()
+
+    def _setup(self) -> None:
+        self.total_reward = 0
+        self.current_step = 0
+        self._visited[:] = 0
+        self._agent_index = self._start_index
+        self._visited[self._agent_index] += 1
+
+    @property
+    def transition_table(self) -> TransitionTable:
+        return self._transitions
+
+    def to_index(self, pos: tuple[int, int]) -> int:
+        if not (0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols):
+            raise ValueError(f"Position {pos} is out of bounds.")
+        return pos[0] * self.cols + pos[1]
+
+    def to_position(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.cols)
+
+    @property
+    def visit_counts(self) -> VisitCounter:
+        return VisitCounter(counts=self._visited.reshape(self.rows, self.cols).copy())
+
+    @property
+    def reached_goal(self) -> bool:
+        return self._agent_index == self._goal_index
+
+    @property
+    def done(self) -> bool:
+        return (
+            self._agent_index == self._goal_index or self.current_step >= self.max_steps
+        )
+
+    @property
+    def agent_pos(self) -> tuple[int, int]:
+        return self.to_position(self._agent_index)
+
+    @agent_pos.setter
+    def agent_pos(self, pos: tuple[int, int]) -> None:
+        self._agent_index = self.to_index(pos)
+        self._visited[self._agent_index] += 1
+
+    @property
+    def grid(self) -> list[list[Cell]]:
+        """
+        Materialize the layout as ``Cell`` objects, for rendering helpers such as
+        ``render_heatmap(grid=...)``. This is O(rows * cols), keep it out of hot loops.
+        """
+        visited = self._visited.reshape(self.rows, self.cols)
+        return [
+            [
+                Cell(
+                    agent=(i, j) == self.agent_pos,
+                    goal=(i, j) == self.goal,
+                    _obstacle=bool(self.layout.obstacles[i, j]),
+                    visited=int(visited[i, j]),
+                    walls=Walls(*(bool(wall) for wall in self.layout.walls[i, j])),
+                )
+                for j in range(self.cols)
+            ]
+            for i in range(self.rows)
+        ]
+
+    def reset(self) -> tuple[int, int]:
+        self._setup()
+        return self.agent_pos
+
+    def render(self) -> None:
+        console.print(f"Step: {self.current_step} of {self.max_steps}")
+        console.print(f"Total Reward: {round(self.total_reward, 2)}\n")
+
+        up, down, left = ACTION_INDEX[UP], ACTION_INDEX[DOWN], ACTION_INDEX[LEFT]
+        walls = self.layout.walls
+        agent_pos = self.agent_pos
+
+        for i in range(self.rows):
+            top_line = Text()
+            for j in range(self.cols):
+                top_line.append("┌─ " if walls[i, j, up] else "   ")
+            top_line.append("┐")
+            console.print(top_line)
+
+            mid_line = Text()
+            for j in range(self.cols):
+                left_wall = "│" if walls[i, j, left] else " "
+                if (i, j) == agent_pos:
+                    mid_line.append(left_wall + "A ", style="bold blue")
+                elif (i, j) == self.goal:
+                    mid_line.append(left_wall + "G ", style="bold green")
+                elif self.layout.obstacles[i, j]:
+                    mid_line.append(left_wall + "█ ", style="dim white")
+                else:
+                    mid_line.append(left_wall + "  ", style="white")
+            mid_line.append("│")
+            console.print(mid_line)
+
+        bottom_line = Text()
+        for j in range(self.cols):
+            bottom_line.append("└─ " if walls[-1, j, down] else "   ")
+        bottom_line.append("┘")
+        console.print(bottom_line)
+
+    def get_state(self) -> tuple[int, int]:
+        return self.agent_pos
+
+    def visit(self, new_pos: tuple[int, int]) -> None:
+        self._visited[self.to_index(new_pos)] += 1
+
+    def next_cell(self, action: str) -> tuple[tuple[int, int], str]:
+        action_index = ACTION_INDEX[action]
+        new_index = int(self._transitions.next_states[self._agent_index, action_index])
+        outcome = int(self._transitions.outcomes[self._agent_index, action_index])
+        return (self.to_position(new_index), OUTCOMES[outcome])
+
+    def step(self, action: str) -> StepResult:
+        new_state, reward, done = self.fast_step(action)
+        return StepResult(new_state=new_state, reward=reward, done=done)
+
+    def fast_step(self, action: str) -> tuple[tuple[int, int], float, bool]:
+        """Like ``GridWorldEnv.fast_step``, read from the transition table."""
+        action_index = ACTION_INDEX.get(action)
+        if action_index is None:
+            raise ValueError(f"Invalid action: {action}")
+
+        if self.done:
+            raise RuntimeError("Cannot step; the goal has already been reached.")
+
+        self.current_step += 1
+        transition = self._agent_index * len(SIMPLE_ACTIONS) + action_index
+        new_index = self._next_state_at(transition)
+        current_reward = self._reward_at(transition)
+
+        self.total_reward += current_reward
+        self._agent_index = new_index
+        self._visited[new_index] += 1
+
+        return (
+            divmod(new_index, self.cols),
+            current_reward,
+            new_index == self._goal_index or self.current_step >= self.max_steps,
+        )
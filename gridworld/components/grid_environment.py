@@ -43,10 +43,12 @@ Example usage:
     env.render()
 """
 
-from collections import defaultdict
-from collections.abc import ItemsView, ValuesView
+from collections.abc import ItemsView, Mapping, ValuesView
 from dataclasses import dataclass
+from types import MappingProxyType
 from unittest.mock import ANY
+import numpy as np
+from numpy.typing import NDArray
 from rich.console import Console
 from rich.text import Text
 
@@ -103,57 +105,217 @@ class StepResult:
 
 
 class VisitCounter:
-    def __init__(self, data: dict[tuple[int, int], int] | None = None) -> None:
-        self.data: dict[tuple[int, int], int] = data or defaultdict(int)
+    """
+    Visit counts per (row, col), backed by an array.
 
-    def __getitem__(self, key: tuple[int, int]) -> int:
-        return self.data[key]
+    It keeps the dict-like API (``counter[(row, col)]``, ``items()``, ``values()``,
+    ``data``) for tests and ``render_heatmap``, while ``counts`` exposes the array and
+    ``sum``/``avg``/``max`` combine many counters with a single NumPy reduction.
 
-    def __setitem__(self, key: tuple[int, int], value: int) -> None:
-        self.data[key] = value
+    The array covers ``shape`` cells from ``origin``, the top left corner of the cells
+    counted, so a few visits far from (0, 0) in a huge world only take a small array.
+    ``items()`` and ``values()`` only report coordinates that were set, either one at a
+    time or by passing a whole ``counts`` array. The array grows when a coordinate outside
+    of it is set.
+    """
 
-    def __eq__(self, value: "dict | VisitCounter") -> bool:
-        if isinstance(value, dict):
-            value_comparison = {
-                key: value for key, value in value.items() if value != 0
-            }
-            data_comparison = {
-                key: value for key, value in self.data.items() if value != 0
-            }
-            return value_comparison == data_comparison
-        if isinstance(value, VisitCounter):
-            value_comparison = {
-                key: value for key, value in value.data.items() if value != 0
-            }
-            data_comparison = {
-                key: value for key, value in self.data.items() if value != 0
+    def __init__(
+        self,
+        data: Mapping[tuple[int, int], float] | None = None,
+        *,
+        counts: NDArray[np.number] | None = None,
+        origin: tuple[int, int] = (0, 0),
+    ) -> None:
+        self._origin = origin
+        if counts is not None:
+            self._counts = counts
+            self._present = np.ones(counts.shape, dtype=np.bool_)
+            for key, value in (data or {}).items():
+                self[key] = value
+        elif data:
+            # allocated once for the bounding box of the coordinates
+            keys = np.array(list(data.keys()), dtype=np.int64)
+            if (keys < 0).any():
+                raise ValueError("Positions must not be negative.")
+            values = np.array(list(data.values()), dtype=np.float64)
+            dtype = np.int64 if np.all(values == np.round(values)) else np.float64
+            top, left = keys.min(axis=0).tolist()
+            bottom, right = keys.max(axis=0).tolist()
+            self._origin = (top, left)
+            self._counts = np.zeros((bottom - top + 1, right - left + 1), dtype=dtype)
+            self._present = np.zeros(self._counts.shape, dtype=np.bool_)
+            self._counts[keys[:, 0] - top, keys[:, 1] - left] = values
+            self._present[keys[:, 0] - top, keys[:, 1] - left] = True
+        else:
+            self._counts = np.zeros((0, 0), dtype=np.int64)
+            self._present = np.zeros((0, 0), dtype=np.bool_)
+
+    @property
+    def counts(self) -> NDArray[np.number]:
+        """The counts of the ``shape`` cells from ``origin``."""
+        return self._counts
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        return self._origin
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self._counts.shape[0], self._counts.shape[1])
+
+    @property
+    def data(self) -> Mapping[tuple[int, int], int]:
+        """
+        A read-only snapshot of the set coordinates and their counts. Set counts with
+        ``counter[(row, col)] = count``.
+        """
+        top, left = self._origin
+        return MappingProxyType(
+            {
+                (int(i) + top, int(j) + left): self._counts[i, j].item()
+                for i, j in zip(*np.nonzero(self._present))
             }
+        )
 
-            return data_comparison == value_comparison
+    @staticmethod
+    def _bounds(
+        *visit_counts: "VisitCounter",
+    ) -> tuple[tuple[int, int], tuple[int, int]]:
+        """The origin and shape of the smallest array covering every counter."""
+        boxes = [(c._origin, c.shape) for c in visit_counts if c._counts.size]
+        if not boxes:
+            return (0, 0), (0, 0)
+        top = min(origin[0] for origin, _ in boxes)
+        left = min(origin[1] for origin, _ in boxes)
+        bottom = max(origin[0] + shape[0] for origin, shape in boxes)
+        right = max(origin[1] + shape[1] for origin, shape in boxes)
+        return (top, left), (bottom - top, right - left)
+
+    def _grow(self, origin: tuple[int, int], shape: tuple[int, int]) -> None:
+        if origin == self._origin and shape == self.shape:
+            return
+        if not self._counts.size:
+            self._counts = np.zeros(shape, dtype=self._counts.dtype)
+            self._present = np.zeros(shape, dtype=np.bool_)
+        else:
+            top = self._origin[0] - origin[0]
+            left = self._origin[1] - origin[1]
+            padding = (
+                (top, shape[0] - top - self.shape[0]),
+                (left, shape[1] - left - self.shape[1]),
+            )
+            self._counts = np.pad(self._counts, padding)
+            self._present = np.pad(self._present, padding)
+        self._origin = origin
+
+    def __getitem__(self, key: tuple[int, int]) -> int:
+        row = key[0] - self._origin[0]
+        col = key[1] - self._origin[1]
+        if 0 <= row < self.shape[0] and 0 <= col < self.shape[1]:
+            return self._counts[row, col].item()
+        return 0
+
+    def __setitem__(self, key: tuple[int, int], value: float) -> None:
+        row, col = key
+        if row < 0 or col < 0:
+            raise ValueError(f"Position {key} is out of bounds.")
+        if self._counts.size:
+            top, left = self._origin
+            bottom, right = top + self.shape[0], left + self.shape[1]
+            origin = (min(top, row), min(left, col))
+            shape = (
+                max(bottom, row + 1) - origin[0],
+                max(right, col + 1) - origin[1],
+            )
+        else:
+            origin, shape = (row, col), (1, 1)
+        self._grow(origin, shape)
+        if not float(value).is_integer():
+            self._counts = self._counts.astype(np.float64)
+        self._counts[row - origin[0], col - origin[1]] = value
+        self._present[row - origin[0], col - origin[1]] = True
+
+    def __eq__(self, value: "dict | VisitCounter") -> bool:
         if value is ANY:
             return True
+        if isinstance(value, dict):
+            value = VisitCounter(data=value)
+        if isinstance(value, VisitCounter):
+            # zero counts are ignored, so pad both to the same shape and compare
+            counts, _, _ = self._stack(self, value)
+            return bool(np.array_equal(counts[0], counts[1]))
         return False
 
     def __add__(self, other: "VisitCounter") -> "VisitCounter":
-        for coordinate in other.data.keys():
-            self[coordinate] += other[coordinate]
+        if not other._counts.size:
+            return self
+        origin, shape = self._bounds(self, other)
+        self._grow(origin, shape)
+        self._counts = self._counts.astype(
+            np.result_type(self._counts, other._counts), copy=False
+        )
+        top = other._origin[0] - origin[0]
+        left = other._origin[1] - origin[1]
+        rows, cols = other.shape
+        self._counts[top : top + rows, left : left + cols] += other._counts
+        self._present[top : top + rows, left : left + cols] |= other._present
         return self
 
     @classmethod
-    def avg(cls, *visit_counts: "VisitCounter") -> "VisitCounter":
-        coordinates = set()
-        total_counters = len(visit_counts)
-        new_counter = cls()
-        # get all the coordinates
-        for visit_count in visit_counts:
-            coordinates.update(visit_count.data.keys())
-        # create avg counter
-        for coordinate in coordinates:
-            total = sum(visit_count.data[coordinate] for visit_count in visit_counts)
-            avg = total / total_counters
-            new_counter[coordinate] = avg
+    def _stack(
+        cls,
+        *visit_counts: "VisitCounter",
+    ) -> tuple[NDArray[np.number], NDArray[np.bool_], tuple[int, int]]:
+        """
+        Place every counter in a common array and stack them, returning the stack, which
+        cells any of them set, and the origin of the common array.
+        """
+        origin, (rows, cols) = cls._bounds(*visit_counts)
+        dtype = np.result_type(*(visit_count._counts for visit_count in visit_counts))
+        counts = np.zeros((len(visit_counts), rows, cols), dtype=dtype)
+        present = np.zeros((rows, cols), dtype=np.bool_)
+        for i, c in enumerate(visit_counts):
+            if not c._counts.size:
+                continue
+            top = c._origin[0] - origin[0]
+            left = c._origin[1] - origin[1]
+            box = (slice(top, top + c.shape[0]), slice(left, left + c.shape[1]))
+            counts[(i, *box)] = c._counts
+            present[box] |= c._present
+        return counts, present, origin
+
+    @classmethod
+    def _from_reduction(
+        cls,
+        counts: NDArray[np.number],
+        present: NDArray[np.bool_],
+        origin: tuple[int, int],
+    ) -> "VisitCounter":
+        new_counter = cls(counts=counts, origin=origin)
+        new_counter._present = present
         return new_counter
 
+    @classmethod
+    def sum(cls, *visit_counts: "VisitCounter") -> "VisitCounter":
+        if not visit_counts:
+            return cls()
+        counts, present, origin = cls._stack(*visit_counts)
+        return cls._from_reduction(counts.sum(axis=0), present, origin)
+
+    @classmethod
+    def avg(cls, *visit_counts: "VisitCounter") -> "VisitCounter":
+        if not visit_counts:
+            return cls()
+        counts, present, origin = cls._stack(*visit_counts)
+        return cls._from_reduction(counts.mean(axis=0), present, origin)
+
+    @classmethod
+    def max(cls, *visit_counts: "VisitCounter") -> "VisitCounter":
+        if not visit_counts:
+            return cls()
+        counts, present, origin = cls._stack(*visit_counts)
+        return cls._from_reduction(counts.max(axis=0), present, origin)
+
     def items(self) -> "ItemsView[tuple[int, int], int]":
         return self.data.items()
 
@@ -197,6 +359,14 @@ class Cell:
 
 
 class GridWorldEnv:
+    """
+    A grid of Cell objects, stepped one move at a time.
+
+    The cells are built once. reset() only restores the cells handed out by get_cell()
+    or visited since the last reset, so change cells through get_cell(). A cell changed
+    directly through ``env.grid[row][col]`` keeps the change across resets.
+    """
+
     def __init__(
         self,
         *,
@@ -238,11 +408,15 @@ class GridWorldEnv:
         else:
             self.goal = found_goal
         self._config_grid = grid
+        self._build_grid()
         self._setup()
 
-    def _setup(self) -> None:
-        self.total_reward = 0
-        self.current_step = 0
+    def _build_grid(self) -> None:
+        """
+        Build the Cell grid once. Afterwards reset() only restores the cells that were
+        touched (through get_cell() or visit()) since the last reset, so its cost is
+        proportional to the episode rather than to the size of the grid.
+        """
         if self._config_grid:
             self.grid = []
             for row in self._config_grid:
@@ -258,18 +432,37 @@ class GridWorldEnv:
                 self.grid.append(row_cells)
         else:
             self.grid = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
-        self.get_cell(self.start).agent = True
-        self.get_cell(self.goal).goal = True
-        self.visit(new_pos=self.agent_pos)
+        self.grid[self.start[0]][self.start[1]].agent = True
+        self.grid[self.goal[0]][self.goal[1]].goal = True
+        self._dirty: set[tuple[int, int]] = set()
+
+    def _restore_cell(self, pos: tuple[int, int]) -> None:
+        cell = self.grid[pos[0]][pos[1]]
+        cell.agent = pos == self.start
+        cell.goal = pos == self.goal
+        cell.visited = 0
+        if self._config_grid:
+            entry = self._config_grid[pos[0]][pos[1]]
+            cell._obstacle = entry.obstacle
+            cell.walls = entry.walls
+        else:
+            cell._obstacle = False
+            cell.walls = None
+
+    def _setup(self) -> None:
+        self.total_reward = 0
+        self.current_step = 0
+        for pos in self._dirty:
+            self._restore_cell(pos)
+        self._dirty.clear()
+        self.visit(new_pos=self.start)
 
     @property
     def visit_counts(self) -> VisitCounter:
         return VisitCounter(
-            data={
-                (i, j): self.grid[i][j].visited
-                for i in range(self.rows)
-                for j in range(self.cols)
-            }
+            counts=np.array(
+                [[cell.visited for cell in row] for row in self.grid], dtype=np.int64
+            )
         )
 
     @property
@@ -296,6 +489,8 @@ class GridWorldEnv:
     def get_cell(self, pos: tuple[int, int]) -> Cell:
         if not (0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols):
             raise ValueError(f"Position {pos} is out of bounds.")
+        # the caller may change the cell, so reset() has to restore it
+        self._dirty.add(pos)
         return self.grid[pos[0]][pos[1]]
 
     def find_agent_position(self) -> tuple[int, int]:
@@ -362,6 +557,7 @@ class GridWorldEnv:
         return self.agent_pos
 
     def visit(self, new_pos: tuple[int, int]) -> None:
+        self._dirty.add(new_pos)
         self.grid[new_pos[0]][new_pos[1]].visited += 1
 
     def next_cell(self, action: str) -> tuple[tuple[int, int], str]:
@@ -390,6 +586,14 @@ class GridWorldEnv:
             return ((new_row, new_col), MOVEMENT)
 
     def step(self, action: str) -> StepResult:
+        new_state, reward, done = self.fast_step(action)
+        return StepResult(new_state=new_state, reward=reward, done=done)
+
+    def fast_step(self, action: str) -> tuple[tuple[int, int], float, bool]:
+        """
+        ``step`` without the ``StepResult``, returns a plain
+        ``(new_state, reward, done)`` tuple for hot training loops.
+        """
         if action not in ACTIONS:
             raise ValueError(f"Invalid action: {action}")
 
@@ -403,11 +607,7 @@ class GridWorldEnv:
         self.total_reward += current_reward
         self.agent_pos = new_cell
 
-        return StepResult(
-            new_state=self.agent_pos,
-            reward=current_reward,
-            done=self.done,
-        )
+        return (self.agent_pos, current_reward, self.done)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Egocentric observations: the k x k window of the maze around the agent.
+
+``get_state()`` only tells an agent its ``(row, col)``. WindowObserver stacks a layout
+into one ``(rows, cols, CHANNELS)`` bool array, pads it by ``radius`` cells on every side
+and builds every window at once with ``sliding_window_view``. Looking up the window
+around a cell is then an index into that view: nothing is copied and nothing is computed
+per step.
+
+The channels of each cell, in order, are its four walls (in ``SIMPLE_ACTIONS`` order),
+whether it is an obstacle, whether it is the goal and whether it is off the board. The
+padding is marked off board, so windows near the edge look like every other window.
+
+Example usage:
+    observer = WindowObserver(env.layout, radius=2)
+    window = observer.observe(env.get_state())  # (5, 5, 7), a read-only view
+    windows = observer.observe_many(vector_env.states)  # (num_envs, 5, 5, 7)
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
+from numpy.typing import NDArray
+
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.utils import SIMPLE_ACTIONS
+
+CHANNELS = [
+    *(f"wall_{action}" for action in SIMPLE_ACTIONS),
+    "obstacle",
+    "goal",
+    "off_board",
+]
+CHANNEL_INDEX = {channel: i for i, channel in enumerate(CHANNELS)}
+
+
+class WindowObserver:
+    def __init__(self, layout: GridLayout, radius: int = 1) -> None:
+        if radius < 0:
+            raise ValueError(f"radius must not be negative, got {radius}.")
+        self.layout = layout
+        self.radius = radius
+        self.size = 2 * radius + 1
+
+        rows, cols = layout.rows, layout.cols
+        padded = np.zeros(
+            (rows + 2 * radius, cols + 2 * radius, len(CHANNELS)), dtype=np.bool_
+        )
+        padded[..., CHANNEL_INDEX["off_board"]] = True
+        board = padded[radius : radius + rows, radius : radius + cols]
+        board[..., : len(SIMPLE_ACTIONS)] = layout.walls
+        board[..., CHANNEL_INDEX["obstacle"]] = layout.obstacles
+        board[layout.goal[0], layout.goal[1], CHANNEL_INDEX["goal"]] = True
+        board[..., CHANNEL_INDEX["off_board"]] = False
+        padded.setflags(write=False)
+        self.padded = padded
+
+        # (rows, cols, channels, size, size) -> (rows, cols, size, size, channels)
+        windows = sliding_window_view(padded, (self.size, self.size), axis=(0, 1))
+        self.windows: NDArray[np.bool_] = windows.transpose(0, 1, 3, 4, 2)
+        # the same windows indexed by the flat position of their top left corner in the
+        # padded array, so a batch can be gathered with one np.take
+        row_stride, col_stride, channel_stride = padded.strides
+        self._flat_windows: NDArray[np.bool_] = as_strided(
+            padded,
+            shape=(
+                (rows - 1) * padded.shape[1] + cols,
+                self.size,
+                self.size,
+                len(CHANNELS),
+            ),
+            strides=(col_stride, row_stride, col_stride, channel_stride),
+            writeable=False,
+        )
+
+    @classmethod
+    def for_env(cls, env: ArrayGridWorldEnv, radius: int = 1) -> "WindowObserver":
+        return cls(env.layout, radius)
+
+    def observe(self, pos: tuple[int, int]) -> NDArray[np.bool_]:
+        """The ``(size, size, channels)`` window centred on ``pos``, as a view."""
+        if not (0 <= pos[0] < self.layout.rows and 0 <= pos[1] < self.layout.cols):
+            raise ValueError(f"Position {pos} is out of bounds.")
+        return self.windows[pos[0], pos[1]]
+
+    def observe_many(
+        self, states: NDArray[np.int64], out: NDArray[np.bool_] | None = None
+    ) -> NDArray[np.bool_]:
+        """
+        The windows around many flat ``row * cols + col`` states at once, shaped
+        ``(len(states), size, size, channels)``. Pass ``out`` to reuse one buffer
+        between steps instead of allocating a new array each time.
+        """
+        if len(states) and not (
+            0 <= states.min() and states.max() < self.layout.rows * self.layout.cols
+        ):
+            raise ValueError("States are out of bounds.")
+        # row * cols + col -> row * (cols + 2 * radius) + col
+        padded_states = states + states // self.layout.cols * (2 * self.radius)
+        return np.take(self._flat_windows, padded_states, axis=0, out=out)
@@ -0,0 +1,300 @@
+"""
+ProceduralGridWorldEnv: huge seeded worlds that are only generated where the agent goes.
+
+GridWorldEnv and the maze generators allocate a Python object per cell, and even
+ArrayGridWorldEnv allocates its whole layout and transition table up front. Neither fits a
+10,000 x 10,000 world.
+
+This environment splits the world into square chunks (64 x 64 cells by default). The
+walls and obstacles of a chunk are drawn from a random generator seeded with
+``(seed, chunk_row, chunk_col)``, so a chunk is generated the first time the agent needs
+it and is identical every time it is generated again. Generated chunks are kept in an LRU
+cache of ``cache_size`` chunks, the least recently used chunk is dropped once the cache
+is full. Visit counts are kept in a dict of the visited cells.
+
+Memory therefore scales with the region the agent visits, not with the size of the world.
+
+Steps follow the same rules and rewards as GridWorldEnv.next_cell: a wall on either side
+of a move blocks it, leaving the board or moving into an obstacle keeps the agent where it
+is. The start and goal cells are never obstacles.
+
+Example usage:
+    env = ProceduralGridWorldEnv(rows=10_000, cols=10_000, seed=3)
+    env.reset()
+    new_state, reward, done = env.step(RIGHT)
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+from rich.console import Console
+from rich.text import Text
+
+from gridworld.components.array_grid_environment import (
+    ACTION_INDEX,
+    COL_MOVEMENT,
+    REVERSED_ACTION_INDEX,
+    ROW_MOVEMENT,
+    GridLayout,
+)
+from gridworld.components.grid_environment import (
+    STEP_RESULT_REWARD,
+    StepResult,
+    VisitCounter,
+)
+from gridworld.utils import (
+    DOWN,
+    GOAL,
+    INTERIOR_WALL,
+    LEFT,
+    MOVEMENT,
+    OBSTACLE,
+    OFF_BOARD,
+    UP,
+)
+
+console = Console()
+
+# to_layout() refuses to build anything larger, that is what this environment avoids
+MAX_LAYOUT_CELLS = 4_000_000
+
+
+@dataclass(frozen=True, eq=False)
+class Chunk:
+    walls: NDArray[np.bool_]
+    obstacles: NDArray[np.bool_]
+
+
+class ProceduralGridWorldEnv:
+    def __init__(
+        self,
+        *,
+        rows: int = 10_000,
+        cols: int = 10_000,
+        seed: int = 0,
+        max_steps: int = 100,
+        start: tuple[int, int] = (0, 0),
+        goal: tuple[int, int] | None = None,
+        obstacle_density: float = 0.1,
+        wall_density: float = 0.1,
+        chunk_size: int = 64,
+        cache_size: int = 256,
+        reward_config: Mapping[str, float] | None = None,
+    ) -> None:
+        """
+        ``obstacle_density`` and ``wall_density`` are the chances that a cell is an
+        obstacle and that each of a cell's four sides has a wall. The goal defaults to
+        the bottom right corner.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.max_steps = max_steps
+        self.obstacle_density = obstacle_density
+        self.wall_density = wall_density
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.reward_config = reward_config or STEP_RESULT_REWARD
+
+        self.start = start
+        self.goal = goal if goal is not None else (rows - 1, cols - 1)
+        for pos in (self.start, self.goal):
+            if not self.in_bounds(pos):
+                raise ValueError(f"Position {pos} is out of bounds.")
+
+        self._chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        self.chunks_generated = 0
+        self._setup()
+
+    def _setup(self) -> None:
+        self.total_reward = 0
+        self.current_step = 0
+        self.agent_pos = self.start
+        self._visits: dict[tuple[int, int], int] = {self.start: 1}
+
+    def in_bounds(self, pos: tuple[int, int]) -> bool:
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def _generate_chunk(self, chunk_row: int, chunk_col: int) -> Chunk:
+        size = self.chunk_size
+        rng = np.random.default_rng([self.seed, chunk_row, chunk_col])
+        obstacles = rng.random((size, size)) < self.obstacle_density
+        walls = rng.random((size, size, len(ACTION_INDEX))) < self.wall_density
+
+        for row, col in (self.start, self.goal):
+            if (row // size, col // size) == (chunk_row, chunk_col):
+                obstacles[row % size, col % size] = False
+        return Chunk(walls=walls, obstacles=obstacles)
+
+    def chunk(self, chunk_row: int, chunk_col: int) -> Chunk:
+        """The chunk at ``(chunk_row, chunk_col)``, generating it if it is not cached."""
+        key = (chunk_row, chunk_col)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._generate_chunk(chunk_row, chunk_col)
+            self.chunks_generated += 1
+            self._chunks[key] = chunk
+            if len(self._chunks) > self.cache_size:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    @property
+    def cached_chunks(self) -> int:
+        return len(self._chunks)
+
+    def has_wall(self, pos: tuple[int, int], action_index: int) -> bool:
+        row, col = pos
+        chunk_row, local_row = divmod(row, self.chunk_size)
+        chunk_col, local_col = divmod(col, self.chunk_size)
+        return bool(
+            self.chunk(chunk_row, chunk_col).walls[local_row, local_col, action_index]
+        )
+
+    def is_obstacle(self, pos: tuple[int, int]) -> bool:
+        row, col = pos
+        chunk_row, local_row = divmod(row, self.chunk_size)
+        chunk_col, local_col = divmod(col, self.chunk_size)
+        return bool(self.chunk(chunk_row, chunk_col).obstacles[local_row, local_col])
+
+    def to_layout(self) -> GridLayout:
+        """
+        Materialize the whole world, for example to hand it to ArrayGridWorldEnv or a
+        planner. Only meant for small worlds. The chunks are generated outside of the
+        cache and do not count towards ``chunks_generated``.
+        """
+        if self.rows * self.cols > MAX_LAYOUT_CELLS:
+            raise ValueError(
+                f"A {self.rows}x{self.cols} world is too large to materialize."
+            )
+        size = self.chunk_size
+        chunk_rows = -(-self.rows // size)
+        chunk_cols = -(-self.cols // size)
+        walls = np.zeros(
+            (chunk_rows * size, chunk_cols * size, len(ACTION_INDEX)), dtype=np.bool_
+        )
+        obstacles = np.zeros((chunk_rows * size, chunk_cols * size), dtype=np.bool_)
+        for chunk_row in range(chunk_rows):
+            for chunk_col in range(chunk_cols):
+                chunk = self._generate_chunk(chunk_row, chunk_col)
+                rows = slice(chunk_row * size, (chunk_row + 1) * size)
+                cols = slice(chunk_col * size, (chunk_col + 1) * size)
+                walls[rows, cols] = chunk.walls
+                obstacles[rows, cols] = chunk.obstacles
+        return GridLayout(
+            walls=walls[: self.rows, : self.cols].copy(),
+            obstacles=obstacles[: self.rows, : self.cols].copy(),
+            start=self.start,
+            goal=self.goal,
+        )
+
+    @property
+    def visit_counts(self) -> VisitCounter:
+        """
+        The counts as a VisitCounter over the bounding box of the visited cells, so it
+        is as large as the region the agent explored, not as the world.
+        """
+        return VisitCounter(self._visits)
+
+    @property
+    def visited_cells(self) -> int:
+        return len(self._visits)
+
+    @property
+    def reached_goal(self) -> bool:
+        return self.agent_pos == self.goal
+
+    @property
+    def done(self) -> bool:
+        return self.agent_pos == self.goal or self.current_step >= self.max_steps
+
+    def reset(self) -> tuple[int, int]:
+        self._setup()
+        return self.agent_pos
+
+    def get_state(self) -> tuple[int, int]:
+        return self.agent_pos
+
+    def visit(self, new_pos: tuple[int, int]) -> None:
+        self._visits[new_pos] = self._visits.get(new_pos, 0) + 1
+
+    def next_cell(self, action: str) -> tuple[tuple[int, int], str]:
+        action_index = ACTION_INDEX[action]
+        pos = self.agent_pos
+        if self.has_wall(pos, action_index):
+            return pos, INTERIOR_WALL
+
+        new_pos = (
+            pos[0] + ROW_MOVEMENT[action_index],
+            pos[1] + COL_MOVEMENT[action_index],
+        )
+        if not self.in_bounds(new_pos):
+            return pos, OFF_BOARD
+        if self.has_wall(new_pos, REVERSED_ACTION_INDEX[action_index]):
+            return pos, INTERIOR_WALL
+        if self.is_obstacle(new_pos):
+            return pos, OBSTACLE
+        if new_pos == self.goal:
+            return new_pos, GOAL
+        return new_pos, MOVEMENT
+
+    def step(self, action: str) -> StepResult:
+        new_state, reward, done = self.fast_step(action)
+        return StepResult(new_state=new_state, reward=reward, done=done)
+
+    def fast_step(self, action: str) -> tuple[tuple[int, int], float, bool]:
+        """Like ``GridWorldEnv.fast_step``, on the generated chunks."""
+        if action not in ACTION_INDEX:
+            raise ValueError(f"Invalid action: {action}")
+
+        if self.done:
+            raise RuntimeError("Cannot step; the goal has already been reached.")
+
+        self.current_step += 1
+        new_pos, outcome = self.next_cell(action)
+
+        current_reward = self.reward_config[outcome]
+        self.total_reward += current_reward
+        self.agent_pos = new_pos
+        self.visit(new_pos)
+
+        return (new_pos, current_reward, self.done)
+
+    def render(self, radius: int = 5) -> None:
+        """Render the cells within ``radius`` of the agent."""
+        console.print(f"Step: {self.current_step} of {self.max_steps}")
+        console.print(f"Total Reward: {round(self.total_reward, 2)}")
+        console.print(f"Position: {self.agent_pos} of {self.rows}x{self.cols}\n")
+
+        up, down, left = ACTION_INDEX[UP], ACTION_INDEX[DOWN], ACTION_INDEX[LEFT]
+        row, col = self.agent_pos
+        top, bottom = max(row - radius, 0), min(row + radius + 1, self.rows)
+        first, last = max(col - radius, 0), min(col + radius + 1, self.cols)
+
+        for i in range(top, bottom):
+            top_line = Text()
+            for j in range(first, last):
+                top_line.append("┌─ " if self.has_wall((i, j), up) else "   ")
+            console.print(top_line)
+
+            mid_line = Text()
+            for j in range(first, last):
+                left_wall = "│" if self.has_wall((i, j), left) else " "
+                if (i, j) == self.agent_pos:
+                    mid_line.append(left_wall + "A ", style="bold blue")
+                elif (i, j) == self.goal:
+                    mid_line.append(left_wall + "G ", style="bold green")
+                elif self.is_obstacle((i, j)):
+                    mid_line.append(left_wall + "█ ", style="dim white")
+                else:
+                    mid_line.append(left_wall + "  ", style="white")
+            console.print(mid_line)
+
+        bottom_line = Text()
+        for j in range(first, last):
+            bottom_line.append("└─ " if self.has_wall((bottom - 1, j), down) else "   ")
+        console.print(bottom_line)
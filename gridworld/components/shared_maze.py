@@ -0,0 +1,179 @@
+"""
+Publish a maze once into shared memory and attach environments to it from other processes.
+
+Pickling a GridWorldEnv to every worker copies its whole Cell/Walls object graph. Instead,
+the parent publishes the maze's layout (walls, obstacles, start and goal) and its compiled
+transition table into one ``multiprocessing.shared_memory`` block, then sends workers a
+small ``SharedMazeHandle``. Workers attach to the block and build an ArrayGridWorldEnv
+whose layout and transition table are views into the shared memory, so no maze data is
+copied, however many workers run on it.
+
+The publishing process owns the block: it has to outlive the workers and ``unlink()`` it
+when they are done (using ``SharedMaze`` as a context manager does both close and unlink).
+
+Example usage:
+    with SharedMaze.publish(GridLayout.from_entries(maze)) as shared:
+        with Pool(4) as pool:
+            pool.map(run_worker, [shared.handle] * 4)
+
+    def run_worker(handle: SharedMazeHandle) -> None:
+        shared = SharedMaze.attach(handle)
+        env = shared.env(max_steps=100)
+        ...
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.components.array_grid_environment import (
+    ArrayGridWorldEnv,
+    GridLayout,
+    TransitionTable,
+    compile_transitions,
+)
+from gridworld.components.grid_environment import STEP_RESULT_REWARD
+from gridworld.utils import SIMPLE_ACTIONS
+
+
+@dataclass(frozen=True)
+class SharedMazeHandle:
+    """Everything a worker needs to attach to a published maze. Cheap to pickle."""
+
+    name: str
+    rows: int
+    cols: int
+    start: tuple[int, int]
+    goal: tuple[int, int]
+    reward_config: Mapping[str, float] = field(default_factory=dict[str, float])
+
+
+def _sections(
+    rows: int, cols: int
+) -> list[tuple[str, type[np.generic], tuple[int, ...]]]:
+    """
+    The arrays stored in the block, in order. The 8 byte types come first so every
+    section is aligned.
+    """
+    states = rows * cols
+    actions = len(SIMPLE_ACTIONS)
+    return [
+        ("next_states", np.int64, (states, actions)),
+        ("rewards", np.float64, (states, actions)),
+        ("outcomes", np.int8, (states, actions)),
+        ("walls", np.bool_, (rows, cols, actions)),
+        ("obstacles", np.bool_, (rows, cols)),
+    ]
+
+
+def _size(rows: int, cols: int) -> int:
+    return sum(
+        int(np.prod(shape)) * np.dtype(dtype).itemsize
+        for _, dtype, shape in _sections(rows, cols)
+    )
+
+
+def _views(shm: SharedMemory, rows: int, cols: int) -> dict[str, NDArray[Any]]:
+    views: dict[str, NDArray[Any]] = {}
+    offset = 0
+    for name, dtype, shape in _sections(rows, cols):
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        views[name] = view
+        offset += view.nbytes
+    return views
+
+
+class SharedMaze:
+    def __init__(self, shm: SharedMemory, handle: SharedMazeHandle, owner: bool):
+        self._shm = shm
+        self.handle = handle
+        self.owner = owner
+
+        views = _views(shm, handle.rows, handle.cols)
+        for view in views.values():
+            view.setflags(write=False)
+        self.layout: GridLayout = GridLayout(
+            walls=views["walls"],
+            obstacles=views["obstacles"],
+            start=handle.start,
+            goal=handle.goal,
+        )
+        self.transitions: TransitionTable = TransitionTable(
+            next_states=views["next_states"],
+            outcomes=views["outcomes"],
+            rewards=views["rewards"],
+        )
+
+    @classmethod
+    def publish(
+        cls, layout: GridLayout, reward_config: Mapping[str, float] | None = None
+    ) -> "SharedMaze":
+        """Copy ``layout`` and its compiled transition table into a new block."""
+        reward_config = dict(reward_config or STEP_RESULT_REWARD)
+        transitions = compile_transitions(layout, reward_config)
+        shm = SharedMemory(create=True, size=_size(layout.rows, layout.cols))
+
+        views = _views(shm, layout.rows, layout.cols)
+        views["next_states"][:] = transitions.next_states
+        views["rewards"][:] = transitions.rewards
+        views["outcomes"][:] = transitions.outcomes
+        views["walls"][:] = layout.walls
+        views["obstacles"][:] = layout.obstacles
+        del views
+
+        handle = SharedMazeHandle(
+            name=shm.name,
+            rows=layout.rows,
+            cols=layout.cols,
+            start=layout.start,
+            goal=layout.goal,
+            reward_config=reward_config,
+        )
+        return cls(shm, handle, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedMazeHandle) -> "SharedMaze":
+        return cls(SharedMemory(name=handle.name), handle, owner=False)
+
+    def env(self, max_steps: int = 100) -> ArrayGridWorldEnv:
+        """An environment reading its layout and transitions from the shared block."""
+        return ArrayGridWorldEnv(
+            layout=self.layout,
+            transitions=self.transitions,
+            reward_config=self.handle.reward_config,
+            max_steps=max_steps,
+        )
+
+    def close(self) -> None:
+        """
+        Detach from the block. Environments created by ``env()`` must be released first,
+        since they hold views into it.
+        """
+        del self.layout
+        del self.transitions
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if not self.owner:
+            raise RuntimeError(
+                "Only the process that published the maze can unlink it."
+            )
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedMaze":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
@@ -0,0 +1,244 @@
+import random
+
+import pytest
+
+from gridworld.components.maze_builders import (
+    Entry,
+    RecursiveBacktracking,
+    SparseObstacleMazeGenerator,
+    Walls,
+)
+from gridworld.utils import (
+    DOWN,
+    GOAL,
+    INTERIOR_WALL,
+    MOVEMENT,
+    OBSTACLE,
+    OFF_BOARD,
+    RIGHT,
+    SIMPLE_ACTIONS,
+    UP,
+)
+from ..array_grid_environment import (
+    OUTCOMES,
+    ArrayGridWorldEnv,
+    GridLayout,
+    compile_transitions,
+)
+from ..grid_environment import GridWorldEnv
+
+
+class TestGridLayout:
+    def test_empty_layout(self):
+        layout = GridLayout.empty(3, 4)
+        assert layout.rows == 3
+        assert layout.cols == 4
+        assert layout.start == (0, 0)
+        assert layout.goal == (2, 3)
+        assert not layout.walls.any()
+        assert not layout.obstacles.any()
+
+    def test_reads_entries(self):
+        grid = [
+            [Entry(goal=True), Entry(obstacle=True)],
+            [Entry(walls=Walls(up=True, right=True)), Entry(start=True)],
+        ]
+        layout = GridLayout.from_entries(grid)
+        assert layout.start == (1, 1)
+        assert layout.goal == (0, 0)
+        assert layout.obstacles.tolist() == [[False, True], [False, False]]
+        assert layout.walls[1, 0].tolist() == [True, False, False, True]
+
+    def test_rejects_multiple_starts(self):
+        grid = [[Entry(start=True), Entry(start=True)]]
+        with pytest.raises(ValueError):
+            GridLayout.from_entries(grid)
+
+
+class TestArrayGridWorldEnvInit:
+    def test_can_create_env(self):
+        env = ArrayGridWorldEnv()
+        assert env.rows == 5
+        assert env.cols == 5
+        assert env.start == (0, 0)
+        assert env.goal == (4, 4)
+        assert env.agent_pos == (0, 0)
+        assert env.done is False
+        assert env.visit_counts[(0, 0)] == 1
+        assert sum(env.visit_counts.values()) == 1
+
+    def test_pulls_start_and_goal_from_grid(self):
+        grid = [
+            [Entry(), Entry(), Entry(goal=True)],
+            [Entry(start=True), Entry(), Entry()],
+        ]
+        env = ArrayGridWorldEnv(grid=grid)
+        assert env.start == (1, 0)
+        assert env.goal == (0, 2)
+        assert env.agent_pos == (1, 0)
+
+    def test_grid_materializes_cells(self):
+        grid = [[Entry(start=True), Entry(obstacle=True)], [Entry(), Entry(goal=True)]]
+        env = ArrayGridWorldEnv(grid=grid)
+        assert env.grid[0][0].agent is True
+        assert env.grid[0][1].obstacle is True
+        assert env.grid[1][1].goal is True
+
+
+class TestStep:
+    def test_moves_and_rewards(self):
+        env = ArrayGridWorldEnv()
+        new_state, reward, done = env.step(RIGHT)
+        assert new_state == (0, 1)
+        assert reward == -1
+        assert done is False
+
+    def test_off_board(self):
+        env = ArrayGridWorldEnv()
+        new_state, reward, done = env.step(UP)
+        assert new_state == (0, 0)
+        assert reward == -10
+        assert env.visit_counts[(0, 0)] == 2
+
+    def test_reaches_goal(self):
+        env = ArrayGridWorldEnv()
+        env.agent_pos = (3, 4)
+        new_state, reward, done = env.step(DOWN)
+        assert new_state == (4, 4)
+        assert reward == 100
+        assert done is True
+        assert env.reached_goal is True
+        with pytest.raises(RuntimeError):
+            env.step(UP)
+
+    def test_done_at_max_steps(self):
+        env = ArrayGridWorldEnv(max_steps=1)
+        _, _, done = env.step(RIGHT)
+        assert done is True
+        assert env.reached_goal is False
+
+    def test_walls_on_either_side_block(self):
+        grid = [
+            [Entry(start=True, walls=Walls(right=True)), Entry()],
+            [Entry(), Entry(goal=True, walls=Walls(left=True))],
+        ]
+        env = ArrayGridWorldEnv(grid=grid)
+        assert env.step(RIGHT).new_state == (0, 0)
+        env.agent_pos = (1, 0)
+        assert env.step(RIGHT).reward == -10
+
+    def test_obstacle_takes_precedence_over_goal(self):
+        grid = [[Entry(start=True), Entry(goal=True, obstacle=True)]]
+        env = ArrayGridWorldEnv(grid=grid)
+        new_state, reward, done = env.step(RIGHT)
+        assert new_state == (0, 0)
+        assert reward == -10
+
+    def test_errors_if_invalid_action(self):
+        env = ArrayGridWorldEnv()
+        with pytest.raises(ValueError):
+            env.step("invalid_action")
+
+
+class TestFastStep:
+    def test_returns_a_plain_tuple(self):
+        env = ArrayGridWorldEnv(max_steps=1)
+        assert env.fast_step(RIGHT) == ((0, 1), -1, True)
+        assert env.total_reward == -1
+        with pytest.raises(RuntimeError):
+            env.fast_step(RIGHT)
+
+    @pytest.mark.parametrize("env_class", [GridWorldEnv, ArrayGridWorldEnv])
+    def test_matches_step(self, env_class):
+        grid = RecursiveBacktracking(rows=6, cols=6, rng=random.Random(4)).run()
+        env = env_class(grid=grid, max_steps=100)
+        fast_env = env_class(grid=grid, max_steps=100)
+        rng = random.Random(5)
+
+        while not env.done:
+            action = rng.choice(SIMPLE_ACTIONS)
+            assert tuple(env.step(action)) == fast_env.fast_step(action)
+        assert fast_env.visit_counts == env.visit_counts
+
+
+class TestReset:
+    def test_moves_agent_back_to_start(self):
+        env = ArrayGridWorldEnv()
+        env.step(RIGHT)
+        env.step(DOWN)
+        pos = env.reset()
+        assert pos == (0, 0)
+        assert env.total_reward == 0
+        assert env.current_step == 0
+        assert env.visit_counts == {(0, 0): 1}
+
+
+class TestMatchesGridWorldEnv:
+    @pytest.mark.parametrize(
+        "generator", [RecursiveBacktracking, SparseObstacleMazeGenerator]
+    )
+    def test_same_trajectory_as_grid_world_env(self, generator):
+        grid = generator(rows=8, cols=8, rng=random.Random(3)).run()
+        env = GridWorldEnv(grid=grid, max_steps=300)
+        array_env = ArrayGridWorldEnv(grid=grid, max_steps=300)
+        rng = random.Random(7)
+
+        while not env.done:
+            action = rng.choice(SIMPLE_ACTIONS)
+            assert tuple(env.step(action)) == tuple(array_env.step(action))
+
+        assert array_env.done is True
+        assert array_env.total_reward == env.total_reward
+        assert array_env.visit_counts == env.visit_counts
+
+
+class TestTransitionTable:
+    @pytest.mark.parametrize(
+        "generator", [RecursiveBacktracking, SparseObstacleMazeGenerator]
+    )
+    def test_matches_next_cell_of_grid_world_env(self, generator):
+        grid = generator(rows=6, cols=7, rng=random.Random(5)).run()
+        env = GridWorldEnv(grid=grid)
+        table = compile_transitions(GridLayout.from_entries(grid))
+
+        for row in range(env.rows):
+            for col in range(env.cols):
+                if env.get_cell((row, col)).obstacle:
+                    continue
+                env.agent_pos = (row, col)
+                for action_index, action in enumerate(SIMPLE_ACTIONS):
+                    (new_row, new_col), outcome = env.next_cell(action)
+                    state = row * env.cols + col
+                    assert table.next_states[state, action_index] == (
+                        new_row * env.cols + new_col
+                    )
+                    assert OUTCOMES[table.outcomes[state, action_index]] == outcome
+                    assert table.rewards[state, action_index] == (
+                        env.reward_config[outcome]
+                    )
+
+    def test_is_read_only(self):
+        env = ArrayGridWorldEnv()
+        with pytest.raises(ValueError):
+            env.transition_table.next_states[0, 0] = 3
+        with pytest.raises(ValueError):
+            env.transition_table.rewards[0, 0] = 3
+
+    def test_marks_goal_transitions(self):
+        env = ArrayGridWorldEnv(rows=2, cols=2)
+        reaches_goal = env.transition_table.reaches_goal
+        assert reaches_goal.sum() == 2
+        assert reaches_goal[env.to_index((0, 1)), SIMPLE_ACTIONS.index(DOWN)]
+        assert reaches_goal[env.to_index((1, 0)), SIMPLE_ACTIONS.index(RIGHT)]
+
+    def test_uses_custom_reward_config(self):
+        reward_config = {
+            OFF_BOARD: -50,
+            OBSTACLE: -10,
+            GOAL: 1,
+            MOVEMENT: 0,
+            INTERIOR_WALL: -10,
+        }
+        env = ArrayGridWorldEnv(reward_config=reward_config)
+        assert env.step(UP).reward == -50
+        assert env.step(RIGHT).reward == 0
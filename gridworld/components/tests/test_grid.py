@@ -251,6 +251,38 @@ class TestReset:
         assert env.visit_counts[(0, 0)] == 1
         assert sum(env.visit_counts.values()) == 1
 
+    def test_reuses_cells(self):
+        env = GridWorldEnv()
+        cell = env.grid[3][3]
+        env.step(DOWN)
+        env.reset()
+        assert env.grid[3][3] is cell
+
+    def test_only_restores_touched_cells(self):
+        env = GridWorldEnv(rows=50, cols=50)
+        env.step(DOWN)
+        env.step(RIGHT)
+        # changed behind the environment's back, so reset() does not know about it
+        env.grid[20][20].walls = Walls(up=True)
+        env.reset()
+        assert env.grid[1][0] == Cell()
+        assert env.grid[1][1] == Cell()
+        assert env.grid[0][0] == Cell(agent=True, visited=1)
+        assert env.grid[20][20] == Cell(walls=Walls(up=True))
+
+    def test_restores_cells_changed_through_get_cell(self):
+        grid = [
+            [Entry(start=True), Entry(walls=Walls(up=True))],
+            [Entry(obstacle=True), Entry(goal=True)],
+        ]
+        env = GridWorldEnv(grid=grid)
+        env.get_cell((0, 1)).walls = Walls(down=True)
+        env.get_cell((1, 0)).obstacle = False
+        env.reset()
+        assert env.get_cell((0, 1)).walls == Walls(up=True)
+        assert env.get_cell((1, 0)).obstacle is True
+        assert env.get_cell((1, 1)).goal is True
+
 
 class TestDone:
     def test_done_is_false_when_not_at_goal(self):
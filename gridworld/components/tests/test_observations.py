@@ -0,0 +1,129 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.components.maze_builders import (
+    Entry,
+    RecursiveBacktracking,
+    SparseObstacleMazeGenerator,
+    Walls,
+)
+from gridworld.utils import RIGHT
+from ..array_grid_environment import ArrayGridWorldEnv, GridLayout
+from ..observations import CHANNEL_INDEX, CHANNELS, WindowObserver
+from ..vector_grid_environment import VectorGridWorldEnv
+
+
+def build_layout():
+    grid = [
+        [Entry(start=True, walls=Walls(right=True)), Entry(), Entry()],
+        [Entry(), Entry(obstacle=True), Entry()],
+        [Entry(), Entry(), Entry(goal=True)],
+    ]
+    return GridLayout.from_entries(grid)
+
+
+def build_layout_entries():
+    return RecursiveBacktracking(rows=4, cols=4, rng=random.Random(0)).run()
+
+
+class TestObserve:
+    def test_window_shape(self):
+        observer = WindowObserver(build_layout(), radius=2)
+        assert observer.observe((1, 1)).shape == (5, 5, len(CHANNELS))
+
+    def test_centre_is_the_agents_cell(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        window = observer.observe((0, 0))
+        assert window[1, 1, CHANNEL_INDEX["wall_right"]]
+        assert not window[1, 1, CHANNEL_INDEX["off_board"]]
+
+    def test_marks_obstacles_and_goal(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        window = observer.observe((2, 1))
+        assert window[0, 1, CHANNEL_INDEX["obstacle"]]
+        assert window[1, 2, CHANNEL_INDEX["goal"]]
+        assert window[:, :, CHANNEL_INDEX["goal"]].sum() == 1
+
+    def test_marks_cells_off_the_board(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        off_board = observer.observe((0, 0))[:, :, CHANNEL_INDEX["off_board"]]
+        assert off_board.tolist() == [
+            [True, True, True],
+            [True, False, False],
+            [True, False, False],
+        ]
+
+    def test_is_a_read_only_view(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        window = observer.observe((1, 1))
+        assert np.shares_memory(window, observer.padded)
+        with pytest.raises(ValueError):
+            window[0, 0, 0] = True
+
+    def test_radius_zero_is_the_cell(self):
+        layout = build_layout()
+        observer = WindowObserver(layout, radius=0)
+        window = observer.observe((0, 0))
+        assert window.shape == (1, 1, len(CHANNELS))
+        assert window[0, 0, :4].tolist() == layout.walls[0, 0].tolist()
+
+    def test_rejects_negative_radius(self):
+        with pytest.raises(ValueError):
+            WindowObserver(build_layout(), radius=-1)
+
+    def test_rejects_positions_off_the_board(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        for pos in [(-1, 0), (0, -1), (3, 0), (0, 3)]:
+            with pytest.raises(ValueError):
+                observer.observe(pos)
+
+    def test_follows_the_env(self):
+        env = ArrayGridWorldEnv(grid=build_layout_entries())
+        observer = WindowObserver.for_env(env, radius=1)
+        env.step(RIGHT)
+        assert np.array_equal(
+            observer.observe(env.get_state()), observer.observe((0, 1))
+        )
+
+
+class TestObserveMany:
+    @pytest.mark.parametrize(
+        "generator", [RecursiveBacktracking, SparseObstacleMazeGenerator]
+    )
+    @pytest.mark.parametrize("radius", [0, 1, 3])
+    def test_matches_observe(self, generator, radius):
+        layout = GridLayout.from_entries(
+            generator(rows=6, cols=9, rng=random.Random(2)).run()
+        )
+        observer = WindowObserver(layout, radius=radius)
+        states = np.arange(layout.rows * layout.cols)
+
+        windows = observer.observe_many(states)
+
+        assert windows.shape == (len(states), 2 * radius + 1, 2 * radius + 1, 7)
+        for state in states.tolist():
+            pos = divmod(state, layout.cols)
+            assert np.array_equal(windows[state], observer.observe(pos))
+
+    def test_writes_into_out(self):
+        layout = GridLayout.from_entries(build_layout_entries())
+        env = VectorGridWorldEnv([layout], num_envs=8)
+        observer = WindowObserver(layout, radius=1)
+        out = np.zeros((8, 3, 3, len(CHANNELS)), dtype=np.bool_)
+
+        env.reset()
+        env.step(np.full(8, 3))
+        result = observer.observe_many(env.states, out=out)
+
+        assert result is out
+        rows, cols = env.to_positions(env.states)
+        assert np.array_equal(out[0], observer.observe((int(rows[0]), int(cols[0]))))
+
+    def test_rejects_states_off_the_board(self):
+        observer = WindowObserver(build_layout(), radius=1)
+        for states in [[0, -1], [9], [4, 12]]:
+            with pytest.raises(ValueError):
+                observer.observe_many(np.array(states))
+        assert len(observer.observe_many(np.array([], dtype=np.int64))) == 0
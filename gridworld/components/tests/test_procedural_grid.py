@@ -0,0 +1,141 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.random_agent import RandomAgent
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, SIMPLE_ACTIONS
+from ..array_grid_environment import ArrayGridWorldEnv
+from ..procedural_grid_environment import ProceduralGridWorldEnv
+
+
+class TestChunks:
+    def test_same_seed_same_world(self):
+        env = ProceduralGridWorldEnv(seed=4)
+        other = ProceduralGridWorldEnv(seed=4)
+        assert np.array_equal(env.chunk(3, 7).walls, other.chunk(3, 7).walls)
+        assert np.array_equal(env.chunk(3, 7).obstacles, other.chunk(3, 7).obstacles)
+
+    def test_different_seed_different_world(self):
+        env = ProceduralGridWorldEnv(seed=4)
+        other = ProceduralGridWorldEnv(seed=5)
+        assert not np.array_equal(env.chunk(0, 0).walls, other.chunk(0, 0).walls)
+
+    def test_generates_chunks_lazily(self):
+        env = ProceduralGridWorldEnv()
+        assert env.chunks_generated == 0
+        env.step(RIGHT)
+        assert env.chunks_generated == 1
+
+    def test_evicts_the_least_recently_used_chunk(self):
+        env = ProceduralGridWorldEnv(cache_size=2)
+        first = env.chunk(0, 0)
+        env.chunk(0, 1)
+        env.chunk(0, 0)
+        env.chunk(1, 0)
+        assert env.cached_chunks == 2
+        assert env.chunks_generated == 3
+        # (0, 0) was used more recently than (0, 1)
+        assert env.chunk(0, 0) is first
+        env.chunk(0, 1)
+        assert env.chunks_generated == 4
+
+    def test_regenerated_chunk_is_identical(self):
+        env = ProceduralGridWorldEnv(cache_size=1)
+        walls = env.chunk(2, 2).walls
+        env.chunk(5, 5)
+        assert np.array_equal(env.chunk(2, 2).walls, walls)
+        assert env.chunks_generated == 3
+
+    def test_start_and_goal_are_never_obstacles(self):
+        env = ProceduralGridWorldEnv(rows=100, cols=100, obstacle_density=1.0)
+        assert not env.is_obstacle(env.start)
+        assert not env.is_obstacle(env.goal)
+        assert env.is_obstacle((50, 50))
+
+
+class TestInit:
+    def test_defaults(self):
+        env = ProceduralGridWorldEnv()
+        assert env.rows == 10_000
+        assert env.start == (0, 0)
+        assert env.goal == (9_999, 9_999)
+        assert env.get_state() == (0, 0)
+
+    def test_rejects_start_out_of_bounds(self):
+        with pytest.raises(ValueError):
+            ProceduralGridWorldEnv(rows=10, cols=10, start=(10, 0))
+
+
+class TestStep:
+    def test_errors_if_invalid_action(self):
+        env = ProceduralGridWorldEnv()
+        with pytest.raises(ValueError):
+            env.step("invalid_action")
+
+    def test_reaches_goal(self):
+        env = ProceduralGridWorldEnv(
+            rows=2, cols=2, obstacle_density=0, wall_density=0, max_steps=10
+        )
+        env.step(RIGHT)
+        new_state, reward, done = env.step(DOWN)
+        assert new_state == (1, 1)
+        assert reward == 100
+        assert done is True
+        with pytest.raises(RuntimeError):
+            env.step(DOWN)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_array_env_on_the_same_layout(self, seed):
+        env = ProceduralGridWorldEnv(
+            rows=20, cols=30, seed=seed, chunk_size=8, cache_size=3, max_steps=500
+        )
+        array_env = ArrayGridWorldEnv(layout=env.to_layout(), max_steps=500)
+        rng = random.Random(seed)
+
+        while not env.done:
+            action = rng.choice(SIMPLE_ACTIONS)
+            assert tuple(env.step(action)) == tuple(array_env.step(action))
+
+        assert array_env.done is True
+        assert env.total_reward == array_env.total_reward
+        assert env.visit_counts == array_env.visit_counts
+
+    def test_reset(self):
+        env = ProceduralGridWorldEnv(obstacle_density=0, wall_density=0)
+        env.step(RIGHT)
+        assert env.reset() == (0, 0)
+        assert env.total_reward == 0
+        assert env.current_step == 0
+        assert env.visit_counts == {(0, 0): 1}
+
+
+class TestMemory:
+    def test_only_the_visited_region_is_generated(self):
+        env = ProceduralGridWorldEnv(
+            rows=10_000, cols=10_000, seed=1, max_steps=5_000, wall_density=0.05
+        )
+        Runner(env, RandomAgent(rng=random.Random(1))).run_episode_fast()
+        assert 1 <= env.cached_chunks <= 4
+        assert env.visited_cells < 5_000
+
+    def test_visit_counts_cover_only_the_visited_region(self):
+        env = ProceduralGridWorldEnv(
+            rows=10_000, cols=10_000, start=(5_000, 5_000), max_steps=50
+        )
+        Runner(env, RandomAgent(rng=random.Random(2))).run_episode()
+        visit_counts = env.visit_counts
+        assert visit_counts.shape[0] <= 51 and visit_counts.shape[1] <= 51
+        assert sum(visit_counts.values()) == 51
+        assert visit_counts[(5_000, 5_000)] >= 1
+
+    def test_to_layout_is_not_counted_as_exploration(self):
+        env = ProceduralGridWorldEnv(rows=20, cols=30, chunk_size=8)
+        env.to_layout()
+        assert env.chunks_generated == 0
+        assert env.cached_chunks == 0
+
+    def test_refuses_to_materialize_a_huge_world(self):
+        with pytest.raises(ValueError):
+            ProceduralGridWorldEnv().to_layout()
@@ -0,0 +1,76 @@
+import multiprocessing
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.random_agent import RandomAgent
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+from ..array_grid_environment import ArrayGridWorldEnv, GridLayout
+from ..shared_maze import SharedMaze, SharedMazeHandle
+
+
+def build_layout() -> GridLayout:
+    return GridLayout.from_entries(
+        RecursiveBacktracking(rows=6, cols=5, rng=random.Random(1)).run()
+    )
+
+
+def run_in_worker(handle: SharedMazeHandle) -> list[float]:
+    shared = SharedMaze.attach(handle)
+    env = shared.env(max_steps=50)
+    runner = Runner(env, RandomAgent(rng=random.Random(2)))
+    rewards = [result["total_reward"] for result in runner.run_episodes(5)]
+    del runner, env
+    shared.close()
+    return rewards
+
+
+class TestPublish:
+    def test_layout_round_trips(self):
+        layout = build_layout()
+        with SharedMaze.publish(layout) as shared:
+            assert np.array_equal(shared.layout.walls, layout.walls)
+            assert np.array_equal(shared.layout.obstacles, layout.obstacles)
+            assert shared.layout.start == layout.start
+            assert shared.layout.goal == layout.goal
+
+    def test_attached_views_are_read_only(self):
+        with SharedMaze.publish(build_layout()) as shared:
+            attached = SharedMaze.attach(shared.handle)
+            with pytest.raises(ValueError):
+                attached.layout.walls[0, 0, 0] = True
+            attached.close()
+
+    def test_only_owner_can_unlink(self):
+        with SharedMaze.publish(build_layout()) as shared:
+            attached = SharedMaze.attach(shared.handle)
+            with pytest.raises(RuntimeError):
+                attached.unlink()
+            attached.close()
+
+
+class TestEnv:
+    def test_env_shares_memory_with_the_block(self):
+        with SharedMaze.publish(build_layout()) as shared:
+            env = shared.env()
+            assert np.shares_memory(
+                env.transition_table.next_states, shared.transitions.next_states
+            )
+            del env
+
+    def test_plays_like_an_unshared_env(self):
+        layout = build_layout()
+        env = ArrayGridWorldEnv(layout=layout, max_steps=50)
+        expected = [
+            result["total_reward"]
+            for result in Runner(env, RandomAgent(rng=random.Random(2))).run_episodes(5)
+        ]
+
+        with SharedMaze.publish(layout) as shared:
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(2) as pool:
+                results = pool.map(run_in_worker, [shared.handle] * 2)
+
+        assert results == [expected, expected]
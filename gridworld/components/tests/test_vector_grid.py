@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.utils import DOWN, RIGHT, SIMPLE_ACTIONS, UP
+from ..array_grid_environment import ArrayGridWorldEnv, GridLayout
+from ..vector_grid_environment import VectorGridWorldEnv
+
+RIGHT_INDEX = SIMPLE_ACTIONS.index(RIGHT)
+DOWN_INDEX = SIMPLE_ACTIONS.index(DOWN)
+UP_INDEX = SIMPLE_ACTIONS.index(UP)
+
+
+class TestReset:
+    def test_starts_every_slot_at_start(self):
+        env = VectorGridWorldEnv([GridLayout.empty(3, 3)], num_envs=4)
+        assert env.reset().tolist() == [0, 0, 0, 0]
+        assert env.current_steps.tolist() == [0, 0, 0, 0]
+
+
+class TestStep:
+    def test_steps_all_slots(self):
+        env = VectorGridWorldEnv([GridLayout.empty(3, 3)], num_envs=3)
+        result = env.step(np.array([RIGHT_INDEX, DOWN_INDEX, UP_INDEX]))
+        assert result.new_states.tolist() == [1, 3, 0]
+        assert result.rewards.tolist() == [-1, -1, -10]
+        assert result.dones.tolist() == [False, False, False]
+        assert env.states.tolist() == [1, 3, 0]
+
+    def test_auto_resets_slots_that_reach_the_goal(self):
+        env = VectorGridWorldEnv([GridLayout.empty(1, 2)], num_envs=2)
+        result = env.step(np.array([RIGHT_INDEX, UP_INDEX]))
+        assert result.new_states.tolist() == [1, 0]
+        assert result.dones.tolist() == [True, False]
+        assert result.reached_goal.tolist() == [True, False]
+        assert result.episode_rewards[0] == 100
+        assert result.episode_steps[0] == 1
+        assert env.states.tolist() == [0, 0]
+        assert env.current_steps.tolist() == [0, 1]
+        assert env.total_rewards.tolist() == [0, -10]
+
+    def test_auto_resets_slots_at_max_steps(self):
+        env = VectorGridWorldEnv([GridLayout.empty(3, 3)], num_envs=1, max_steps=2)
+        env.step(np.array([RIGHT_INDEX]))
+        result = env.step(np.array([DOWN_INDEX]))
+        assert result.dones.tolist() == [True]
+        assert result.reached_goal.tolist() == [False]
+        assert result.episode_rewards.tolist() == [-2]
+        assert env.states.tolist() == [0]
+
+    def test_rejects_wrong_number_of_actions(self):
+        env = VectorGridWorldEnv([GridLayout.empty(3, 3)], num_envs=2)
+        with pytest.raises(ValueError):
+            env.step(np.array([RIGHT_INDEX]))
+
+    def test_rejects_invalid_actions(self):
+        env = VectorGridWorldEnv([GridLayout.empty(3, 3)], num_envs=1)
+        with pytest.raises(ValueError):
+            env.step(np.array([4]))
+
+
+class TestMatchesArrayGridWorldEnv:
+    def test_each_slot_plays_its_own_maze(self):
+        layouts = [
+            GridLayout.from_entries(
+                RecursiveBacktracking(
+                    rows=rows, cols=cols, rng=random.Random(rows)
+                ).run()
+            )
+            for rows, cols in [(4, 4), (5, 7), (6, 3)]
+        ]
+        env = VectorGridWorldEnv(layouts, num_envs=6, max_steps=500)
+        single_envs = [
+            ArrayGridWorldEnv(layout=layouts[i % 3], max_steps=500) for i in range(6)
+        ]
+        rng = np.random.default_rng(0)
+
+        for _ in range(200):
+            actions = rng.integers(0, len(SIMPLE_ACTIONS), size=env.num_envs)
+            result = env.step(actions)
+            rows, cols = env.to_positions(result.new_states)
+            for i, single_env in enumerate(single_envs):
+                new_state, reward, done = single_env.step(SIMPLE_ACTIONS[actions[i]])
+                assert new_state == (rows[i], cols[i])
+                assert reward == result.rewards[i]
+                assert done == result.dones[i]
+                if done:
+                    single_env.reset()
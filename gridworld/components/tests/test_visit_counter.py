@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from gridworld.components.grid_environment import VisitCounter
 
 
@@ -154,3 +157,100 @@ class TestItems:
         visit_counter[(1, 1)] = 2
 
         assert list(visit_counter.items()) == [((0, 0), 1), ((1, 1), 2)]
+
+
+class TestCounts:
+    def test_wraps_counts_array(self):
+        visit_counter = VisitCounter(counts=np.array([[1, 0], [0, 2]]))
+        assert visit_counter[(1, 1)] == 2
+        assert visit_counter.shape == (2, 2)
+        assert list(visit_counter.items()) == [
+            ((0, 0), 1),
+            ((0, 1), 0),
+            ((1, 0), 0),
+            ((1, 1), 2),
+        ]
+
+    def test_grows_when_setting_outside_the_array(self):
+        visit_counter = VisitCounter(counts=np.zeros((1, 1), dtype=np.int64))
+        visit_counter[(2, 3)] = 4
+        assert visit_counter.shape == (3, 4)
+        assert visit_counter.counts[2, 3] == 4
+
+    def test_out_of_bounds_is_zero(self):
+        visit_counter = VisitCounter(counts=np.ones((2, 2), dtype=np.int64))
+        assert visit_counter[(5, 5)] == 0
+        assert visit_counter[(-1, 0)] == 0
+
+    def test_compares_different_shapes(self):
+        visit_counter1 = VisitCounter(counts=np.array([[1, 0], [0, 0]]))
+        visit_counter2 = VisitCounter(counts=np.array([[1]]))
+        assert visit_counter1 == visit_counter2
+
+    def test_data_is_read_only(self):
+        visit_counter = VisitCounter(data={(0, 1): 3})
+        assert visit_counter.data == {(0, 1): 3}
+        with pytest.raises(TypeError):
+            visit_counter.data[(3, 3)] = 1  # type: ignore[index]
+
+    def test_rejects_negative_coordinates(self):
+        visit_counter = VisitCounter()
+        with pytest.raises(ValueError):
+            visit_counter[(-1, 0)] = 1
+        assert visit_counter == {}
+
+
+class TestSum:
+    def test_sum(self):
+        visit_counter1 = VisitCounter(data={(0, 0): 1, (1, 1): 2})
+        visit_counter2 = VisitCounter(data={(0, 0): 3, (2, 2): 4})
+
+        result = VisitCounter.sum(visit_counter1, visit_counter2)
+
+        assert result == {(0, 0): 4, (1, 1): 2, (2, 2): 4}
+        # the inputs are left untouched, unlike +
+        assert visit_counter1 == {(0, 0): 1, (1, 1): 2}
+
+
+class TestMax:
+    def test_max(self):
+        visit_counter1 = VisitCounter(data={(0, 0): 1, (1, 1): 2})
+        visit_counter2 = VisitCounter(data={(0, 0): 3})
+
+        result = VisitCounter.max(visit_counter1, visit_counter2)
+
+        assert result == {(0, 0): 3, (1, 1): 2}
+
+
+class TestNoCounters:
+    def test_reductions_of_no_counters_are_empty(self):
+        assert VisitCounter.sum() == {}
+        assert VisitCounter.avg() == {}
+        assert VisitCounter.max() == {}
+
+
+class TestOrigin:
+    def test_covers_only_the_set_coordinates(self):
+        visit_counter = VisitCounter(data={(5_000, 5_001): 2, (5_002, 5_000): 1})
+        assert visit_counter.origin == (5_000, 5_000)
+        assert visit_counter.shape == (3, 2)
+        assert visit_counter[(5_000, 5_001)] == 2
+        assert visit_counter[(0, 0)] == 0
+        assert visit_counter == {(5_000, 5_001): 2, (5_002, 5_000): 1}
+
+    def test_grows_towards_the_origin(self):
+        visit_counter = VisitCounter()
+        visit_counter[(10, 10)] = 1
+        visit_counter[(8, 12)] = 2
+        assert visit_counter.origin == (8, 10)
+        assert visit_counter.shape == (3, 3)
+        assert visit_counter.data == {(8, 12): 2, (10, 10): 1}
+
+    def test_combines_different_origins(self):
+        near = VisitCounter(data={(0, 0): 1})
+        far = VisitCounter(data={(100, 100): 3})
+        assert VisitCounter.sum(near, far) == {(0, 0): 1, (100, 100): 3}
+        assert VisitCounter() + far == {(100, 100): 3}
+        assert VisitCounter.max(far, VisitCounter(data={(100, 100): 5})) == {
+            (100, 100): 5
+        }
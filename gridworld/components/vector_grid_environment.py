@@ -0,0 +1,145 @@
+"""
+VectorGridWorldEnv: step many gridworld episodes in lockstep.
+
+Running one GridWorldEnv per Python loop iteration is bound by interpreter overhead, not by
+the simulation. This environment holds B independent episodes ("slots") as NumPy arrays
+and advances all of them with a handful of array operations per step:
+
+- Every slot plays one of the given layouts (the same maze, or a mix of mazes).
+- The transition tables of all layouts are concatenated, so a slot's state is an index
+  into one shared table and a step for all B slots is a single gather.
+- Slots that finish (goal reached or ``max_steps`` hit) are reset to their start state
+  automatically, so callers can keep stepping forever.
+
+States and actions are integers: a state is ``row * cols + col`` for the slot's layout and
+an action is an index into ``SIMPLE_ACTIONS``.
+
+Example usage:
+    env = VectorGridWorldEnv([GridLayout.from_entries(maze)], num_envs=1024)
+    states = env.reset()
+    result = env.step(rng.integers(0, 4, size=env.num_envs))
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.components.array_grid_environment import GridLayout, compile_transitions
+from gridworld.components.grid_environment import STEP_RESULT_REWARD
+from gridworld.utils import SIMPLE_ACTIONS
+
+
+@dataclass
+class VectorStepResult:
+    """
+    Per slot results of a step. ``new_states`` are the states the actions led to, before
+    finished slots were reset, so they can be used directly for TD updates.
+
+    ``episode_rewards`` and ``episode_steps`` are only meaningful where ``dones`` is set.
+    """
+
+    new_states: NDArray[np.int64]
+    rewards: NDArray[np.float64]
+    dones: NDArray[np.bool_]
+    reached_goal: NDArray[np.bool_]
+    episode_rewards: NDArray[np.float64]
+    episode_steps: NDArray[np.int64]
+
+
+class VectorGridWorldEnv:
+    def __init__(
+        self,
+        layouts: Sequence[GridLayout],
+        *,
+        num_envs: int,
+        max_steps: int = 100,
+        reward_config: Mapping[str, float] | None = None,
+    ) -> None:
+        if not layouts:
+            raise ValueError("At least one layout is required.")
+
+        self.layouts = list(layouts)
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.reward_config = reward_config or STEP_RESULT_REWARD
+
+        # concatenate the per layout tables, shifting next states into the global range
+        offsets: list[int] = []
+        next_states: list[NDArray[np.int64]] = []
+        rewards: list[NDArray[np.float64]] = []
+        reaches_goal: list[NDArray[np.bool_]] = []
+        offset = 0
+        for layout in self.layouts:
+            table = compile_transitions(layout, self.reward_config)
+            offsets.append(offset)
+            next_states.append(table.next_states + offset)
+            rewards.append(table.rewards)
+            reaches_goal.append(table.reaches_goal)
+            offset += layout.rows * layout.cols
+        self._next_states = np.concatenate(next_states).ravel()
+        self._rewards = np.concatenate(rewards).ravel()
+        self._reaches_goal = np.concatenate(reaches_goal).ravel()
+
+        # slot i plays layout i % len(layouts)
+        self.layout_ids = np.arange(num_envs) % len(self.layouts)
+        layout_offsets = np.array(offsets, dtype=np.int64)
+        layout_starts = np.array(
+            [layout.start[0] * layout.cols + layout.start[1] for layout in self.layouts]
+        )
+        layout_cols = np.array([layout.cols for layout in self.layouts])
+        self._offsets = layout_offsets[self.layout_ids]
+        self._starts = self._offsets + layout_starts[self.layout_ids]
+        self.cols = layout_cols[self.layout_ids]
+
+        self._states = self._starts.copy()
+        self.current_steps = np.zeros(num_envs, dtype=np.int64)
+        self.total_rewards = np.zeros(num_envs, dtype=np.float64)
+
+    @property
+    def states(self) -> NDArray[np.int64]:
+        """The current state of every slot, after any automatic resets."""
+        return self._states - self._offsets
+
+    def to_positions(
+        self, states: NDArray[np.int64]
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Split per slot states into ``(rows, cols)`` arrays."""
+        return np.divmod(states, self.cols)
+
+    def reset(self) -> NDArray[np.int64]:
+        self._states = self._starts.copy()
+        self.current_steps[:] = 0
+        self.total_rewards[:] = 0
+        return self.states
+
+    def step(self, actions: NDArray[np.integer]) -> VectorStepResult:
+        if actions.shape != (self.num_envs,):
+            raise ValueError(
+                f"Expected {self.num_envs} actions, got array of shape {actions.shape}."
+            )
+        if np.any((actions < 0) | (actions >= len(SIMPLE_ACTIONS))):
+            raise ValueError(f"Invalid actions: {actions}")
+
+        transitions = self._states * len(SIMPLE_ACTIONS) + actions
+        new_states = self._next_states[transitions]
+        rewards = self._rewards[transitions]
+        reached_goal = self._reaches_goal[transitions]
+
+        self.current_steps += 1
+        self.total_rewards += rewards
+        dones = reached_goal | (self.current_steps >= self.max_steps)
+        result = VectorStepResult(
+            new_states=new_states - self._offsets,
+            rewards=rewards,
+            dones=dones,
+            reached_goal=reached_goal,
+            episode_rewards=self.total_rewards.copy(),
+            episode_steps=self.current_steps.copy(),
+        )
+
+        self._states = np.where(dones, self._starts, new_states)
+        self.current_steps[dones] = 0
+        self.total_rewards[dones] = 0
+        return result
@@ -0,0 +1,263 @@
+"""
+Exact evaluation of a trained agent's policy, without running episodes.
+
+Scoring an agent by running more episodes gives a noisy estimate from one start state.
+A maze is deterministic and an epsilon greedy agent's choices have fixed probabilities,
+so the agent and the maze together are a Markov chain over the cells, and its expected
+behaviour can be solved for directly:
+
+- ``agent_policy`` turns a QLearningAgent's table into the probability of each action in
+  every state, as its ``act`` chooses them: a uniformly random action with probability
+  epsilon, otherwise one of the best actions, ties split evenly. A FrozenPolicy always
+  takes its one action.
+- ``evaluate`` builds the chain from ``compile_transitions`` and returns, for every start
+  state, the expected discounted return, the probability of ever reaching the goal and
+  the expected number of steps, as a PolicyEvaluation.
+
+Without ``max_steps`` the episode never times out and each quantity is one dense
+``np.linalg.solve`` over the ``rows * cols`` states, so keep to grids of a few thousand
+cells. With ``max_steps`` the evaluation matches the environments, which end an episode
+after ``max_steps`` steps. It then works backwards one step at a time, with vectorized
+updates that also suit large grids.
+
+Example usage:
+    layout = GridLayout.from_env(env)
+    evaluation = evaluate_agent(agent, layout, max_steps=env.max_steps)
+    evaluation.at(layout.start).goal_probability
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.components.array_grid_environment import (
+    GridLayout,
+    TransitionTable,
+    compile_transitions,
+)
+from gridworld.components.grid_environment import STEP_RESULT_REWARD
+from gridworld.utils import SIMPLE_ACTIONS
+
+# the most states the dense solve takes on, (I - P) is states x states float64
+MAX_DENSE_STATES = 5_000
+
+
+class StateEvaluation(NamedTuple):
+    expected_return: float
+    goal_probability: float
+    expected_steps: float
+
+
+class PolicyEvaluation(NamedTuple):
+    layout: GridLayout
+    gamma: float
+    max_steps: int | None
+    # (rows * cols, len(SIMPLE_ACTIONS)) probability of each action in each state
+    policy: NDArray[np.float64]
+    # the following are by flat start state
+    expected_return: NDArray[np.float64]
+    goal_probability: NDArray[np.float64]
+    # inf where the episode can go on forever, which needs max_steps to be None
+    expected_steps: NDArray[np.float64]
+
+    def at(self, state: tuple[int, int]) -> StateEvaluation:
+        index = state[0] * self.layout.cols + state[1]
+        return StateEvaluation(
+            expected_return=float(self.expected_return[index]),
+            goal_probability=float(self.goal_probability[index]),
+            expected_steps=float(self.expected_steps[index]),
+        )
+
+
+def greedy_policy(q_values: NDArray[np.float64], epsilon: float) -> NDArray[np.float64]:
+    """
+    The action probabilities of acting epsilon greedily on ``q_values``, with ties
+    between the best actions split evenly.
+    """
+    best = q_values == q_values.max(axis=1, keepdims=True)
+    greedy = best / best.sum(axis=1, keepdims=True)
+    return (1 - epsilon) * greedy + epsilon / q_values.shape[1]
+
+
+def agent_policy(
+    agent: QLearningAgent | FrozenPolicy,
+    layout: GridLayout,
+    *,
+    epsilon: float | None = None,
+) -> NDArray[np.float64]:
+    """
+    How ``agent`` acts in each state of ``layout``, in ``SIMPLE_ACTIONS`` order.
+    ``epsilon`` defaults to the agent's own, pass 0 for its greedy policy. States missing
+    from a dict table count as all zero, so every action is equally likely there.
+    """
+    if isinstance(agent, FrozenPolicy):
+        return np.eye(len(SIMPLE_ACTIONS))[agent.action_indices]
+
+    q_values = DenseQTable.of(agent.q_table, rows=layout.rows, cols=layout.cols).values
+    return greedy_policy(q_values, agent.epsilon if epsilon is None else epsilon)
+
+
+def _can_reach(
+    successors: NDArray[np.int64], edges: NDArray[np.bool_], targets: NDArray[np.bool_]
+) -> NDArray[np.bool_]:
+    """The states with a path to ``targets`` along the ``edges`` the policy can take."""
+    predecessors: list[list[int]] = [[] for _ in range(len(successors))]
+    for state, next_state in zip(*np.nonzero(edges)):
+        predecessors[int(successors[state, next_state])].append(int(state))
+    reached = targets.copy()
+    queue = deque(np.flatnonzero(targets).tolist())
+    while queue:
+        for state in predecessors[queue.popleft()]:
+            if not reached[state]:
+                reached[state] = True
+                queue.append(state)
+    return reached
+
+
+def _solve_infinite(
+    transitions: TransitionTable, policy: NDArray[np.float64], gamma: float
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    states = len(policy)
+    if states > MAX_DENSE_STATES:
+        raise ValueError(
+            f"{states} states is too many for a dense solve, pass max_steps to "
+            f"evaluate a finite horizon instead."
+        )
+    reaches_goal = transitions.reaches_goal
+    continues = ~reaches_goal & (policy > 0)
+    # chance of moving from each state to each other without ending the episode
+    chain = np.zeros((states, states), dtype=np.float64)
+    rows = np.broadcast_to(np.arange(states)[:, None], policy.shape)
+    np.add.at(
+        chain,
+        (rows[continues], transitions.next_states[continues]),
+        policy[continues],
+    )
+    identity = np.eye(states)
+
+    rewards = (policy * transitions.rewards).sum(axis=1)
+    expected_return = np.zeros(states, dtype=np.float64)
+    expected_return[:] = np.linalg.solve(identity - gamma * chain, rewards)
+
+    # the goal can only be reached from states with a path to it, elsewhere it is 0.
+    # Every state left has a chance of never coming back, so the system is solvable.
+    goal_now = (policy * reaches_goal).sum(axis=1)
+    hopeful = _can_reach(transitions.next_states, continues, goal_now > 0)
+    goal_probability = np.zeros(states, dtype=np.float64)
+    goal_probability[hopeful] = np.linalg.solve(
+        identity[np.ix_(hopeful, hopeful)] - chain[np.ix_(hopeful, hopeful)],
+        goal_now[hopeful],
+    )
+    # the solve can land a rounding error above 1
+    np.clip(goal_probability, 0.0, 1.0, out=goal_probability)
+
+    # an episode only has a finite expected length if it is sure to reach the goal
+    certain = goal_probability > 1 - 1e-9
+    expected_steps = np.full(states, np.inf)
+    expected_steps[certain] = np.linalg.solve(
+        identity[np.ix_(certain, certain)] - chain[np.ix_(certain, certain)],
+        np.ones(int(certain.sum())),
+    )
+    return expected_return, goal_probability, expected_steps
+
+
+def _solve_finite(
+    transitions: TransitionTable,
+    policy: NDArray[np.float64],
+    gamma: float,
+    max_steps: int,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    # one row per action, see value_iteration in gridworld/solver.py
+    successors = np.ascontiguousarray(transitions.next_states.T)
+    # the chance of each action that does not end the episode
+    moving = np.ascontiguousarray((policy * ~transitions.reaches_goal).T)
+    rewards = (policy * transitions.rewards).sum(axis=1)
+    goal_now = (policy * transitions.reaches_goal).sum(axis=1)
+
+    # with k steps left, from every state
+    expected_return = np.zeros(len(policy), dtype=np.float64)
+    goal_probability = np.zeros(len(policy), dtype=np.float64)
+    expected_steps = np.zeros(len(policy), dtype=np.float64)
+    for _ in range(max_steps):
+        expected_return = rewards + gamma * (moving * expected_return[successors]).sum(
+            axis=0
+        )
+        goal_probability = goal_now + (moving * goal_probability[successors]).sum(
+            axis=0
+        )
+        expected_steps = 1 + (moving * expected_steps[successors]).sum(axis=0)
+    return expected_return, goal_probability, expected_steps
+
+
+def evaluate(
+    policy: NDArray[np.float64],
+    layout: GridLayout,
+    *,
+    gamma: float = 0.9,
+    max_steps: int | None = None,
+    reward_config: Mapping[str, float] = STEP_RESULT_REWARD,
+) -> PolicyEvaluation:
+    """
+    The expected return, goal probability and episode length of ``policy`` from every
+    state of ``layout``. ``policy`` holds the probability of each action in each state,
+    as ``agent_policy`` returns it.
+    """
+    if not 0 <= gamma < 1 and max_steps is None:
+        raise ValueError(f"gamma must be in [0, 1) without max_steps, got {gamma}.")
+    expected_shape = (layout.rows * layout.cols, len(SIMPLE_ACTIONS))
+    if policy.shape != expected_shape:
+        raise ValueError(
+            f"Expected a policy of shape {expected_shape}, got {policy.shape}."
+        )
+
+    transitions = compile_transitions(layout, reward_config)
+    if max_steps is None:
+        results = _solve_infinite(transitions, policy, gamma)
+    else:
+        results = _solve_finite(transitions, policy, gamma, max_steps)
+    expected_return, goal_probability, expected_steps = results
+
+    # reaching the goal ends the episode, so an episode cannot start there
+    goal = layout.goal[0] * layout.cols + layout.goal[1]
+    expected_return[goal] = 0.0
+    goal_probability[goal] = 1.0
+    expected_steps[goal] = 0.0
+    return PolicyEvaluation(
+        layout=layout,
+        gamma=gamma,
+        max_steps=max_steps,
+        policy=policy,
+        expected_return=expected_return,
+        goal_probability=goal_probability,
+        expected_steps=expected_steps,
+    )
+
+
+def evaluate_agent(
+    agent: QLearningAgent | FrozenPolicy,
+    layout: GridLayout,
+    *,
+    epsilon: float | None = None,
+    gamma: float | None = None,
+    max_steps: int | None = None,
+    reward_config: Mapping[str, float] = STEP_RESULT_REWARD,
+) -> PolicyEvaluation:
+    """
+    ``evaluate`` on ``agent_policy``. ``gamma`` defaults to the agent's own, or 0.9 for
+    a FrozenPolicy.
+    """
+    if gamma is None:
+        gamma = agent.gamma if isinstance(agent, QLearningAgent) else 0.9
+    return evaluate(
+        agent_policy(agent, layout, epsilon=epsilon),
+        layout,
+        gamma=gamma,
+        max_steps=max_steps,
+        reward_config=reward_config,
+    )
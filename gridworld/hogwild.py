@@ -0,0 +1,120 @@
+"""
+Hogwild training: several processes training one QLearningAgent.
+
+``train_hogwild`` publishes the maze with SharedMaze and creates one SharedQTable, then
+starts ``workers`` processes. Each worker attaches an ArrayGridWorldEnv to the shared
+maze and a dense QLearningAgent to the shared Q-table, and runs its own episodes through
+``Runner.run_episodes_fast``. Every TD update is written straight into the shared array
+without a lock. Two workers can race on the same (state, action) and one update is then
+lost, but updates are small and spread over the whole table, so learning barely notices
+(the "Hogwild!" argument) and no worker ever waits for another.
+
+The parent collects each worker's ``EpisodeStats`` and returns an agent holding a copy of
+the final table.
+
+Example usage:
+    maze = RecursiveBacktracking(rows=20, cols=20).run()
+    result = train_hogwild(GridLayout.from_entries(maze), workers=4, episodes=200)
+    result.agent.q_table  # trained on 800 episodes
+    result.stats[0].reached_goal  # per episode, for the first worker
+"""
+
+import multiprocessing
+from dataclasses import dataclass
+from random import Random
+from typing import NamedTuple
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.shared_q_table import SharedQTable, SharedQTableHandle
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.shared_maze import SharedMaze, SharedMazeHandle
+from gridworld.runner import EpisodeStats, Runner
+
+
+@dataclass(frozen=True)
+class HogwildTask:
+    maze: SharedMazeHandle
+    q_table: SharedQTableHandle
+    episodes: int
+    max_steps: int
+    epsilon: float
+    alpha: float
+    gamma: float
+    seed: int
+
+
+class HogwildResult(NamedTuple):
+    agent: QLearningAgent
+    # one entry per worker, in worker order
+    stats: list[EpisodeStats]
+
+
+def run_worker(task: HogwildTask) -> EpisodeStats:
+    maze = SharedMaze.attach(task.maze)
+    shared = SharedQTable.attach(task.q_table)
+    agent = QLearningAgent(
+        rng=Random(task.seed),
+        backend="dense",
+        rows=task.q_table.rows,
+        cols=task.q_table.cols,
+    )
+    agent.q_table = shared.table
+    agent.epsilon = task.epsilon
+    agent.alpha = task.alpha
+    agent.gamma = task.gamma
+
+    runner = Runner(maze.env(max_steps=task.max_steps), agent)
+    stats = runner.run_episodes_fast(task.episodes)
+
+    # drop every view into the blocks before detaching from them
+    del runner, agent
+    shared.close()
+    maze.close()
+    return stats
+
+
+def train_hogwild(
+    layout: GridLayout,
+    *,
+    workers: int = 4,
+    episodes: int = 100,
+    max_steps: int = 100,
+    epsilon: float = 0.1,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    seed: int | None = None,
+) -> HogwildResult:
+    """
+    Train one agent on ``layout`` with ``workers`` processes running ``episodes``
+    episodes each. The workers' random choices are seeded from ``seed``, but the order
+    their updates land in is not, so runs are not exactly repeatable.
+    """
+    seeds = Random(seed)
+    tasks: list[HogwildTask] = []
+    with SharedMaze.publish(layout) as maze, SharedQTable.create(
+        layout.rows, layout.cols
+    ) as shared:
+        for _ in range(workers):
+            tasks.append(
+                HogwildTask(
+                    maze=maze.handle,
+                    q_table=shared.handle,
+                    episodes=episodes,
+                    max_steps=max_steps,
+                    epsilon=epsilon,
+                    alpha=alpha,
+                    gamma=gamma,
+                    seed=seeds.getrandbits(64),
+                )
+            )
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers) as pool:
+            stats = pool.map(run_worker, tasks, chunksize=1)
+        q_table = shared.copy()
+
+    agent = QLearningAgent(backend="dense", rows=layout.rows, cols=layout.cols)
+    agent.q_table = q_table
+    agent.epsilon = epsilon
+    agent.alpha = alpha
+    agent.gamma = gamma
+    return HogwildResult(agent=agent, stats=stats)
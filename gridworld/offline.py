@@ -0,0 +1,281 @@
+"""
+Offline Q-learning: train a Q-table from logged trajectories, without an environment.
+
+``Runner.run_episodes`` returns every ``Step`` of every episode and
+``Runner.run_episode_fast`` writes them into an EpisodeBuffer. Either can be turned into
+``Transitions``, one set of NumPy columns for a whole dataset:
+
+- ``from_results`` and ``from_trajectories`` take the ``Step`` lists,
+- ``from_buffer`` copies the latest episode out of an EpisodeBuffer,
+- ``from_columns`` takes arrays that are already columnar, like a TrajectoryBatch from
+  gridworld/actor_learner.py, with the length of each episode,
+- ``concatenate`` joins datasets.
+
+``train_offline`` then sweeps the dataset ``epochs`` times in shuffled minibatches,
+applying each minibatch with the vectorized ``DenseQTable.q_learning_update``. With
+``n_steps`` above 1 each transition learns from an n-step return: the discounted rewards
+of the next ``n_steps`` transitions of its episode, then the best q value where it got
+to, so a reward spreads back several steps per update. The return is cut short at the
+first later action that was not greedy, so exploring moves in the data do not drag
+the q values down towards those of a random walk. Which actions are greedy changes as
+the table learns, so the returns are worked out again, in bulk, at every epoch.
+
+The data is logged once and training never touches the environment, so the same
+experience can be replayed cheaply with different ``alpha``, ``gamma`` or ``n_steps``.
+Offline training can only learn about what the logged agent did, so log with enough
+exploration to cover the grid.
+
+Example usage:
+    results = Runner(env, QLearningAgent()).run_episodes(200)
+    transitions = from_results(results, cols=env.cols)
+    agent = train_offline(transitions, rows=env.rows, cols=env.cols, n_steps=3)
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.components.array_grid_environment import ACTION_INDEX
+from gridworld.runner import EpisodeBuffer
+from gridworld.utils import RunnerReturn, Step
+
+
+class Transitions(NamedTuple):
+    """
+    Logged transitions, episode by episode and in order. States are flat
+    ``row * cols + col`` indices and actions are indices into ``SIMPLE_ACTIONS``.
+    """
+
+    states: NDArray[np.int64]
+    actions: NDArray[np.int64]
+    rewards: NDArray[np.float64]
+    next_states: NDArray[np.int64]
+    dones: NDArray[np.bool_]
+    # the episode each transition belongs to, numbered from 0
+    episodes: NDArray[np.int64]
+
+
+class NStepTargets(NamedTuple):
+    """What each transition learns from: ``returns + discounts * max(q[bootstrap])``."""
+
+    states: NDArray[np.int64]
+    actions: NDArray[np.int64]
+    returns: NDArray[np.float64]
+    bootstrap_states: NDArray[np.int64]
+    # the episode ended within the n steps, so there is nothing to bootstrap from
+    dones: NDArray[np.bool_]
+    discounts: NDArray[np.float64]
+
+
+def from_columns(
+    states: NDArray[np.integer],
+    actions: NDArray[np.integer],
+    rewards: NDArray[np.floating],
+    next_states: NDArray[np.integer],
+    dones: NDArray[np.bool_],
+    episode_lengths: Sequence[int] | NDArray[np.integer] | None = None,
+    reached_goal: Sequence[bool] | NDArray[np.bool_] | None = None,
+) -> Transitions:
+    """
+    Transitions from columns of any int and float dtypes. Without ``episode_lengths``
+    the columns are one episode.
+
+    The environments also say an episode is done when it runs out of steps, but the
+    agent could have carried on from there. Pass whether each episode ``reached_goal``
+    and the last transition of the others is kept as not done, so learning still
+    bootstraps from where it got to.
+    """
+    if episode_lengths is None:
+        episode_lengths = [len(states)]
+    lengths = np.asarray(episode_lengths, dtype=np.int64)
+    if lengths.sum() != len(states):
+        raise ValueError(
+            f"The episode lengths add up to {lengths.sum()}, "
+            f"but there are {len(states)} transitions."
+        )
+    dones = np.array(dones, dtype=np.bool_)
+    if reached_goal is not None:
+        last = np.cumsum(lengths) - 1
+        timed_out = ~np.asarray(reached_goal, dtype=np.bool_) & (lengths > 0)
+        dones[last[timed_out]] = False
+    return Transitions(
+        states=np.asarray(states, dtype=np.int64),
+        actions=np.asarray(actions, dtype=np.int64),
+        rewards=np.asarray(rewards, dtype=np.float64),
+        next_states=np.asarray(next_states, dtype=np.int64),
+        dones=dones,
+        episodes=np.repeat(np.arange(len(lengths), dtype=np.int64), lengths),
+    )
+
+
+def from_trajectories(
+    trajectories: Iterable[Sequence[Step]],
+    cols: int,
+    reached_goal: Sequence[bool] | None = None,
+) -> Transitions:
+    """
+    Transitions from one list of ``Step`` per episode. See ``from_columns`` for
+    ``reached_goal``.
+    """
+    steps: list[Step] = []
+    lengths: list[int] = []
+    for trajectory in trajectories:
+        steps.extend(trajectory)
+        lengths.append(len(trajectory))
+    return from_columns(
+        states=np.array(
+            [s.start[0] * cols + s.start[1] for s in steps], dtype=np.int64
+        ),
+        actions=np.array([ACTION_INDEX[s.action] for s in steps], dtype=np.int64),
+        rewards=np.array([s.reward for s in steps], dtype=np.float64),
+        next_states=np.array(
+            [s.new_state[0] * cols + s.new_state[1] for s in steps], dtype=np.int64
+        ),
+        dones=np.array([s.done for s in steps], dtype=np.bool_),
+        episode_lengths=lengths,
+        reached_goal=reached_goal,
+    )
+
+
+def from_results(results: Iterable[RunnerReturn], cols: int) -> Transitions:
+    """Transitions from what ``Runner.run_episodes`` returns."""
+    results = list(results)
+    return from_trajectories(
+        [result["trajectory"] for result in results],
+        cols,
+        reached_goal=[result["reached_goal"] for result in results],
+    )
+
+
+def from_buffer(buffer: EpisodeBuffer) -> Transitions:
+    """A copy of the episode ``Runner.run_episode_fast`` last wrote into ``buffer``."""
+    length = buffer.length
+    return from_columns(
+        states=buffer.states[:length].copy(),
+        actions=buffer.actions[:length],
+        rewards=buffer.rewards[:length].copy(),
+        next_states=buffer.next_states[:length].copy(),
+        dones=buffer.dones[:length],
+        reached_goal=[buffer.reached_goal],
+    )
+
+
+def concatenate(parts: Sequence[Transitions]) -> Transitions:
+    """One dataset holding the episodes of every part, in order."""
+    episodes: list[NDArray[np.int64]] = []
+    first = 0
+    for part in parts:
+        episodes.append(part.episodes + first)
+        if len(part.episodes):
+            first += int(part.episodes[-1]) + 1
+    return Transitions(
+        states=np.concatenate([part.states for part in parts]),
+        actions=np.concatenate([part.actions for part in parts]),
+        rewards=np.concatenate([part.rewards for part in parts]),
+        next_states=np.concatenate([part.next_states for part in parts]),
+        dones=np.concatenate([part.dones for part in parts]),
+        episodes=np.concatenate(episodes),
+    )
+
+
+def n_step_targets(
+    transitions: Transitions,
+    n_steps: int,
+    gamma: float,
+    greedy: NDArray[np.bool_] | None = None,
+) -> NStepTargets:
+    """
+    The n-step return of every transition. Near the end of an episode fewer steps are
+    left, and the return stops there.
+
+    With ``greedy``, whether each logged action is the best one under the current q
+    values, the return also stops before the first later action that is not. Q-learning
+    learns the value of acting greedily, and the rewards after an exploring move say
+    little about that (Watkins's cut).
+    """
+    if n_steps < 1:
+        raise ValueError(f"n_steps must be at least 1, got {n_steps}.")
+    size = len(transitions.states)
+    indices = np.arange(size)
+    # the index of the last transition of each transition's episode
+    episodes = transitions.episodes
+    episode_ends = np.append(np.flatnonzero(np.diff(episodes)), size - 1)
+    ends = episode_ends[np.searchsorted(episode_ends, indices)]
+
+    returns = transitions.rewards.copy()
+    last = indices.copy()
+    following = np.ones(size, dtype=np.bool_)
+    for k in range(1, n_steps):
+        ahead = indices + k
+        following &= ahead <= ends
+        if greedy is not None:
+            following &= greedy[np.minimum(ahead, size - 1)]
+        returns[following] += gamma**k * transitions.rewards[ahead[following]]
+        last[following] = ahead[following]
+    return NStepTargets(
+        states=transitions.states,
+        actions=transitions.actions,
+        returns=returns,
+        bootstrap_states=transitions.next_states[last],
+        dones=transitions.dones[last],
+        discounts=gamma ** (last - indices + 1).astype(np.float64),
+    )
+
+
+def train_offline(
+    transitions: Transitions,
+    *,
+    rows: int,
+    cols: int,
+    epochs: int = 20,
+    batch_size: int = 256,
+    n_steps: int = 1,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    q_table: DenseQTable | None = None,
+    rng: np.random.Generator | None = None,
+) -> QLearningAgent:
+    """
+    A dense QLearningAgent trained on ``transitions``. Pass ``q_table`` to carry on
+    training an existing table, it is updated in place. With ``n_steps`` above 1 the
+    returns are cut with the q values at the start of each epoch, see
+    ``n_step_targets``.
+    """
+    rng = rng or np.random.default_rng()
+    if q_table is None:
+        q_table = DenseQTable(rows, cols)
+    q_table.seen[transitions.states] = True
+    q_table.seen[transitions.next_states[~transitions.dones]] = True
+    values = q_table.values
+    targets = n_step_targets(transitions, n_steps, gamma)
+
+    for _ in range(epochs):
+        if n_steps > 1:
+            # cut the returns where the logged agent stopped acting greedily
+            q_values = values[transitions.states]
+            greedy = q_values[
+                np.arange(len(q_values)), transitions.actions
+            ] == q_values.max(axis=1)
+            targets = n_step_targets(transitions, n_steps, gamma, greedy)
+        order = rng.permutation(len(targets.states))
+        for first in range(0, len(order), batch_size):
+            batch = order[first : first + batch_size]
+            q_table.q_learning_update(
+                targets.states[batch],
+                targets.actions[batch],
+                targets.returns[batch],
+                targets.bootstrap_states[batch],
+                targets.dones[batch],
+                alpha=alpha,
+                gamma=targets.discounts[batch],
+            )
+
+    agent = QLearningAgent(backend="dense", rows=rows, cols=cols)
+    agent.q_table = q_table
+    agent.alpha = alpha
+    agent.gamma = gamma
+    return agent
@@ -0,0 +1,243 @@
+"""
+Headless episode recording and replay.
+
+``Runner.run_episode(render=True)`` draws every step while the episode runs, which slows
+the simulation down to the speed of the console. Instead, pass an ``EpisodeRecorder`` to
+the runner: it only stores each episode as a seed, the id of the maze it was played on and
+an int8 array of action indices, so episodes run at full speed. Mazes are stored once per
+recording, keyed by ``GridLayout.fingerprint()``. The maze of each environment is read
+and fingerprinted once, then reused for its later episodes while its layout (or, for a
+ProceduralGridWorldEnv, its generation settings) stays the same. The cells of a
+GridWorldEnv can be edited in place, call ``forget(env)`` after changing its walls or
+obstacles so the next episode reads them again.
+
+Because the environments are deterministic, any recorded episode can be rebuilt later, one
+frame at a time or straight at a given step, without re-running the agent:
+
+    recorder = EpisodeRecorder(seed=42)
+    Runner(env, agent).run_episodes(100, recorder=recorder)
+    recorder.save("output/run.npz")
+
+    python3 -m gridworld.replay output/run.npz --episode 3 --step 10
+"""
+
+import time
+import weakref
+from collections.abc import Hashable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.components.array_grid_environment import (
+    ACTION_INDEX,
+    ArrayGridWorldEnv,
+    GridLayout,
+)
+from gridworld.components.grid_environment import GridWorldEnv, console
+from gridworld.components.procedural_grid_environment import ProceduralGridWorldEnv
+from gridworld.utils import SIMPLE_ACTIONS
+
+# stored in place of a missing seed, since the seeds are saved as an int array
+NO_SEED = -1
+
+
+@dataclass
+class EpisodeRecord:
+    seed: int | None
+    maze_id: str
+    max_steps: int
+    actions: NDArray[np.int8]
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+
+Env = GridWorldEnv | ArrayGridWorldEnv | ProceduralGridWorldEnv
+
+
+def _layout_version(env: Env) -> Hashable:
+    """What the recorded maze of ``env`` depends on, cheap to compare every episode."""
+    if isinstance(env, ArrayGridWorldEnv):
+        # GridLayout compares by identity
+        return env.layout
+    if isinstance(env, ProceduralGridWorldEnv):
+        return (
+            env.seed,
+            env.rows,
+            env.cols,
+            env.obstacle_density,
+            env.wall_density,
+            env.chunk_size,
+            env.start,
+            env.goal,
+        )
+    return (env.rows, env.cols, env.start, env.goal)
+
+
+class EpisodeRecorder:
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        ``seed`` is stored with every episode, e.g. the seed of the maze generator or of
+        the agent's rng, so a run can be traced back to how it was produced.
+        """
+        self.seed = seed
+        self.mazes: dict[str, GridLayout] = {}
+        self.episodes: list[EpisodeRecord] = []
+        self._actions: list[int] = []
+        self._maze_id: str | None = None
+        self._max_steps = 0
+        # the layout version and maze id of every environment recorded so far
+        self._env_mazes: weakref.WeakKeyDictionary[Env, tuple[Hashable, str]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _maze_id_of(self, env: Env) -> str:
+        version = _layout_version(env)
+        cached = self._env_mazes.get(env)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if isinstance(env, ProceduralGridWorldEnv):
+            # recordings are replayed on an ArrayGridWorldEnv, so the world has to be small
+            layout = env.to_layout()
+        else:
+            layout = GridLayout.from_env(env)
+        maze_id = layout.fingerprint()
+        self.mazes.setdefault(maze_id, layout)
+        self._env_mazes[env] = (version, maze_id)
+        return maze_id
+
+    def forget(self, env: Env) -> None:
+        """Read the maze of ``env`` again at its next episode, after editing its cells."""
+        self._env_mazes.pop(env, None)
+
+    def start(self, env: Env) -> None:
+        self._maze_id = self._maze_id_of(env)
+        self._max_steps = env.max_steps
+        self._actions = []
+
+    def record(self, action: str) -> None:
+        self._actions.append(ACTION_INDEX[action])
+
+    def finish(self) -> EpisodeRecord:
+        if self._maze_id is None:
+            raise RuntimeError("start() must be called before finish().")
+        episode = EpisodeRecord(
+            seed=self.seed,
+            maze_id=self._maze_id,
+            max_steps=self._max_steps,
+            actions=np.array(self._actions, dtype=np.int8),
+        )
+        self.episodes.append(episode)
+        self._maze_id = None
+        return episode
+
+    def save(self, path: str) -> None:
+        arrays: dict[str, NDArray[np.generic]] = {}
+        for maze_id, layout in self.mazes.items():
+            arrays[f"maze_{maze_id}_walls"] = layout.walls
+            arrays[f"maze_{maze_id}_obstacles"] = layout.obstacles
+            arrays[f"maze_{maze_id}_start_goal"] = np.array(
+                [*layout.start, *layout.goal], dtype=np.int64
+            )
+
+        lengths = [len(episode) for episode in self.episodes]
+        arrays["episode_offsets"] = np.concatenate([[0], np.cumsum(lengths)]).astype(
+            np.int64
+        )
+        arrays["episode_seeds"] = np.array(
+            [NO_SEED if e.seed is None else e.seed for e in self.episodes],
+            dtype=np.int64,
+        )
+        arrays["episode_maze_ids"] = np.array([e.maze_id for e in self.episodes])
+        arrays["episode_max_steps"] = np.array(
+            [e.max_steps for e in self.episodes], dtype=np.int64
+        )
+        arrays["actions"] = np.concatenate(
+            [np.zeros(0, dtype=np.int8)] + [e.actions for e in self.episodes]
+        )
+        np.savez_compressed(path, allow_pickle=False, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "EpisodeRecorder":
+        recorder = cls()
+        with np.load(path) as data:
+            for key in data.files:
+                if key.startswith("maze_") and key.endswith("_start_goal"):
+                    maze_id = key[len("maze_") : -len("_start_goal")]
+                    start_row, start_col, goal_row, goal_col = data[key].tolist()
+                    recorder.mazes[maze_id] = GridLayout(
+                        walls=data[f"maze_{maze_id}_walls"],
+                        obstacles=data[f"maze_{maze_id}_obstacles"],
+                        start=(start_row, start_col),
+                        goal=(goal_row, goal_col),
+                    )
+
+            offsets = data["episode_offsets"].tolist()
+            actions = data["actions"]
+            for i, (seed, maze_id, max_steps) in enumerate(
+                zip(
+                    data["episode_seeds"].tolist(),
+                    data["episode_maze_ids"].tolist(),
+                    data["episode_max_steps"].tolist(),
+                )
+            ):
+                recorder.episodes.append(
+                    EpisodeRecord(
+                        seed=None if seed == NO_SEED else seed,
+                        maze_id=maze_id,
+                        max_steps=max_steps,
+                        actions=actions[offsets[i] : offsets[i + 1]],
+                    )
+                )
+        return recorder
+
+    def frames(self, episode: int) -> Iterator[ArrayGridWorldEnv]:
+        """
+        Replay an episode, yielding the environment before the first action and after
+        every action. The same environment object is yielded each time.
+        """
+        record = self.episodes[episode]
+        env = ArrayGridWorldEnv(
+            layout=self.mazes[record.maze_id], max_steps=record.max_steps
+        )
+        env.reset()
+        yield env
+        actions: list[int] = record.actions.tolist()
+        for action in actions:
+            env.step(SIMPLE_ACTIONS[action])
+            yield env
+
+    def env_at(self, episode: int, step: int) -> ArrayGridWorldEnv:
+        """The environment of an episode as it was after ``step`` actions."""
+        if not 0 <= step <= len(self.episodes[episode]):
+            raise ValueError(
+                f"Episode {episode} has {len(self.episodes[episode])} steps, "
+                f"cannot jump to step {step}."
+            )
+        for current_step, env in enumerate(self.frames(episode)):
+            if current_step == step:
+                return env
+        raise AssertionError("unreachable")
+
+    def replay(
+        self,
+        episode: int,
+        *,
+        step: int | None = None,
+        clear_render: bool = False,
+        sleep: float = 0.5,
+    ) -> None:
+        """
+        Render an episode frame by frame, or only the frame at ``step`` when it is given.
+        """
+        if step is not None:
+            self.env_at(episode, step).render()
+            return
+
+        for env in self.frames(episode):
+            if clear_render:
+                console.clear()
+            env.render()
+            time.sleep(sleep)
@@ -0,0 +1,43 @@
+"""
+Re-render an episode saved by an ``EpisodeRecorder``.
+
+    python3 -m gridworld.replay output/run.npz --episode 3
+    python3 -m gridworld.replay output/run.npz --episode 3 --step 10
+"""
+
+import argparse
+
+from gridworld.components.grid_environment import console
+from gridworld.recorder import EpisodeRecorder
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-render a recorded episode.")
+    parser.add_argument("path", help="the .npz file written by EpisodeRecorder.save")
+    parser.add_argument("--episode", type=int, default=0)
+    parser.add_argument(
+        "--step", type=int, default=None, help="only render the frame at this step"
+    )
+    parser.add_argument("--sleep", type=float, default=0.5)
+    parser.add_argument("--clear", action="store_true", help="clear between frames")
+    parser.add_argument(
+        "--list", action="store_true", help="list the recorded episodes and exit"
+    )
+    args = parser.parse_args(argv)
+
+    recorder = EpisodeRecorder.load(args.path)
+    if args.list:
+        for i, episode in enumerate(recorder.episodes):
+            console.print(
+                f"{i}: maze {episode.maze_id}, seed {episode.seed}, "
+                f"{len(episode)} steps"
+            )
+        return
+
+    recorder.replay(
+        args.episode, step=args.step, clear_render=args.clear, sleep=args.sleep
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,77 @@
 import os
 import shutil
 import time
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
 from gridworld.agents.manhattan_agent import ManhattanAgent
 from gridworld.agents.generic_agent import Agent
+from gridworld.components.array_grid_environment import (
+    ACTION_INDEX,
+    ArrayGridWorldEnv,
+)
 from gridworld.components.grid_environment import GridWorldEnv, StepResult
+from gridworld.components.procedural_grid_environment import ProceduralGridWorldEnv
 from rich.console import Console
 
 from gridworld.components.maze_builders import (
     RecursiveBacktracking,
     SparseObstacleMazeGenerator,
 )
-from gridworld.utils import RunnerReturn, Step, render_heatmap
-
+from gridworld.recorder import EpisodeRecorder
+from gridworld.stopping import StoppingCriterion
+from gridworld.utils import SIMPLE_ACTIONS, RunnerReturn, Step, render_heatmap
 
 console = Console()
 
 
+class EpisodeBuffer:
+    """
+    Preallocated arrays that ``Runner.run_episode_fast`` writes an episode into. The
+    same buffer is reused for every episode, so only the first ``length`` entries belong
+    to the latest one. States are flat ``row * cols + col`` indices and actions are
+    indices into ``SIMPLE_ACTIONS``.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+        self.length = 0
+        self.total_reward = 0.0
+        self.reached_goal = False
+
+    def to_steps(self, cols: int) -> list[Step]:
+        """The episode as ``Step`` objects, for debugging and tests."""
+        return [
+            Step(
+                start=divmod(int(self.states[i]), cols),
+                action=SIMPLE_ACTIONS[self.actions[i]],
+                reward=float(self.rewards[i]),
+                new_state=divmod(int(self.next_states[i]), cols),
+                done=bool(self.dones[i]),
+            )
+            for i in range(self.length)
+        ]
+
+
+class EpisodeStats(NamedTuple):
+    total_rewards: NDArray[np.float64]
+    steps: NDArray[np.int64]
+    reached_goal: NDArray[np.bool_]
+
+
 class Runner:
-    def __init__(self, env: GridWorldEnv, agent: Agent):
+    def __init__(
+        self,
+        env: GridWorldEnv | ArrayGridWorldEnv | ProceduralGridWorldEnv,
+        agent: Agent,
+    ):
         self.env = env
         self.agent = agent
 
@@ -27,6 +81,7 @@ class Runner:
         render: bool = False,
         clear_render: bool = False,
         sleep: float = 0.5,
+        recorder: EpisodeRecorder | None = None,
     ) -> RunnerReturn:
         """Run the environment until the agent reaches a terminal state.
 
@@ -38,6 +93,9 @@ class Runner:
             Clear the console between renders to produce an animation effect.
         sleep : float, optional
             Seconds to pause between renders.
+        recorder : EpisodeRecorder, optional
+            Store the episode's maze and actions so it can be replayed later
+            without rendering while it runs.
 
         Returns
         -------
@@ -51,6 +109,8 @@ class Runner:
         self.agent.reset()
         done = False
         state = self.env.get_state()
+        if recorder is not None:
+            recorder.start(self.env)
 
         while not self.env.done:
             if clear_render:
@@ -60,6 +120,8 @@ class Runner:
 
             action = self.agent.act(state)
             step_data: StepResult = self.env.step(action)
+            if recorder is not None:
+                recorder.record(action)
             new_state = step_data.new_state
             reward = step_data.reward
             done = step_data.done
@@ -76,6 +138,8 @@ class Runner:
             state = new_state
             if render:
                 time.sleep(sleep)
+        if recorder is not None:
+            recorder.finish()
         if render:
             if clear_render:
                 console.clear()
@@ -105,15 +169,108 @@ class Runner:
         render: bool = False,
         clear_render: bool = False,
         sleep: float = 0.5,
+        recorder: EpisodeRecorder | None = None,
+        stop_when: StoppingCriterion | None = None,
     ) -> list[RunnerReturn]:
+        """
+        Run up to ``num_episodes`` episodes. With ``stop_when``, stop early after the
+        episode that meets it, see ``gridworld.stopping``.
+        """
         results: list[RunnerReturn] = []
         for _ in range(num_episodes):
             result = self.run_episode(
-                render=render, clear_render=clear_render, sleep=sleep
+                render=render,
+                clear_render=clear_render,
+                sleep=sleep,
+                recorder=recorder,
             )
             results.append(result)
+            if stop_when is not None and stop_when.update(
+                self.agent, result["reached_goal"]
+            ):
+                break
         return results
 
+    def run_episode_fast(self, buffer: EpisodeBuffer | None = None) -> EpisodeBuffer:
+        """Run an episode without building a ``Step`` or ``StepResult`` per step.
+
+        The agent is told about each step through ``observe_transition`` and the
+        episode is written into ``buffer``, which is reused between calls. Use
+        ``run_episode`` when you need the trajectory and visit counts as objects.
+        """
+        env = self.env
+        if buffer is None:
+            buffer = EpisodeBuffer(env.max_steps)
+        elif buffer.capacity < env.max_steps:
+            raise ValueError(
+                f"Buffer holds {buffer.capacity} steps, the environment allows "
+                f"{env.max_steps}."
+            )
+
+        env.reset()
+        self.agent.reset()
+        state = env.get_state()
+        done = env.done
+
+        act = self.agent.act
+        observe = self.agent.observe_transition
+        step = env.fast_step
+        action_index = ACTION_INDEX.__getitem__
+        cols = env.cols
+        # memoryviews take python scalars much faster than ndarray item assignment
+        states = buffer.states.data
+        actions = buffer.actions.data
+        rewards = buffer.rewards.data.cast("B").cast("d")
+        next_states = buffer.next_states.data
+        dones = buffer.dones.data
+
+        length = 0
+        while not done:
+            action = act(state)
+            new_state, reward, done = step(action)
+            observe(state, action, reward, new_state, done)
+
+            states[length] = state[0] * cols + state[1]
+            actions[length] = action_index(action)
+            rewards[length] = reward
+            next_states[length] = new_state[0] * cols + new_state[1]
+            dones[length] = done
+            length += 1
+            state = new_state
+
+        buffer.length = length
+        buffer.total_reward = env.total_reward
+        buffer.reached_goal = env.reached_goal
+        return buffer
+
+    def run_episodes_fast(
+        self, num_episodes: int, stop_when: StoppingCriterion | None = None
+    ) -> EpisodeStats:
+        """
+        ``run_episodes`` through ``run_episode_fast``, sharing one buffer. When
+        ``stop_when`` ends the run early, the stats only cover the episodes run.
+        """
+        stats = EpisodeStats(
+            total_rewards=np.zeros(num_episodes, dtype=np.float64),
+            steps=np.zeros(num_episodes, dtype=np.int64),
+            reached_goal=np.zeros(num_episodes, dtype=np.bool_),
+        )
+        buffer = EpisodeBuffer(self.env.max_steps)
+        for i in range(num_episodes):
+            self.run_episode_fast(buffer)
+            stats.total_rewards[i] = buffer.total_reward
+            stats.steps[i] = buffer.length
+            stats.reached_goal[i] = buffer.reached_goal
+            if stop_when is not None and stop_when.update(
+                self.agent, buffer.reached_goal
+            ):
+                return EpisodeStats(
+                    total_rewards=stats.total_rewards[: i + 1],
+                    steps=stats.steps[: i + 1],
+                    reached_goal=stats.reached_goal[: i + 1],
+                )
+        return stats
+
     def analyze_results(
         self, results: list[RunnerReturn]
     ) -> dict[str, dict[str, float]]:
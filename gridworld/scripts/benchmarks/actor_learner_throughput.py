@@ -0,0 +1,75 @@
+import os
+import random
+import shutil
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.actor_learner import train_actor_learner
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.maze_builders import RecursiveBacktracking
+
+console = Console()
+
+folder = "output/gridworld-actor-learner-throughput"
+output_file = f"{folder}/output.md"
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 10
+MAX_STEPS = 1_000
+EPISODES_PER_ACTOR = 400
+EPISODES_PER_BATCH = 5
+ACTORS = [1, 2, 4, 8]
+
+
+if __name__ == "__main__":
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    try:
+        mkdir(folder)
+    except FileExistsError:
+        pass
+
+    layout = GridLayout.from_entries(
+        RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+    )
+
+    log(
+        f"{EPISODES_PER_ACTOR} episodes per actor in batches of {EPISODES_PER_BATCH} "
+        f"on a {SIZE}x{SIZE} RecursiveBacktracking maze ({os.cpu_count()} cores)\n"
+    )
+    log(
+        "| Actors | Wall time (s) | Actor steps / s | Learner updates / s "
+        "| Mean queue lag (ms) | Mean policy lag (versions) | Final goal % |"
+    )
+    log(
+        "|--------|---------------|-----------------|---------------------"
+        "|---------------------|----------------------------|--------------|"
+    )
+    for actors in ACTORS:
+        result = train_actor_learner(
+            layout,
+            actors=actors,
+            episodes=EPISODES_PER_ACTOR,
+            episodes_per_batch=EPISODES_PER_BATCH,
+            max_steps=MAX_STEPS,
+            seed=0,
+        )
+        pipeline = result.pipeline
+        final = len(result.stats.reached_goal) // 10
+        log(
+            f"| {actors} | {pipeline.wall_time:.2f} "
+            f"| {pipeline.actor_steps_per_second:,.0f} "
+            f"| {pipeline.learner_updates_per_second:,.0f} "
+            f"| {pipeline.mean_queue_lag * 1000:.1f} "
+            f"| {pipeline.mean_policy_lag:.1f} "
+            f"| {result.stats.reached_goal[-final:].mean() * 100:.1f}% |"
+        )
@@ -0,0 +1,92 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.maze_builders import SparseObstacleMazeGenerator
+from gridworld.evaluation import evaluate_agent
+from gridworld.runner import Runner
+
+console = Console()
+
+folder = "output/gridworld-analytic-evaluation"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZES = [10, 20, 30]
+TRAINING_EPISODES = 300
+# how many evaluation episodes the scripts usually run
+ROLLOUTS = [10, 50]
+# repeats of each rollout evaluation, to see how much it varies
+REPEATS = 20
+
+
+log(
+    f"Evaluating a Q-learning agent (epsilon still on, learning off) after "
+    f"{TRAINING_EPISODES} episodes on SparseObstacleMazeGenerator mazes. Rollout "
+    f"results are the mean and standard deviation over {REPEATS} repeats.\n"
+)
+log("| Size | Method | Time (ms) | Goal % | Avg steps |")
+log("|------|--------|-----------|--------|-----------|")
+for size in SIZES:
+    layout = GridLayout.from_entries(
+        SparseObstacleMazeGenerator(rows=size, cols=size, rng=random.Random(0)).run()
+    )
+    env = ArrayGridWorldEnv(layout=layout, max_steps=size * size)
+    agent = QLearningAgent(rng=random.Random(0), backend="dense", rows=size, cols=size)
+    Runner(env, agent).run_episodes_fast(TRAINING_EPISODES)
+    agent.alpha = 0.0
+
+    start = time.perf_counter()
+    evaluation = evaluate_agent(agent, layout, max_steps=env.max_steps)
+    elapsed = time.perf_counter() - start
+    exact = evaluation.at(layout.start)
+    log(
+        f"| {size} | Analytic | {elapsed * 1000:.1f} "
+        f"| {exact.goal_probability * 100:.1f}% | {exact.expected_steps:.1f} |"
+    )
+
+    # the same, if episodes never ran out of steps
+    start = time.perf_counter()
+    unlimited = evaluate_agent(agent, layout).at(layout.start)
+    elapsed = time.perf_counter() - start
+    log(
+        f"| {size} | Analytic, no step limit | {elapsed * 1000:.1f} "
+        f"| {unlimited.goal_probability * 100:.1f}% | {unlimited.expected_steps:.1f} |"
+    )
+
+    for rollouts in ROLLOUTS:
+        goal_rates: list[float] = []
+        steps: list[float] = []
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            stats = Runner(env, agent).run_episodes_fast(rollouts)
+            goal_rates.append(float(stats.reached_goal.mean()))
+            steps.append(float(stats.steps.mean()))
+        elapsed = (time.perf_counter() - start) / REPEATS
+        log(
+            f"| {size} | {rollouts} rollouts | {elapsed * 1000:.1f} "
+            f"| {np.mean(goal_rates) * 100:.1f}% ± {np.std(goal_rates) * 100:.1f} "
+            f"| {np.mean(steps):.1f} ± {np.std(steps):.1f} |"
+        )
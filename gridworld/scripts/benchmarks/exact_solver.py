@@ -0,0 +1,93 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.agents.a_star_agent import AStarAgent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.maze_builders import (
+    RecursiveBacktracking,
+    SparseObstacleMazeGenerator,
+)
+from gridworld.runner import Runner
+from gridworld.solver import policy_iteration, score_agent, value_iteration
+
+console = Console()
+
+folder = "output/gridworld-exact-solver"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZES = [10, 25, 50, 100]
+GENERATORS = [RecursiveBacktracking, SparseObstacleMazeGenerator]
+# close to 1, so the goal still stands out at the far end of a long maze
+GAMMA = 0.99
+# the Q-learning agent the solution is compared with
+EPISODES = 200
+
+
+log(
+    f"Exact solutions with gamma {GAMMA}, compared with A* and with a Q-learning agent "
+    f"trained for {EPISODES} episodes\n"
+)
+log(
+    "| Maze | Size | Value iteration (ms) | Sweeps | Policy iteration (ms) "
+    "| Improvements | Optimal steps | A* steps | Q-learning time (s) "
+    "| Q-learning optimal actions |"
+)
+log(
+    "|------|------|----------------------|--------|-----------------------"
+    "|--------------|---------------|----------|---------------------"
+    "|----------------------------|"
+)
+for generator in GENERATORS:
+    for size in SIZES:
+        maze = generator(rows=size, cols=size, rng=random.Random(0)).run()
+        layout = GridLayout.from_entries(maze)
+        env = ArrayGridWorldEnv(grid=maze, max_steps=10 * size * size)
+
+        start = time.perf_counter()
+        solution = value_iteration(layout, gamma=GAMMA)
+        value_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        policy_solution = policy_iteration(layout, gamma=GAMMA)
+        policy_time = time.perf_counter() - start
+
+        optimal = Runner(env, solution.policy()).run_episode_fast()
+        a_star_steps = len(AStarAgent(layout).plan(layout.start))
+
+        agent = QLearningAgent(
+            rng=random.Random(0), backend="dense", rows=size, cols=size
+        )
+        agent.gamma = GAMMA
+        start = time.perf_counter()
+        Runner(env, agent).run_episodes_fast(EPISODES)
+        q_learning_time = time.perf_counter() - start
+        score = score_agent(agent, solution)
+
+        log(
+            f"| {generator.__name__} | {size} | {value_time * 1000:.1f} "
+            f"| {solution.iterations} | {policy_time * 1000:.1f} "
+            f"| {policy_solution.iterations} | {optimal.length} | {a_star_steps} "
+            f"| {q_learning_time:.2f} | {score.optimal_actions * 100:.1f}% |"
+        )
@@ -0,0 +1,71 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.hogwild import train_hogwild
+
+console = Console()
+
+folder = "output/gridworld-hogwild-training"
+output_file = f"{folder}/output.md"
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 20
+MAX_STEPS = 2_000
+# the same number of episodes is split between the workers
+TOTAL_EPISODES = 1_600
+WORKERS = [1, 2, 4, 8]
+
+
+if __name__ == "__main__":
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    try:
+        mkdir(folder)
+    except FileExistsError:
+        pass
+
+    layout = GridLayout.from_entries(
+        RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+    )
+
+    log(
+        f"{TOTAL_EPISODES} Q-learning episodes on a {SIZE}x{SIZE} RecursiveBacktracking "
+        f"maze, split between workers sharing one Q-table ({os.cpu_count()} cores)\n"
+    )
+    log("| Workers | Wall time (s) | Env steps / s | Final goal % | Final avg steps |")
+    log("|---------|---------------|---------------|--------------|-----------------|")
+    for workers in WORKERS:
+        start = time.perf_counter()
+        result = train_hogwild(
+            layout,
+            workers=workers,
+            episodes=TOTAL_EPISODES // workers,
+            max_steps=MAX_STEPS,
+            seed=0,
+        )
+        elapsed = time.perf_counter() - start
+        total_steps = sum(int(np.sum(stats.steps)) for stats in result.stats)
+        # the last 10% of every worker's episodes
+        final = len(result.stats[0].steps) // 10
+        reached_goal = np.concatenate([s.reached_goal[-final:] for s in result.stats])
+        steps = np.concatenate([s.steps[-final:] for s in result.stats])
+        log(
+            f"| {workers} | {elapsed:.2f} | {total_steps / elapsed:,.0f} "
+            f"| {reached_goal.mean() * 100:.1f}% | {steps.mean():.1f} |"
+        )
@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import sys
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.tile_coding_agent import TileCodingAgent
+from gridworld.components.procedural_grid_environment import ProceduralGridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import SIMPLE_ACTIONS
+
+console = Console()
+
+folder = "output/gridworld-linear-agent-scaling"
+output_file = f"{folder}/output.md"
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZES = [25, 50, 100, 200, 400]
+EPISODES = 30
+# the last episodes, used for the final goal % and steps
+FINAL_EPISODES = 5
+
+
+def agent_bytes(agent: Agent) -> int:
+    if isinstance(agent, TileCodingAgent):
+        return agent.weights.nbytes
+    assert isinstance(agent, QLearningAgent)
+    # the dict of visited states, plus one dict of q values per state
+    q_table = agent.q_table
+    return sys.getsizeof(q_table) + sum(
+        sys.getsizeof(state) + sys.getsizeof(q_values)
+        for state, q_values in q_table.items()
+    )
+
+
+if __name__ == "__main__":
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    try:
+        mkdir(folder)
+    except FileExistsError:
+        pass
+
+    log(
+        f"{EPISODES} episodes on open ProceduralGridWorldEnv grids (no obstacles or "
+        f"walls), from the top left corner to the bottom right. A dense Q-table would "
+        f"need rows x cols x {len(SIMPLE_ACTIONS)} float64 values.\n"
+    )
+    log(
+        "| Size | Agent | Memory (KiB) | Wall time (s) | First goal (episode) "
+        "| Final goal % | Final avg steps | Shortest path |"
+    )
+    log(
+        "|------|-------|--------------|---------------|----------------------"
+        "|--------------|-----------------|---------------|"
+    )
+    for size in SIZES:
+        for name in ["Q-table", "Tile coding"]:
+            env = ProceduralGridWorldEnv(
+                rows=size,
+                cols=size,
+                max_steps=50 * size,
+                obstacle_density=0,
+                wall_density=0,
+            )
+            if name == "Q-table":
+                agent: Agent = QLearningAgent(rng=random.Random(0))
+            else:
+                agent = TileCodingAgent(goal=env.goal, rng=random.Random(0))
+
+            start = time.perf_counter()
+            stats = Runner(env, agent).run_episodes_fast(EPISODES)
+            elapsed = time.perf_counter() - start
+
+            reached = np.flatnonzero(stats.reached_goal)
+            first_goal = str(reached[0] + 1) if len(reached) else "never"
+            log(
+                f"| {size} | {name} | {agent_bytes(agent) / 1024:,.0f} | {elapsed:.2f} "
+                f"| {first_goal} "
+                f"| {stats.reached_goal[-FINAL_EPISODES:].mean() * 100:.0f}% "
+                f"| {stats.steps[-FINAL_EPISODES:].mean():.0f} | {2 * (size - 1)} |"
+            )
@@ -0,0 +1,98 @@
+import os
+import random
+import shutil
+import sys
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.agents.memmap_q_table import MemmapQTable
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.procedural_grid_environment import ProceduralGridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import SIMPLE_ACTIONS
+
+console = Console()
+
+folder = "output/gridworld-memmap-q-table"
+output_file = f"{folder}/output.md"
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 10_000
+EPISODES = 10
+MAX_STEPS = 20_000
+PAGE_SIZE = 4_096
+CACHE_PAGES = [4, 32, 256]
+
+
+def dict_bytes(q_table: Any) -> int:
+    # the dict of visited states, plus one dict of q values per state
+    return sys.getsizeof(q_table) + sum(
+        sys.getsizeof(state) + sys.getsizeof(q_values)
+        for state, q_values in q_table.items()
+    )
+
+
+if __name__ == "__main__":
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    try:
+        mkdir(folder)
+    except FileExistsError:
+        pass
+
+    dense_bytes = SIZE * SIZE * len(SIMPLE_ACTIONS) * 8
+    log(
+        f"{EPISODES} episodes of up to {MAX_STEPS:,} steps on a {SIZE:,}x{SIZE:,} "
+        f"ProceduralGridWorldEnv. A DenseQTable would need {dense_bytes / 2**30:.1f} "
+        f"GiB. The memmap table uses pages of {PAGE_SIZE:,} states, its memory is the "
+        f"cached pages and its disk is the blocks actually written to the sparse "
+        f"file.\n"
+    )
+    log(
+        "| Q-table | Memory (MiB) | Disk (MiB) | Steps/s | States | Page faults "
+        "| Write-backs | Hit rate |"
+    )
+    log(
+        "|---------|--------------|------------|---------|--------|-------------"
+        "|-------------|----------|"
+    )
+    for cache_pages in [None, *CACHE_PAGES]:
+        env = ProceduralGridWorldEnv(rows=SIZE, cols=SIZE, max_steps=MAX_STEPS)
+        agent = QLearningAgent(rng=random.Random(0))
+        q_table = None
+        if cache_pages is not None:
+            q_table = MemmapQTable(
+                SIZE, SIZE, page_size=PAGE_SIZE, cache_pages=cache_pages
+            )
+            agent.q_table = q_table
+
+        start = time.perf_counter()
+        stats = Runner(env, agent).run_episodes_fast(EPISODES)
+        elapsed = time.perf_counter() - start
+        steps_per_second = stats.steps.sum() / elapsed
+
+        if q_table is None:
+            log(
+                f"| dict | {dict_bytes(agent.q_table) / 2**20:,.1f} | - "
+                f"| {steps_per_second:,.0f} | {len(agent.q_table):,} | - | - | - |"
+            )
+            continue
+        q_table.flush()
+        disk_bytes = os.stat(q_table.path).st_blocks * 512
+        log(
+            f"| memmap, {cache_pages} pages | {q_table.cached_bytes / 2**20:,.1f} "
+            f"| {disk_bytes / 2**20:,.1f} | {steps_per_second:,.0f} "
+            f"| {len(q_table):,} | {q_table.stats.page_faults:,} "
+            f"| {q_table.stats.write_backs:,} | {q_table.stats.hit_rate:.2%} |"
+        )
+        q_table.close()
@@ -0,0 +1,89 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.offline import concatenate, from_buffer, train_offline
+from gridworld.runner import Runner
+
+console = Console()
+
+folder = "output/gridworld-offline-hyperparameters"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 15
+MAX_STEPS = 500
+EPISODES = 300
+# the logging agent explores more than usual, so the data covers more of the maze
+LOGGING_EPSILON = 0.1
+EPOCHS = [1, 3, 10]
+ALPHAS = [0.1, 0.5]
+N_STEPS = [1, 3, 10]
+
+
+maze = RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+env = ArrayGridWorldEnv(grid=maze, max_steps=MAX_STEPS)
+
+logging_agent = QLearningAgent(
+    rng=random.Random(0), backend="dense", rows=SIZE, cols=SIZE
+)
+logging_agent.epsilon = LOGGING_EPSILON
+runner = Runner(env, logging_agent)
+start = time.perf_counter()
+episodes = []
+for _ in range(EPISODES):
+    episodes.append(from_buffer(runner.run_episode_fast()))
+transitions = concatenate(episodes)
+logging_time = time.perf_counter() - start
+
+log(
+    f"{EPISODES} episodes logged from an online Q-learning agent (epsilon "
+    f"{LOGGING_EPSILON}) on a {SIZE}x{SIZE} RecursiveBacktracking maze: "
+    f"{len(transitions.states):,} transitions in {logging_time:.2f}s\n"
+)
+log("Offline training, then one greedy episode\n")
+log("| alpha | n steps | Epochs | Training time (s) | Greedy steps to goal |")
+log("|-------|---------|--------|-------------------|----------------------|")
+for alpha in ALPHAS:
+    for n_steps in N_STEPS:
+        for epochs in EPOCHS:
+            start = time.perf_counter()
+            agent = train_offline(
+                transitions,
+                rows=SIZE,
+                cols=SIZE,
+                epochs=epochs,
+                n_steps=n_steps,
+                alpha=alpha,
+                rng=np.random.default_rng(0),
+            )
+            elapsed = time.perf_counter() - start
+            buffer = Runner(env, FrozenPolicy.from_agent(agent)).run_episode_fast()
+            log(
+                f"| {alpha} | {n_steps} | {epochs} | {elapsed:.2f} "
+                f"| {buffer.length if buffer.reached_goal else 'not reached'} |"
+            )
@@ -0,0 +1,82 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.replay_buffer import ReplayBuffer
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+
+console = Console()
+
+folder = "output/gridworld-replay-convergence"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 15
+MAX_STEPS = 500
+EPISODES = 300
+REPLAY_UPDATES = [0, 1, 4, 16]
+# converged once this many episodes in a row reach the goal within 1.5x the best episode
+STREAK = 10
+
+
+def steps_to_converge(steps: np.ndarray, reached_goal: np.ndarray) -> int | None:
+    best = steps[reached_goal].min()
+    good = reached_goal & (steps <= 1.5 * best)
+    for i in range(len(good) - STREAK):
+        if good[i : i + STREAK].all():
+            return int(steps[:i].sum())
+    return None
+
+
+maze = RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+
+log(
+    f"Q-learning for {EPISODES} episodes on a {SIZE}x{SIZE} RecursiveBacktracking maze\n"
+)
+log("| Replay updates per step | Env steps to converge | Wall time (s) |")
+log("|-------------------------|-----------------------|---------------|")
+for replay_updates in REPLAY_UPDATES:
+    replay = (
+        ReplayBuffer(20_000, rng=np.random.default_rng(0)) if replay_updates else None
+    )
+    agent = QLearningAgent(
+        rng=random.Random(0),
+        backend="dense",
+        rows=SIZE,
+        cols=SIZE,
+        replay=replay,
+        replay_updates=replay_updates,
+    )
+    runner = Runner(ArrayGridWorldEnv(grid=maze, max_steps=MAX_STEPS), agent)
+    start = time.perf_counter()
+    stats = runner.run_episodes_fast(EPISODES)
+    elapsed = time.perf_counter() - start
+    converged = steps_to_converge(stats.steps, stats.reached_goal)
+    log(
+        f"| {replay_updates} "
+        f"| {'not converged' if converged is None else f'{converged:,}'} "
+        f"| {elapsed:.2f} |"
+    )
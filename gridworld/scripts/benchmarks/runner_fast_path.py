@@ -0,0 +1,60 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.runner import Runner
+
+console = Console()
+
+folder = "output/gridworld-runner-fast-path"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+EPISODES = 2_000
+MAX_STEPS = 100
+
+
+def run(env: GridWorldEnv | ArrayGridWorldEnv, fast: bool) -> float:
+    runner = Runner(env, QLearningAgent(rng=random.Random(0)))
+    start = time.perf_counter()
+    if fast:
+        steps = int(runner.run_episodes_fast(EPISODES).steps.sum())
+    else:
+        steps = sum(result["steps"] for result in runner.run_episodes(EPISODES))
+    return steps / (time.perf_counter() - start)
+
+
+log(f"Q-learning for {EPISODES} episodes on an empty 5x5 grid\n")
+log("| Environment | run_episodes steps/sec | run_episodes_fast steps/sec | Speedup |")
+log("|-------------|------------------------|-----------------------------|---------|")
+for env_class in [GridWorldEnv, ArrayGridWorldEnv]:
+    rate = run(env_class(max_steps=MAX_STEPS), fast=False)
+    fast_rate = run(env_class(max_steps=MAX_STEPS), fast=True)
+    log(
+        f"| {env_class.__name__} "
+        f"| {rate:,.0f} "
+        f"| {fast_rate:,.0f} "
+        f"| {fast_rate / rate:.1f}x |"
+    )
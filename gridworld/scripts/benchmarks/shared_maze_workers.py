@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import pickle
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.components.shared_maze import SharedMaze, SharedMazeHandle
+
+console = Console()
+
+folder = "output/gridworld-shared-maze-workers"
+output_file = f"{folder}/output.md"
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 80
+WORKERS = 4
+# how many times each worker is handed the maze, like one task per batch of episodes
+TASKS_PER_WORKER = 25
+MAX_STEPS = 200
+
+
+def start_pickled_env(env: GridWorldEnv) -> int:
+    return env.rows
+
+
+def start_shared_env(handle: SharedMazeHandle) -> int:
+    shared = SharedMaze.attach(handle)
+    env = shared.env(max_steps=MAX_STEPS)
+    rows = env.rows
+    del env
+    shared.close()
+    return rows
+
+
+if __name__ == "__main__":
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+    try:
+        mkdir(folder)
+    except FileExistsError:
+        pass
+
+    maze = RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+    env = GridWorldEnv(grid=maze, max_steps=MAX_STEPS)
+    context = multiprocessing.get_context("spawn")
+
+    tasks = WORKERS * TASKS_PER_WORKER
+
+    with context.Pool(WORKERS) as pool:
+        # let the workers finish importing before timing anything
+        pool.map(abs, range(WORKERS))
+        start = time.perf_counter()
+        pool.map(start_pickled_env, [env] * tasks, chunksize=1)
+        pickled_time = time.perf_counter() - start
+
+    with SharedMaze.publish(GridLayout.from_entries(maze)) as shared:
+        with context.Pool(WORKERS) as pool:
+            pool.map(abs, range(WORKERS))
+            start = time.perf_counter()
+            pool.map(start_shared_env, [shared.handle] * tasks, chunksize=1)
+            shared_time = time.perf_counter() - start
+        handle_size = len(pickle.dumps(shared.handle))
+
+    log(
+        f"{tasks} environment set ups across {WORKERS} workers "
+        f"on a {SIZE}x{SIZE} RecursiveBacktracking maze\n"
+    )
+    log("| Sent to each worker | Pickled bytes | Wall time (s) |")
+    log("|---------------------|---------------|---------------|")
+    log(f"| GridWorldEnv | {len(pickle.dumps(env)):,} | {pickled_time:.2f} |")
+    log(f"| SharedMazeHandle | {handle_size:,} | {shared_time:.2f} |")
@@ -0,0 +1,72 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.utils import SIMPLE_ACTIONS
+
+console = Console()
+
+folder = "output/gridworld-step-throughput"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZES = [5, 50, 200]
+STEPS = 20_000
+# GridWorldEnv is O(rows * cols) per step, so cap how long one measurement may take
+SECONDS_PER_RUN = 3.0
+
+
+def steps_per_second(
+    env: GridWorldEnv | ArrayGridWorldEnv, actions: list[str]
+) -> float:
+    env.reset()
+    steps = 0
+    start = time.perf_counter()
+    for action in actions:
+        if env.done:
+            env.reset()
+        env.step(action)
+        steps += 1
+        if steps % 100 == 0 and time.perf_counter() - start > SECONDS_PER_RUN:
+            break
+    return steps / (time.perf_counter() - start)
+
+
+rng = random.Random(0)
+actions = [rng.choice(SIMPLE_ACTIONS) for _ in range(STEPS)]
+
+log("| Grid | GridWorldEnv steps/sec | ArrayGridWorldEnv steps/sec | Speedup |")
+log("|------|------------------------|-----------------------------|---------|")
+for size in SIZES:
+    # the agent should wander rather than finish, so episodes are long
+    grid_env = GridWorldEnv(rows=size, cols=size, max_steps=STEPS)
+    array_env = ArrayGridWorldEnv(rows=size, cols=size, max_steps=STEPS)
+    grid_rate = steps_per_second(grid_env, actions)
+    array_rate = steps_per_second(array_env, actions)
+    log(
+        f"| {size}x{size} "
+        f"| {grid_rate:,.0f} "
+        f"| {array_rate:,.0f} "
+        f"| {array_rate / grid_rate:.1f}x |"
+    )
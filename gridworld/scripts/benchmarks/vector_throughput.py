@@ -0,0 +1,123 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.components.vector_grid_environment import VectorGridWorldEnv
+from gridworld.runner import Runner
+from gridworld.utils import SIMPLE_ACTIONS
+
+console = Console()
+
+folder = "output/gridworld-vector-throughput"
+output_file = f"{folder}/output.md"
+
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+SIZE = 10
+MAX_STEPS = 100
+EPISODES = 200
+NUM_ENVS = [64, 1024, 4096]
+VECTOR_STEPS = 2_000
+
+# the same hyper parameters as QLearningAgent
+EPSILON = 0.1
+ALPHA = 0.1
+GAMMA = 0.9
+
+
+def run_agent(env: GridWorldEnv | ArrayGridWorldEnv) -> tuple[float, float]:
+    runner = Runner(env, QLearningAgent(rng=random.Random(0)))
+    start = time.perf_counter()
+    results = runner.run_episodes(EPISODES)
+    elapsed = time.perf_counter() - start
+    steps = sum(result["steps"] for result in results)
+    goals = sum(result["reached_goal"] for result in results[-50:])
+    return steps / elapsed, goals / 50 * 100
+
+
+def run_vectorized(layout: GridLayout, num_envs: int) -> tuple[float, float]:
+    """Epsilon greedy Q-learning with one table shared by every slot."""
+    env = VectorGridWorldEnv([layout], num_envs=num_envs, max_steps=MAX_STEPS)
+    rng = np.random.default_rng(0)
+    q_table = np.zeros((layout.rows * layout.cols, len(SIMPLE_ACTIONS)))
+    finished = 0
+    goals = 0
+
+    states = env.reset()
+    start = time.perf_counter()
+    for _ in range(VECTOR_STEPS):
+        # a little noise breaks ties between equal q values at random
+        noise = rng.random((num_envs, len(SIMPLE_ACTIONS))) * 1e-9
+        greedy = np.argmax(q_table[states] + noise, axis=1)
+        explore = rng.random(num_envs) < EPSILON
+        random_actions = rng.integers(0, len(SIMPLE_ACTIONS), size=num_envs)
+        actions = np.where(explore, random_actions, greedy)
+
+        result = env.step(actions)
+        best_future_q = np.where(
+            result.dones, 0.0, q_table[result.new_states].max(axis=1)
+        )
+        current_q = q_table[states, actions]
+        updates = ALPHA * (result.rewards + GAMMA * best_future_q - current_q)
+        # many slots can update the same (state, action), apply the mean of their updates
+        transitions = states * len(SIMPLE_ACTIONS) + actions
+        totals = np.bincount(transitions, weights=updates, minlength=q_table.size)
+        counts = np.bincount(transitions, minlength=q_table.size)
+        q_table += (totals / np.maximum(counts, 1)).reshape(q_table.shape)
+
+        finished += int(result.dones.sum())
+        goals += int(result.reached_goal.sum())
+        states = env.states
+    elapsed = time.perf_counter() - start
+    return VECTOR_STEPS * num_envs / elapsed, goals / max(finished, 1) * 100
+
+
+maze = RecursiveBacktracking(rows=SIZE, cols=SIZE, rng=random.Random(0)).run()
+layout = GridLayout.from_entries(maze)
+
+agent_rate, agent_goal_rate = run_agent(GridWorldEnv(grid=maze, max_steps=MAX_STEPS))
+array_rate, array_goal_rate = run_agent(
+    ArrayGridWorldEnv(layout=layout, max_steps=MAX_STEPS)
+)
+log(f"Q-learning on a {SIZE}x{SIZE} RecursiveBacktracking maze\n")
+log("| Setup | Steps/sec | Goal % | Speedup |")
+log("|-------|-----------|--------|---------|")
+log(
+    f"| Runner + QLearningAgent + GridWorldEnv "
+    f"| {agent_rate:,.0f} | {agent_goal_rate:.1f}% | 1.0x |"
+)
+log(
+    f"| Runner + QLearningAgent + ArrayGridWorldEnv "
+    f"| {array_rate:,.0f} | {array_goal_rate:.1f}% | {array_rate / agent_rate:.1f}x |"
+)
+for num_envs in NUM_ENVS:
+    rate, goal_rate = run_vectorized(layout, num_envs)
+    log(
+        f"| VectorGridWorldEnv x{num_envs} "
+        f"| {rate:,.0f} "
+        f"| {goal_rate:.1f}% "
+        f"| {rate / agent_rate:.1f}x |"
+    )
@@ -12,6 +12,7 @@ from gridworld.utils import (
 )
 
 from gridworld.runner import Runner
+from gridworld.stopping import GoalRatePlateau, StoppingCriterion
 
 console = Console()
 
@@ -50,9 +51,17 @@ NUMBER_OF_EPISODES_PER_ITERATION = 10
 TOTAL_ITERATIONS = 10
 
 
-def run_test(env: GridWorldEnv, agent: Agent, iteration: int, render: bool = False):
+def run_test(
+    env: GridWorldEnv,
+    agent: Agent,
+    iteration: int,
+    render: bool = False,
+    stop_when: StoppingCriterion | None = None,
+):
     runner = Runner(env, agent)
-    results = runner.run_episodes(NUMBER_OF_EPISODES_PER_ITERATION, render=False)
+    results = runner.run_episodes(
+        NUMBER_OF_EPISODES_PER_ITERATION, render=False, stop_when=stop_when
+    )
     analysis = runner.analyze_results(results)
     return Summary(
         current_iterations=len(results),
@@ -144,8 +153,15 @@ def run_env(rows: int, cols: int) -> list[Summary]:
     summaries = []
     env = GridWorldEnv(rows=rows, cols=cols)
     agent = QLearningAgent()
-    for i in range(10):
-        summaries.append(run_test(env, agent, iteration=i, render=False))
+    # stop once the goal rate levels off rather than always running TOTAL_ITERATIONS
+    stop_when = GoalRatePlateau(window=NUMBER_OF_EPISODES_PER_ITERATION)
+    for i in range(TOTAL_ITERATIONS):
+        summaries.append(
+            run_test(env, agent, iteration=i, render=False, stop_when=stop_when)
+        )
+        if stop_when.converged_at is not None:
+            log(f"Converged after {stop_when.converged_at} episodes")
+            break
     write_summary_table(
         summaries=summaries,
     )
@@ -182,6 +198,11 @@ def cross_summary_table(
     log()
 
 
+def padded(values: list[float]) -> list[float]:
+    # runs that converged early have fewer iterations, matplotlib skips the nan points
+    return values + [float("nan")] * (TOTAL_ITERATIONS - len(values))
+
+
 def write_cross_summary_charts(
     summary_by_grid_sizes: dict[int, list[Summary]],
 ) -> None:
@@ -199,15 +220,15 @@ def write_cross_summary_charts(
     y_values_reached_goal = {}
 
     for grid_size in grid_sizes:
-        y_values_rewards[f"{grid_size} grid"] = [
-            summary.avg_reward for summary in summary_by_grid_sizes[grid_size]
-        ]
-        y_values_steps[grid_size] = [
-            summary.avg_steps for summary in summary_by_grid_sizes[grid_size]
-        ]
-        y_values_reached_goal[grid_size] = [
-            summary.reached_goal_count for summary in summary_by_grid_sizes[grid_size]
-        ]
+        y_values_rewards[f"{grid_size} grid"] = padded(
+            [summary.avg_reward for summary in summary_by_grid_sizes[grid_size]]
+        )
+        y_values_steps[grid_size] = padded(
+            [summary.avg_steps for summary in summary_by_grid_sizes[grid_size]]
+        )
+        y_values_reached_goal[grid_size] = padded(
+            [summary.reached_goal_count for summary in summary_by_grid_sizes[grid_size]]
+        )
 
     line_plot(
         x_values=x_values,
@@ -12,6 +12,7 @@ from gridworld.utils import (
 )
 
 from gridworld.runner import Runner
+from gridworld.stopping import GoalRatePlateau, StoppingCriterion
 
 console = Console()
 
@@ -50,9 +51,17 @@ NUMBER_OF_EPISODES_PER_ITERATION = 10
 TOTAL_ITERATIONS = 10
 
 
-def run_test(env: GridWorldEnv, agent: Agent, iteration: int, render: bool = False):
+def run_test(
+    env: GridWorldEnv,
+    agent: Agent,
+    iteration: int,
+    render: bool = False,
+    stop_when: StoppingCriterion | None = None,
+):
     runner = Runner(env, agent)
-    results = runner.run_episodes(NUMBER_OF_EPISODES_PER_ITERATION, render=False)
+    results = runner.run_episodes(
+        NUMBER_OF_EPISODES_PER_ITERATION, render=False, stop_when=stop_when
+    )
     analysis = runner.analyze_results(results)
     return Summary(
         current_iterations=len(results),
@@ -144,8 +153,15 @@ def run_env(max_steps: int) -> list[Summary]:
     summaries = []
     env = GridWorldEnv(max_steps=max_steps)
     agent = QLearningAgent()
-    for i in range(10):
-        summaries.append(run_test(env, agent, iteration=i, render=False))
+    # stop once the goal rate levels off rather than always running TOTAL_ITERATIONS
+    stop_when = GoalRatePlateau(window=NUMBER_OF_EPISODES_PER_ITERATION)
+    for i in range(TOTAL_ITERATIONS):
+        summaries.append(
+            run_test(env, agent, iteration=i, render=False, stop_when=stop_when)
+        )
+        if stop_when.converged_at is not None:
+            log(f"Converged after {stop_when.converged_at} episodes")
+            break
     write_summary_table(
         summaries=summaries,
         steps=max_steps,
@@ -184,6 +200,11 @@ def cross_summary_table(
         log()
 
 
+def padded(values: list[float]) -> list[float]:
+    # runs that converged early have fewer iterations, matplotlib skips the nan points
+    return values + [float("nan")] * (TOTAL_ITERATIONS - len(values))
+
+
 def write_cross_summary_charts(
     summaries_by_steps: dict[int, list[Summary]],
     steps: list[int],
@@ -201,15 +222,15 @@ def write_cross_summary_charts(
     y_values_reached_goal = {}
 
     for step in steps:
-        y_values_rewards[f"{step} steps"] = [
-            summary.avg_reward for summary in summaries_by_steps[step]
-        ]
-        y_values_steps[step] = [
-            summary.avg_steps for summary in summaries_by_steps[step]
-        ]
-        y_values_reached_goal[step] = [
-            summary.reached_goal_count for summary in summaries_by_steps[step]
-        ]
+        y_values_rewards[f"{step} steps"] = padded(
+            [summary.avg_reward for summary in summaries_by_steps[step]]
+        )
+        y_values_steps[step] = padded(
+            [summary.avg_steps for summary in summaries_by_steps[step]]
+        )
+        y_values_reached_goal[step] = padded(
+            [summary.reached_goal_count for summary in summaries_by_steps[step]]
+        )
 
     line_plot(
         x_values=x_values,
@@ -1,8 +1,8 @@
-from functools import reduce
 from os import mkdir
 import os
 import shutil
 from typing import Any
+from gridworld.agents.a_star_agent import AStarAgent
 from gridworld.agents.lost_agent import LostAgent
 from gridworld.agents.manhattan_agent import ManhattanAgent
 from gridworld.agents.generic_agent import Agent
@@ -43,7 +43,7 @@ def run_test(env: GridWorldEnv, agent: Agent, render: bool = False):
 
     visit_counts = [result["visit_counts"] for result in results]
     avg_visit_counts = VisitCounter.avg(*visit_counts)
-    total_visit_counts = reduce(lambda x, y: x + y, visit_counts, VisitCounter())
+    total_visit_counts = VisitCounter.sum(*visit_counts)
 
     log(f"Analysis of 10 episodes with {agent.__class__.__name__}:")
     log("Average Reward:", analysis["reward"]["average"])
@@ -73,14 +73,16 @@ def run_test(env: GridWorldEnv, agent: Agent, render: bool = False):
     log()
 
 
+env = GridWorldEnv()
+
 agents = [
     RandomAgent(),
     LostAgent(),
     ManhattanAgent(),
     QLearningAgent(),
+    # the shortest path, as the optimal reference
+    AStarAgent.for_env(env),
 ]
 
-env = GridWorldEnv()
-
 for agent in agents:
     run_test(env, agent, render=False)
@@ -0,0 +1,72 @@
+import os
+import random
+import shutil
+import time
+from os import mkdir
+from typing import Any
+
+from rich.console import Console
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.agents.prioritized_sweeping_agent import PrioritizedSweepingAgent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+
+console = Console()
+
+folder = "output/planning-vs-q-learning"
+output_file = f"{folder}/output.md"
+if os.path.exists(folder):
+    shutil.rmtree(folder)
+
+try:
+    mkdir(folder)
+except FileExistsError:
+    pass
+
+
+def log(*message: Any) -> None:
+    console.print(*message)
+    with open(output_file, "a") as f:
+        f.write(" ".join(str(m) for m in message) + "\n")
+
+
+# the same blocks of episodes as progressive_learning.py
+PER_ITERATION = 5
+MAX_ITERATIONS = 400
+SIZE = 10
+MAZES = 3
+
+
+def time_to_full_goal_rate(env: GridWorldEnv, agent: Agent) -> tuple[int, float]:
+    """Episodes and seconds until a whole block of episodes reaches the goal."""
+    runner = Runner(env, agent)
+    start = time.perf_counter()
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        results = runner.run_episodes(PER_ITERATION)
+        if all(result["reached_goal"] for result in results):
+            return iteration * PER_ITERATION, time.perf_counter() - start
+    return MAX_ITERATIONS * PER_ITERATION, time.perf_counter() - start
+
+
+log(f"Time until {PER_ITERATION} episodes in a row reach the goal")
+log(f"on {SIZE}x{SIZE} RecursiveBacktracking mazes\n")
+log("| Maze | Agent | Episodes | Wall time (s) |")
+log("|------|-------|----------|---------------|")
+for maze_number in range(MAZES):
+    maze = RecursiveBacktracking(
+        rows=SIZE, cols=SIZE, rng=random.Random(maze_number)
+    ).run()
+    for agent in [
+        QLearningAgent(rng=random.Random(0)),
+        PrioritizedSweepingAgent(rng=random.Random(0)),
+    ]:
+        episodes, seconds = time_to_full_goal_rate(
+            GridWorldEnv(grid=maze, max_steps=100), agent
+        )
+        log(
+            f"| {maze_number} | {agent.__class__.__name__} "
+            f"| {episodes} | {seconds:.2f} |"
+        )
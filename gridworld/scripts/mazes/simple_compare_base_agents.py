@@ -2,6 +2,7 @@ from os import mkdir
 import os
 import shutil
 from typing import Any
+from gridworld.agents.a_star_agent import AStarAgent
 from gridworld.agents.lost_agent import LostAgent
 from gridworld.agents.manhattan_agent import ManhattanAgent
 from gridworld.agents.generic_agent import Agent
@@ -68,18 +69,20 @@ def run_test(env: GridWorldEnv, agent: Agent, render: bool = False):
     log()
 
 
+grid = RecursiveBacktracking(
+    rows=5,
+    cols=5,
+)
+env = GridWorldEnv(grid=grid.run(), max_steps=100)
+
 agents = [
     RandomAgent(),
     LostAgent(),
     ManhattanAgent(),
     QLearningAgent(),
+    # the shortest path, as the optimal reference
+    AStarAgent.for_env(env),
 ]
 
-grid = RecursiveBacktracking(
-    rows=5,
-    cols=5,
-)
-env = GridWorldEnv(grid=grid.run(), max_steps=100)
-
 for agent in agents:
     run_test(env, agent, render=False)
@@ -0,0 +1,167 @@
+"""
+Stopping criteria for training runs.
+
+Scripts like ``grid_size.py`` train for a fixed number of episodes even when the agent
+stopped improving long before, which on small grids is most of the run. Pass a criterion
+to ``Runner.run_episodes(stop_when=...)`` (or ``run_episodes_fast``) and the runner stops
+after the episode where it is met. ``criterion.converged_at`` is the number of episodes
+the criterion had seen at that point.
+
+A criterion keeps counting across calls, so a script that trains in blocks of episodes
+can pass the same one to every block and stop once ``converged_at`` is set:
+
+    stop_when = PolicyUnchanged(episodes=20)
+    for _ in range(TOTAL_ITERATIONS):
+        runner.run_episodes(10, stop_when=stop_when)
+        if stop_when.converged_at is not None:
+            break
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gridworld.agents.generic_agent import Agent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+
+QSnapshot = NDArray[np.float64] | dict[tuple[int, int], dict[str, float]]
+Policy = NDArray[np.bool_] | dict[tuple[int, int], frozenset[str]]
+
+
+class StoppingCriterion(ABC):
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.episodes = 0
+        self.converged_at: int | None = None
+
+    def update(self, agent: Agent, reached_goal: bool) -> bool:
+        """Record a finished episode, ``True`` once training should stop."""
+        self.episodes += 1
+        if self.converged_at is None and self.check(agent, reached_goal):
+            self.converged_at = self.episodes
+        return self.converged_at is not None
+
+    @abstractmethod
+    def check(self, agent: Agent, reached_goal: bool) -> bool: ...
+
+
+def _q_learning_agent(agent: Agent) -> QLearningAgent:
+    if not isinstance(agent, QLearningAgent):
+        raise TypeError(
+            f"{agent.__class__.__name__} has no Q-table to check for convergence."
+        )
+    return agent
+
+
+class QTableDelta(StoppingCriterion):
+    def __init__(self, threshold: float = 0.01, episodes: int = 3) -> None:
+        """
+        Stop once no q value has moved by ``threshold`` or more during each of the last
+        ``episodes`` episodes.
+        """
+        self.threshold = threshold
+        self.patience = episodes
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self._previous: QSnapshot = {}
+        self._quiet_episodes = 0
+
+    def check(self, agent: Agent, reached_goal: bool) -> bool:
+        q_table = _q_learning_agent(agent).q_table
+        if isinstance(q_table, DenseQTable):
+            current: QSnapshot = q_table.values.copy()
+            previous = self._previous
+            if isinstance(previous, dict):
+                previous = np.zeros_like(current)
+            delta = float(np.abs(current - previous).max(initial=0.0))
+        else:
+            current = {state: dict(row) for state, row in q_table.items()}
+            previous = self._previous if isinstance(self._previous, dict) else {}
+            delta = 0.0
+            for state, row in current.items():
+                previous_row = previous.get(state, {})
+                for action, value in row.items():
+                    delta = max(delta, abs(value - previous_row.get(action, 0.0)))
+        self._previous = current
+
+        self._quiet_episodes = self._quiet_episodes + 1 if delta < self.threshold else 0
+        return self._quiet_episodes >= self.patience
+
+
+class PolicyUnchanged(StoppingCriterion):
+    def __init__(self, episodes: int = 10) -> None:
+        """
+        Stop once the greedy action of every state has stayed the same for ``episodes``
+        episodes in a row. Tied best actions count as one choice, and states whose
+        actions are all tied, such as ones never visited, have no greedy action.
+        """
+        self.patience = episodes
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self._previous: Policy | None = None
+        self._unchanged_episodes = 0
+
+    def check(self, agent: Agent, reached_goal: bool) -> bool:
+        q_table = _q_learning_agent(agent).q_table
+        current: Policy
+        if isinstance(q_table, DenseQTable):
+            values = q_table.values
+            current = values == values.max(axis=1, keepdims=True)
+        else:
+            current = {}
+            for state, row in q_table.items():
+                best_value = max(row.values())
+                best_actions = frozenset(
+                    action for action, value in row.items() if value == best_value
+                )
+                if len(best_actions) < len(row):
+                    current[state] = best_actions
+
+        previous = self._previous
+        if isinstance(current, np.ndarray) and isinstance(previous, np.ndarray):
+            unchanged = bool(np.array_equal(current, previous))
+        else:
+            unchanged = previous is not None and current == previous
+        self._previous = current
+
+        self._unchanged_episodes = self._unchanged_episodes + 1 if unchanged else 0
+        return self._unchanged_episodes >= self.patience
+
+
+class GoalRatePlateau(StoppingCriterion):
+    def __init__(
+        self, window: int = 20, tolerance: float = 0.05, min_rate: float = 0.9
+    ) -> None:
+        """
+        Stop once the share of episodes reaching the goal over the last ``window``
+        episodes is at least ``min_rate`` and within ``tolerance`` of the share over the
+        ``window`` episodes before those.
+
+        Without ``min_rate`` an agent that never finds the goal would plateau at 0%.
+        """
+        self.window = window
+        self.tolerance = tolerance
+        self.min_rate = min_rate
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self._reached_goal: deque[bool] = deque(maxlen=2 * self.window)
+
+    def check(self, agent: Agent, reached_goal: bool) -> bool:
+        self._reached_goal.append(reached_goal)
+        if len(self._reached_goal) < 2 * self.window:
+            return False
+        history = list(self._reached_goal)
+        previous_rate = sum(history[: self.window]) / self.window
+        rate = sum(history[self.window :]) / self.window
+        return rate >= self.min_rate and abs(rate - previous_rate) <= self.tolerance
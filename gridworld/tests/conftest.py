@@ -0,0 +1,12 @@
+import pytest
+
+from gridworld.components.array_grid_environment import GridLayout
+from gridworld.components.maze_builders import Entry
+
+
+@pytest.fixture
+def corridor() -> GridLayout:
+    # start, then two cells, then the goal
+    return GridLayout.from_entries(
+        [[Entry(start=True), Entry(), Entry(), Entry(goal=True)]]
+    )
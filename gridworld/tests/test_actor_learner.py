@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.actor_learner import SnapshotAgent, train_actor_learner
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.runner import Runner
+from gridworld.utils import Step
+
+
+class TestSnapshotAgent:
+    def test_does_not_learn(self):
+        agent = SnapshotAgent(backend="dense", rows=2, cols=2)
+        agent.observe(Step((0, 0), "right", 100, (0, 1), True))
+        assert not agent.q_table.values.any()
+
+
+class TestTrainActorLearner:
+    def test_learns_from_the_actors(self):
+        layout = GridLayout.from_entries(
+            RecursiveBacktracking(rows=6, cols=6, rng=random.Random(1)).run()
+        )
+
+        result = train_actor_learner(
+            layout, actors=2, episodes=300, episodes_per_batch=5, max_steps=200, seed=0
+        )
+
+        assert len(result.stats.steps) == 600
+        assert result.stats.reached_goal[-20:].all()
+        # one policy version per batch
+        assert result.pipeline.policy_versions == 120
+        assert result.pipeline.mean_policy_lag >= 0
+        assert result.pipeline.max_queue_lag >= result.pipeline.mean_queue_lag >= 0
+        assert result.pipeline.actor_steps_per_second > 0
+
+        agent = result.agent
+        agent.epsilon = 0.0
+        episode = Runner(ArrayGridWorldEnv(layout=layout, max_steps=200), agent)
+        assert episode.run_episode()["reached_goal"]
+        assert np.any(agent.q_table.values)
+
+    def test_needs_an_episode(self):
+        layout = GridLayout.from_entries(
+            RecursiveBacktracking(rows=3, cols=3, rng=random.Random(1)).run()
+        )
+        with pytest.raises(ValueError):
+            train_actor_learner(layout, episodes=0)
+        with pytest.raises(ValueError):
+            train_actor_learner(layout, actors=0)
@@ -0,0 +1,123 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.a_star_agent import AStarAgent
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.maze_builders import SparseObstacleMazeGenerator
+from gridworld.evaluation import (
+    agent_policy,
+    evaluate,
+    evaluate_agent,
+    greedy_policy,
+)
+from gridworld.runner import Runner
+from gridworld.solver import seed_agent, value_iteration
+from gridworld.utils import LEFT, RIGHT, SIMPLE_ACTIONS
+
+
+def maze() -> GridLayout:
+    return GridLayout.from_entries(
+        SparseObstacleMazeGenerator(rows=6, cols=6, rng=random.Random(0)).run()
+    )
+
+
+class TestPolicy:
+    def test_greedy_policy_splits_ties(self):
+        q_values = np.array([[1.0, 1.0, 0.0, 0.0], [0.0, 2.0, 0.0, 0.0]])
+
+        policy = greedy_policy(q_values, epsilon=0.2)
+
+        assert np.allclose(policy, [[0.45, 0.45, 0.05, 0.05], [0.05, 0.85, 0.05, 0.05]])
+
+    def test_dict_agent_defaults_to_its_epsilon(self, corridor):
+        agent = QLearningAgent()
+        agent.epsilon = 0.4
+        agent.q_table[(0, 1)][RIGHT] = 1.0
+
+        policy = agent_policy(agent, corridor)
+
+        assert np.allclose(policy[1], [0.1, 0.1, 0.1, 0.7])
+        # unseen states are all ties
+        assert np.allclose(policy[0], 0.25)
+        assert list(agent.q_table) == [(0, 1)]
+
+    def test_frozen_policy(self, corridor):
+        policy = FrozenPolicy(np.array([3, 3, 2, 0], dtype=np.int8), cols=4)
+
+        assert agent_policy(policy, corridor).tolist()[2] == [0, 0, 1, 0]
+
+
+class TestEvaluate:
+    def test_optimal_policy_matches_the_solver(self):
+        layout = maze()
+        solution = value_iteration(layout)
+        agent = QLearningAgent()
+        seed_agent(agent, solution)
+
+        evaluation = evaluate_agent(agent, layout, epsilon=0)
+
+        assert np.allclose(evaluation.expected_return, solution.values)
+        start = evaluation.at(layout.start)
+        assert start.goal_probability == pytest.approx(1.0)
+        assert start.expected_steps == pytest.approx(
+            len(AStarAgent(layout).plan(layout.start))
+        )
+
+    def test_policy_that_never_arrives(self, corridor):
+        left = np.zeros((4, len(SIMPLE_ACTIONS)))
+        left[:, SIMPLE_ACTIONS.index(LEFT)] = 1.0
+
+        evaluation = evaluate(left, corridor, gamma=0.5)
+
+        # -10 forever from the first cell, -1 then that from the second
+        assert np.allclose(evaluation.expected_return[:2], [-20.0, -11.0])
+        assert evaluation.goal_probability[:3].tolist() == [0.0, 0.0, 0.0]
+        assert np.isinf(evaluation.expected_steps[:3]).all()
+        assert evaluation.at((0, 3)) == (0.0, 1.0, 0.0)
+
+    def test_long_horizon_approaches_the_infinite_one(self):
+        policy = greedy_policy(np.zeros((36, 4)), epsilon=1.0)
+
+        infinite = evaluate(policy, maze())
+        finite = evaluate(policy, maze(), max_steps=20_000)
+
+        assert np.allclose(finite.expected_return, infinite.expected_return)
+        assert np.allclose(finite.goal_probability, infinite.goal_probability)
+        assert np.allclose(finite.expected_steps, infinite.expected_steps)
+
+    def test_one_step_horizon(self, corridor):
+        right = np.zeros((4, len(SIMPLE_ACTIONS)))
+        right[:, SIMPLE_ACTIONS.index(RIGHT)] = 1.0
+
+        evaluation = evaluate(right, corridor, max_steps=1)
+
+        assert evaluation.goal_probability.tolist() == [0.0, 0.0, 1.0, 1.0]
+        assert evaluation.expected_steps.tolist() == [1.0, 1.0, 1.0, 0.0]
+
+    def test_matches_rollouts(self):
+        layout = maze()
+        env = ArrayGridWorldEnv(layout=layout, max_steps=30)
+        agent = QLearningAgent(rng=random.Random(0), backend="dense", rows=6, cols=6)
+        Runner(env, agent).run_episodes_fast(40)
+        agent.alpha = 0.0
+
+        evaluation = evaluate_agent(agent, layout, max_steps=30).at(layout.start)
+        stats = Runner(env, agent).run_episodes_fast(4_000)
+
+        # partly trained, it reaches the goal about a quarter of the time
+        assert 0.1 < evaluation.goal_probability < 0.5
+        # within about four standard errors
+        assert stats.reached_goal.mean() == pytest.approx(
+            evaluation.goal_probability, abs=0.03
+        )
+        assert stats.steps.mean() == pytest.approx(evaluation.expected_steps, rel=0.05)
+
+    def test_checks_its_arguments(self, corridor):
+        with pytest.raises(ValueError):
+            evaluate(np.full((3, 4), 0.25), corridor)
+        with pytest.raises(ValueError):
+            evaluate(np.full((4, 4), 0.25), corridor, gamma=1.0)
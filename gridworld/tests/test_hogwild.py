@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.shared_q_table import SharedQTable
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.maze_builders import RecursiveBacktracking
+from gridworld.hogwild import train_hogwild
+from gridworld.runner import Runner
+
+
+class TestSharedQTable:
+    def test_attached_tables_share_values(self):
+        with SharedQTable.create(rows=3, cols=4) as shared:
+            attached = SharedQTable.attach(shared.handle)
+            attached.table[(1, 2)]["left"] = 2.5
+
+            assert shared.table.values[6, 2] == 2.5
+            assert list(shared.table) == [(1, 2)]
+            attached.close()
+
+    def test_copy_is_detached(self):
+        with SharedQTable.create(rows=2, cols=2) as shared:
+            shared.table[(0, 1)]["up"] = 1.0
+            copy = shared.copy()
+            shared.table.values[:] = 0.0
+
+        assert copy == {(0, 1): {"up": 1.0, "down": 0.0, "left": 0.0, "right": 0.0}}
+
+    def test_only_owner_can_unlink(self):
+        with SharedQTable.create(rows=2, cols=2) as shared:
+            attached = SharedQTable.attach(shared.handle)
+            with pytest.raises(RuntimeError):
+                attached.unlink()
+            attached.close()
+
+
+class TestTrainHogwild:
+    def test_workers_train_one_table(self):
+        layout = GridLayout.from_entries(
+            RecursiveBacktracking(rows=6, cols=6, rng=random.Random(1)).run()
+        )
+
+        result = train_hogwild(layout, workers=2, episodes=150, max_steps=200, seed=0)
+
+        assert len(result.stats) == 2
+        assert all(len(stats.steps) == 150 for stats in result.stats)
+        # both workers learn from the shared table, so both end up at the goal
+        assert all(stats.reached_goal[-20:].all() for stats in result.stats)
+        assert np.any(result.agent.q_table.values)
+
+        policy = FrozenPolicy.from_agent(result.agent)
+        episode = Runner(ArrayGridWorldEnv(layout=layout), policy).run_episode()
+        assert episode["reached_goal"]
@@ -0,0 +1,160 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.frozen_policy import FrozenPolicy
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.q_tables import DenseQTable
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.offline import (
+    Transitions,
+    concatenate,
+    from_buffer,
+    from_columns,
+    from_results,
+    from_trajectories,
+    n_step_targets,
+    train_offline,
+)
+from gridworld.runner import Runner
+from gridworld.utils import DOWN, RIGHT, Step
+
+
+def two_episodes() -> Transitions:
+    # a 1x4 corridor: the first episode walks to the goal, the second runs out of steps
+    return from_trajectories(
+        [
+            [
+                Step((0, 0), RIGHT, -1, (0, 1), False),
+                Step((0, 1), RIGHT, -1, (0, 2), False),
+                Step((0, 2), RIGHT, 100, (0, 3), True),
+            ],
+            [Step((0, 1), RIGHT, -1, (0, 2), False)],
+        ],
+        cols=4,
+    )
+
+
+class TestTransitions:
+    def test_from_trajectories(self):
+        transitions = two_episodes()
+
+        assert transitions.states.tolist() == [0, 1, 2, 1]
+        assert transitions.actions.tolist() == [3, 3, 3, 3]
+        assert transitions.rewards.tolist() == [-1, -1, 100, -1]
+        assert transitions.next_states.tolist() == [1, 2, 3, 2]
+        assert transitions.dones.tolist() == [False, False, True, False]
+        assert transitions.episodes.tolist() == [0, 0, 0, 1]
+
+    def test_buffer_and_results_agree(self):
+        runner = Runner(GridWorldEnv(), QLearningAgent(rng=random.Random(0)))
+        buffer = runner.run_episode_fast()
+
+        from_steps = from_trajectories(
+            [buffer.to_steps(cols=5)], cols=5, reached_goal=[buffer.reached_goal]
+        )
+        for column, expected in zip(from_buffer(buffer), from_steps):
+            assert np.array_equal(column, expected)
+            assert column.dtype == expected.dtype
+
+    def test_from_columns_checks_the_episode_lengths(self):
+        columns = two_episodes()[:-1]
+
+        assert from_columns(*columns, episode_lengths=[2, 2]).episodes.tolist() == [
+            0,
+            0,
+            1,
+            1,
+        ]
+        with pytest.raises(ValueError):
+            from_columns(*columns, episode_lengths=[2, 1])
+
+    def test_running_out_of_steps_is_not_the_end(self):
+        columns = two_episodes()[:-1]
+        dones = np.array([False, True, False, True])
+
+        transitions = from_columns(
+            *columns[:-1], dones, episode_lengths=[2, 2], reached_goal=[True, False]
+        )
+
+        assert transitions.dones.tolist() == [False, True, False, False]
+
+    def test_concatenate_renumbers_episodes(self):
+        transitions = concatenate([two_episodes(), two_episodes()])
+
+        assert transitions.episodes.tolist() == [0, 0, 0, 1, 2, 2, 2, 3]
+        assert transitions.states.tolist() == [0, 1, 2, 1, 0, 1, 2, 1]
+
+
+class TestNStepTargets:
+    def test_one_step_is_the_transition(self):
+        targets = n_step_targets(two_episodes(), n_steps=1, gamma=0.5)
+
+        assert targets.returns.tolist() == [-1, -1, 100, -1]
+        assert targets.bootstrap_states.tolist() == [1, 2, 3, 2]
+        assert targets.dones.tolist() == [False, False, True, False]
+        assert targets.discounts.tolist() == [0.5, 0.5, 0.5, 0.5]
+
+    def test_returns_stop_at_the_end_of_the_episode(self):
+        targets = n_step_targets(two_episodes(), n_steps=2, gamma=0.5)
+
+        assert targets.returns.tolist() == [-1.5, 49.0, 100, -1]
+        assert targets.bootstrap_states.tolist() == [2, 3, 3, 2]
+        assert targets.dones.tolist() == [False, True, True, False]
+        # the last episode ran out of steps, so it still bootstraps after one step
+        assert targets.discounts.tolist() == [0.25, 0.25, 0.5, 0.5]
+
+    def test_returns_stop_before_an_action_that_is_not_greedy(self):
+        greedy = np.array([True, False, True, True])
+
+        targets = n_step_targets(two_episodes(), n_steps=3, gamma=0.5, greedy=greedy)
+
+        assert targets.returns.tolist() == [-1, 49.0, 100, -1]
+        assert targets.bootstrap_states.tolist() == [1, 3, 3, 2]
+        assert targets.discounts.tolist() == [0.5, 0.25, 0.5, 0.5]
+
+    def test_needs_a_step(self):
+        with pytest.raises(ValueError):
+            n_step_targets(two_episodes(), n_steps=0, gamma=0.9)
+
+
+class TestTrainOffline:
+    def test_single_update(self):
+        transitions = from_trajectories(
+            [[Step((0, 0), DOWN, 100, (1, 0), True)]], cols=2
+        )
+
+        agent = train_offline(transitions, rows=2, cols=2, epochs=1, alpha=0.5)
+
+        assert agent.q_table == {
+            (0, 0): {"up": 0.0, "down": 50.0, "left": 0.0, "right": 0.0}
+        }
+
+    def test_continues_training_a_table(self):
+        q_table = DenseQTable(1, 4)
+        q_table.values[2, 3] = 10.0
+
+        agent = train_offline(two_episodes(), rows=1, cols=4, epochs=1, q_table=q_table)
+
+        assert agent.q_table is q_table
+        assert q_table.values[2, 3] > 10.0
+
+    @pytest.mark.parametrize("n_steps", [1, 3])
+    def test_learns_from_logged_episodes(self, n_steps):
+        env = GridWorldEnv(rows=5, cols=5, max_steps=100)
+        logging_agent = QLearningAgent(rng=random.Random(0))
+        logging_agent.epsilon = 0.5
+        transitions = from_results(Runner(env, logging_agent).run_episodes(50), cols=5)
+
+        agent = train_offline(
+            transitions,
+            rows=5,
+            cols=5,
+            n_steps=n_steps,
+            rng=np.random.default_rng(0),
+        )
+
+        result = Runner(env, FrozenPolicy.from_agent(agent)).run_episode()
+        assert result["reached_goal"]
+        assert result["steps"] == 8
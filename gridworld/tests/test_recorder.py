@@ -0,0 +1,140 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.random_agent import RandomAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv, GridLayout
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.components.maze_builders import RecursiveBacktracking, Walls
+from gridworld.recorder import EpisodeRecorder
+from gridworld.replay import main
+from gridworld.runner import Runner
+
+
+def build_maze():
+    return RecursiveBacktracking(rows=5, cols=6, rng=random.Random(3)).run()
+
+
+def record(env, episodes=3, seed=7):
+    recorder = EpisodeRecorder(seed=seed)
+    results = Runner(env, RandomAgent(rng=random.Random(seed))).run_episodes(
+        episodes, recorder=recorder
+    )
+    return recorder, results
+
+
+class TestRecord:
+    def test_records_each_episode(self):
+        recorder, results = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        assert len(recorder.episodes) == 3
+        assert [len(episode) for episode in recorder.episodes] == [
+            result["steps"] for result in results
+        ]
+        assert recorder.episodes[0].actions.dtype == np.int8
+        assert recorder.episodes[0].seed == 7
+
+    def test_stores_the_maze_once(self):
+        recorder, _ = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        assert len(recorder.mazes) == 1
+        assert {episode.maze_id for episode in recorder.episodes} == set(recorder.mazes)
+
+    def test_reads_each_env_maze_once(self, mocker):
+        env = ArrayGridWorldEnv(grid=build_maze(), max_steps=30)
+        fingerprint = mocker.spy(GridLayout, "fingerprint")
+        recorder, _ = record(env, episodes=5)
+        assert fingerprint.call_count == 1
+        assert len(recorder.mazes) == 1
+
+    def test_forget_reads_an_edited_maze(self):
+        env = GridWorldEnv(grid=build_maze(), max_steps=30)
+        recorder = EpisodeRecorder()
+        runner = Runner(env, RandomAgent(rng=random.Random(0)))
+        runner.run_episode(recorder=recorder)
+        env.reset()
+        # a direct edit, which the environment's own reset keeps
+        env.grid[0][1].walls = Walls(up=True, down=True, left=True, right=True)
+        recorder.forget(env)
+        runner.run_episode(recorder=recorder)
+        first, second = recorder.episodes
+        assert first.maze_id != second.maze_id
+        assert recorder.mazes[second.maze_id].walls[0, 1].all()
+
+    def test_finish_without_start(self):
+        with pytest.raises(RuntimeError):
+            EpisodeRecorder().finish()
+
+
+class TestFingerprint:
+    def test_same_maze_same_fingerprint(self):
+        maze = build_maze()
+        from_entries = GridLayout.from_entries(maze)
+        from_env = GridLayout.from_env(GridWorldEnv(grid=maze))
+        assert from_entries.fingerprint() == from_env.fingerprint()
+
+    def test_different_maze_different_fingerprint(self):
+        assert (
+            GridLayout.empty(5, 6).fingerprint()
+            != GridLayout.from_entries(build_maze()).fingerprint()
+        )
+
+
+class TestReplay:
+    def test_frames_follow_the_trajectory(self):
+        recorder, results = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        for episode, result in enumerate(results):
+            states = [env.get_state() for env in recorder.frames(episode)]
+            trajectory = result["trajectory"]
+            assert states == [trajectory[0].start] + [
+                step.new_state for step in trajectory
+            ]
+
+    def test_env_at_step(self):
+        recorder, results = record(ArrayGridWorldEnv(grid=build_maze(), max_steps=30))
+        env = recorder.env_at(1, 4)
+        assert env.current_step == 4
+        assert env.get_state() == results[1]["trajectory"][3].new_state
+        assert env.total_reward == sum(
+            step.reward for step in results[1]["trajectory"][:4]
+        )
+
+    def test_env_at_step_out_of_range(self):
+        recorder, _ = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        with pytest.raises(ValueError):
+            recorder.env_at(0, len(recorder.episodes[0]) + 1)
+
+    def test_replay_does_not_sleep_when_jumping(self, mocker):
+        recorder, _ = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        sleep = mocker.patch("gridworld.recorder.time.sleep")
+        render = mocker.patch.object(ArrayGridWorldEnv, "render")
+        recorder.replay(0, step=2)
+        render.assert_called_once()
+        sleep.assert_not_called()
+
+
+class TestSaveLoad:
+    def test_round_trip(self, tmp_path):
+        recorder, _ = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        recorder.episodes[1].seed = None
+        path = str(tmp_path / "run.npz")
+        recorder.save(path)
+
+        loaded = EpisodeRecorder.load(path)
+        assert list(loaded.mazes) == list(recorder.mazes)
+        for maze_id, layout in recorder.mazes.items():
+            assert np.array_equal(loaded.mazes[maze_id].walls, layout.walls)
+            assert loaded.mazes[maze_id].fingerprint() == maze_id
+        assert len(loaded.episodes) == len(recorder.episodes)
+        for original, restored in zip(recorder.episodes, loaded.episodes):
+            assert restored.seed == original.seed
+            assert restored.maze_id == original.maze_id
+            assert restored.max_steps == original.max_steps
+            assert np.array_equal(restored.actions, original.actions)
+
+    def test_cli_renders_a_step(self, tmp_path, mocker):
+        recorder, _ = record(GridWorldEnv(grid=build_maze(), max_steps=30))
+        path = str(tmp_path / "run.npz")
+        recorder.save(path)
+        render = mocker.patch.object(ArrayGridWorldEnv, "render")
+        main([path, "--episode", "2", "--step", "1"])
+        render.assert_called_once()
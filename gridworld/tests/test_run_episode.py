@@ -1,6 +1,13 @@
+import random
 from unittest.mock import ANY
+
+import pytest
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import ArrayGridWorldEnv
 from gridworld.components.grid_environment import GridWorldEnv
-from gridworld.runner import Runner
+from gridworld.runner import EpisodeBuffer, Runner
+from gridworld.stopping import GoalRatePlateau, PolicyUnchanged
 from gridworld.utils import RunnerReturn, Step
 
 
@@ -29,6 +36,9 @@ class FakeAgent:
     def observe(self, step_result):
         self._results.append(step_result)
 
+    def observe_transition(self, *transition):
+        self.observe(Step(*transition))
+
     def reset(self):
         self._complete = 0
         self._results = []
@@ -140,6 +150,67 @@ class TestRunEpisodes:
             visit_counts=ANY,
         )
 
+    def test_stops_once_the_criterion_is_met(self):
+        stop_when = GoalRatePlateau(window=2, tolerance=0.0, min_rate=1.0)
+
+        results = Runner(FakeEnv(), FakeAgent()).run_episodes(
+            num_episodes=10, stop_when=stop_when
+        )
+
+        assert len(results) == 4
+        assert stop_when.converged_at == 4
+
+
+class TestRunEpisodeFast:
+    def test_writes_the_episode_into_the_buffer(self):
+        env = FakeEnv()
+        agent = FakeAgent()
+        runner = Runner(env, agent)
+
+        buffer = runner.run_episode_fast()
+
+        assert buffer.length == 8
+        assert buffer.total_reward == 93
+        assert buffer.reached_goal is True
+        assert buffer.to_steps(env.cols) == runner.run_episode()["trajectory"]
+        # the agent still observes every step
+        assert agent._results == buffer.to_steps(env.cols)
+
+    def test_reuses_the_buffer(self):
+        buffer = EpisodeBuffer(100)
+        runner = Runner(FakeEnv(), FakeAgent())
+        assert runner.run_episode_fast(buffer) is buffer
+        assert runner.run_episode_fast(buffer) is buffer
+        assert buffer.length == 8
+
+    def test_rejects_a_small_buffer(self):
+        with pytest.raises(ValueError):
+            Runner(FakeEnv(max_steps=10), FakeAgent()).run_episode_fast(
+                EpisodeBuffer(5)
+            )
+
+    @pytest.mark.parametrize("env_class", [GridWorldEnv, ArrayGridWorldEnv])
+    def test_learns_like_run_episodes(self, env_class):
+        runner = Runner(env_class(), QLearningAgent(rng=random.Random(1)))
+        fast_runner = Runner(env_class(), QLearningAgent(rng=random.Random(1)))
+
+        results = runner.run_episodes(30)
+        stats = fast_runner.run_episodes_fast(30)
+
+        assert stats.total_rewards.tolist() == [r["total_reward"] for r in results]
+        assert stats.steps.tolist() == [r["steps"] for r in results]
+        assert stats.reached_goal.tolist() == [r["reached_goal"] for r in results]
+        assert fast_runner.agent.q_table == runner.agent.q_table
+
+    def test_stops_once_the_criterion_is_met(self):
+        runner = Runner(GridWorldEnv(), QLearningAgent(rng=random.Random(1)))
+        stop_when = PolicyUnchanged(episodes=5)
+
+        stats = runner.run_episodes_fast(1_000, stop_when=stop_when)
+
+        assert stop_when.converged_at is not None
+        assert len(stats.steps) == stop_when.converged_at < 1_000
+
 
 class TestAnalyzeResults:
     def test_analyze_results(self):
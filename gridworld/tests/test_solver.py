@@ -0,0 +1,158 @@
+import random
+
+import numpy as np
+import pytest
+
+from gridworld.agents.a_star_agent import AStarAgent
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.components.array_grid_environment import (
+    ArrayGridWorldEnv,
+    GridLayout,
+    compile_transitions,
+)
+from gridworld.components.maze_builders import (
+    Entry,
+    RecursiveBacktracking,
+    SparseObstacleMazeGenerator,
+    Walls,
+)
+from gridworld.runner import Runner
+from gridworld.solver import (
+    evaluate_policy,
+    policy_iteration,
+    reachable_states,
+    score_agent,
+    seed_agent,
+    value_iteration,
+)
+from gridworld.utils import DOWN, LEFT, RIGHT, SIMPLE_ACTIONS, UP
+
+
+class TestValueIteration:
+    def test_corridor_values(self, corridor):
+        solution = value_iteration(corridor, gamma=0.5)
+
+        # -1 per step, then 100 for reaching the goal
+        assert solution.values.tolist() == [23.5, 49.0, 100.0, 0.0]
+        right = SIMPLE_ACTIONS.index(RIGHT)
+        left = SIMPLE_ACTIONS.index(LEFT)
+        assert solution.q_values[1, right] == 49.0
+        assert solution.q_values[1, left] == -1 + 0.5 * 23.5
+        # walking off the board costs 10 and stays put
+        assert solution.q_values[0, left] == -10 + 0.5 * 23.5
+        assert not solution.q_values[3].any()
+
+    def test_policy_goes_around_walls_and_obstacles(self):
+        grid = [
+            [Entry(start=True), Entry(walls=Walls(left=True)), Entry(goal=True)],
+            [Entry(), Entry(obstacle=True), Entry()],
+            [Entry(), Entry(), Entry()],
+        ]
+        policy = value_iteration(GridLayout.from_entries(grid)).policy()
+
+        assert [policy.act(state) for state in [(0, 0), (1, 0), (2, 0)]] == [
+            DOWN,
+            DOWN,
+            RIGHT,
+        ]
+        assert [policy.act(state) for state in [(2, 1), (2, 2), (1, 2)]] == [
+            RIGHT,
+            UP,
+            UP,
+        ]
+
+    @pytest.mark.parametrize(
+        "generator", [RecursiveBacktracking, SparseObstacleMazeGenerator]
+    )
+    def test_policy_takes_the_shortest_path(self, generator):
+        maze = generator(rows=12, cols=12, rng=random.Random(0)).run()
+        layout = GridLayout.from_entries(maze)
+
+        policy = value_iteration(layout, gamma=0.99).policy()
+        result = Runner(ArrayGridWorldEnv(grid=maze), policy).run_episode()
+
+        assert result["reached_goal"]
+        assert result["steps"] == len(AStarAgent(layout).plan(layout.start))
+
+    def test_gamma_must_discount(self, corridor):
+        with pytest.raises(ValueError):
+            value_iteration(corridor, gamma=1.0)
+
+
+class TestPolicyIteration:
+    @pytest.mark.parametrize("size", [5, 12])
+    def test_matches_value_iteration(self, size):
+        maze = RecursiveBacktracking(rows=size, cols=size, rng=random.Random(1)).run()
+        layout = GridLayout.from_entries(maze)
+
+        expected = value_iteration(layout, gamma=0.95)
+        solution = policy_iteration(layout, gamma=0.95)
+
+        assert np.allclose(solution.values, expected.values)
+        assert np.allclose(solution.q_values, expected.q_values)
+
+    def test_evaluate_policy_follows_loops(self, corridor):
+        transitions = compile_transitions(corridor)
+        # always walk into the left edge
+        policy = np.full(4, SIMPLE_ACTIONS.index(LEFT))
+
+        values = evaluate_policy(transitions, policy, gamma=0.5)
+
+        # -10 forever from the first cell, -1 then that from the second
+        assert np.allclose(values[:2], [-20.0, -11.0])
+
+
+class TestAgents:
+    def test_seeded_agents_are_optimal(self):
+        layout = GridLayout.from_entries(
+            SparseObstacleMazeGenerator(rows=8, cols=8, rng=random.Random(0)).run()
+        )
+        solution = value_iteration(layout)
+
+        for agent in [
+            QLearningAgent(),
+            QLearningAgent(backend="dense", rows=8, cols=8),
+            QLearningAgent(backend="memmap", rows=8, cols=8),
+        ]:
+            seed_agent(agent, solution)
+            score = score_agent(agent, solution)
+
+            assert score.optimal_actions == 1.0
+            assert score.mean_regret == 0.0
+            assert score.q_rmse < 1e-9
+            assert agent.q_table[(0, 0)][RIGHT] == solution.q_values[0, 3]
+
+    def test_untrained_agent_scores_badly(self, corridor):
+        solution = value_iteration(corridor)
+        agent = QLearningAgent()
+
+        score = score_agent(agent, solution)
+
+        # all ties go to up, which walks off the board
+        assert score.optimal_actions == 0.0
+        assert score.mean_regret > 0
+        assert score.states == 3
+        # scoring reads a dict table without adding states to it
+        assert len(agent.q_table) == 0
+
+    def test_seeding_checks_the_size(self, corridor):
+        for backend in ["dense", "memmap"]:
+            agent = QLearningAgent(backend=backend, rows=2, cols=2)
+            with pytest.raises(ValueError):
+                seed_agent(agent, value_iteration(corridor))
+
+    def test_scoring_checks_the_size(self, corridor):
+        for backend in ["dense", "memmap"]:
+            agent = QLearningAgent(backend=backend, rows=2, cols=2)
+            with pytest.raises(ValueError):
+                score_agent(agent, value_iteration(corridor))
+
+    def test_reachable_states(self):
+        grid = [
+            [Entry(start=True), Entry(obstacle=True), Entry()],
+            [Entry(), Entry(), Entry(goal=True)],
+        ]
+
+        reached = reachable_states(GridLayout.from_entries(grid))
+
+        assert reached.tolist() == [True, False, True, True, True, True]
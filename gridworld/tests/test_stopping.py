@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from gridworld.agents.q_learning_agent import QLearningAgent
+from gridworld.agents.random_agent import RandomAgent
+from gridworld.components.grid_environment import GridWorldEnv
+from gridworld.runner import Runner
+from gridworld.stopping import GoalRatePlateau, PolicyUnchanged, QTableDelta
+
+
+class TestQTableDelta:
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_needs_quiet_episodes_in_a_row(self, backend):
+        agent = QLearningAgent(backend=backend, rows=5, cols=5)
+        stop_when = QTableDelta(threshold=0.5, episodes=2)
+
+        agent.q_table[(0, 0)]["up"] = 1.0
+        assert stop_when.update(agent, reached_goal=False) is False
+        agent.q_table[(0, 0)]["up"] = 1.1
+        assert stop_when.update(agent, reached_goal=False) is False
+        agent.q_table[(1, 1)]["down"] = -2.0
+        assert stop_when.update(agent, reached_goal=False) is False
+        assert stop_when.update(agent, reached_goal=False) is False
+        assert stop_when.update(agent, reached_goal=False) is True
+        assert stop_when.converged_at == 5
+
+    def test_stays_converged(self):
+        agent = QLearningAgent()
+        stop_when = QTableDelta(episodes=1)
+        assert stop_when.update(agent, reached_goal=False) is True
+
+        agent.q_table[(0, 0)]["up"] = 10.0
+
+        assert stop_when.update(agent, reached_goal=False) is True
+        assert stop_when.converged_at == 1
+
+    def test_needs_a_q_table(self):
+        with pytest.raises(TypeError):
+            QTableDelta().update(RandomAgent(), reached_goal=False)
+
+
+class TestPolicyUnchanged:
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_counts_episodes_without_a_new_greedy_action(self, backend):
+        agent = QLearningAgent(backend=backend, rows=5, cols=5)
+        stop_when = PolicyUnchanged(episodes=2)
+
+        agent.q_table[(0, 0)]["up"] = 1.0
+        assert stop_when.update(agent, reached_goal=False) is False
+        # a bigger q value for the same best action is the same policy
+        agent.q_table[(0, 0)]["up"] = 5.0
+        assert stop_when.update(agent, reached_goal=False) is False
+        agent.q_table[(0, 0)]["down"] = 6.0
+        assert stop_when.update(agent, reached_goal=False) is False
+        assert stop_when.update(agent, reached_goal=False) is False
+        assert stop_when.update(agent, reached_goal=False) is True
+        assert stop_when.converged_at == 5
+
+    @pytest.mark.parametrize("backend", ["dict", "dense"])
+    def test_visiting_a_state_is_not_a_policy_change(self, backend):
+        agent = QLearningAgent(backend=backend, rows=5, cols=5)
+        stop_when = PolicyUnchanged(episodes=1)
+        stop_when.update(agent, reached_goal=False)
+
+        agent.q_table[(2, 2)]
+
+        assert stop_when.update(agent, reached_goal=False) is True
+
+    def test_reset(self):
+        agent = QLearningAgent()
+        stop_when = PolicyUnchanged(episodes=1)
+        stop_when.update(agent, reached_goal=False)
+        stop_when.update(agent, reached_goal=False)
+
+        stop_when.reset()
+
+        assert stop_when.converged_at is None
+        assert stop_when.update(agent, reached_goal=False) is False
+
+
+class TestGoalRatePlateau:
+    def test_waits_for_two_full_windows(self):
+        stop_when = GoalRatePlateau(window=3, tolerance=0.0, min_rate=1.0)
+        agent = RandomAgent()
+
+        converged = [stop_when.update(agent, reached_goal=True) for _ in range(6)]
+
+        assert converged == [False] * 5 + [True]
+
+    def test_needs_the_rate_to_level_off(self):
+        stop_when = GoalRatePlateau(window=2, tolerance=0.0, min_rate=0.5)
+        agent = RandomAgent()
+        reached_goal = [False, False, True, True, True, True]
+
+        converged = [stop_when.update(agent, reached) for reached in reached_goal]
+
+        assert converged == [False] * 5 + [True]
+        assert stop_when.converged_at == 6
+
+    def test_needs_the_minimum_rate(self):
+        stop_when = GoalRatePlateau(window=2, min_rate=0.5)
+        agent = RandomAgent()
+
+        assert not any(stop_when.update(agent, False) for _ in range(10))
+
+
+class TestConvergence:
+    def test_q_learning_converges_on_an_empty_grid(self):
+        agent = QLearningAgent(rng=random.Random(0))
+        stop_when = QTableDelta(threshold=1.0, episodes=3)
+
+        results = Runner(GridWorldEnv(), agent).run_episodes(500, stop_when=stop_when)
+
+        assert stop_when.converged_at == len(results) < 500
+        assert all(result["reached_goal"] for result in results[-3:])
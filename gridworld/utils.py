@@ -1,4 +1,5 @@
 # pyright: reportUnknownMemberType=false
+from collections.abc import Mapping
 from typing import NamedTuple, TypedDict
 
 from matplotlib import pyplot as plt
@@ -66,7 +67,7 @@ class RunnerReturn(TypedDict):
 
 
 def _base_heatmap(
-    visit_counts: dict[tuple[int, int], int],
+    visit_counts: Mapping[tuple[int, int], int],
     rows: int,
     cols: int,
     stat: str = "Visit Count",
@@ -74,7 +75,7 @@ def _base_heatmap(
     filename: str | None = None,
     scale_max: int = 20,
     grid: list[list["Cell"]] | None = None,
-    q_table: dict[tuple[int, int], dict[str, float]] | None = None,
+    q_table: Mapping[tuple[int, int], Mapping[str, float]] | None = None,
     show: bool = True,
 ) -> str:
     numpy_map = np.zeros((rows, cols))
@@ -207,7 +208,7 @@ def _base_heatmap(
 
 def render_heatmap(
     *,
-    visit_counts: dict[tuple[int, int], int],
+    visit_counts: Mapping[tuple[int, int], int],
     rows: int,
     cols: int,
     stat: str = "Visit Count",
@@ -215,7 +216,7 @@ def render_heatmap(
     filename: str | None = None,
     scale_max: int = 20,
     grid: list[list["Cell"]] | None = None,
-    q_table: dict[tuple[int, int], dict[str, float]] | None = None,
+    q_table: Mapping[tuple[int, int], Mapping[str, float]] | None = None,
     show: bool = True,
 ) -> str:
     return _base_heatmap(
@@ -234,10 +235,10 @@ def render_heatmap(
 
 def render_directional_heatmap_for_q_table(
     *,
-    visit_counts: dict[tuple[int, int], int],
+    visit_counts: Mapping[tuple[int, int], int],
     rows: int,
     cols: int,
-    q_table: dict[tuple[int, int], dict[str, float]],
+    q_table: Mapping[tuple[int, int], Mapping[str, float]],
     stat: str = "Favorite Direction",
     folder: str = "output",
     filename: str | None = None,